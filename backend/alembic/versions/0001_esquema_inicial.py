@@ -0,0 +1,125 @@
+"""esquema inicial
+
+Mesmo esquema que o Base.metadata.create_all gerava. Bancos que já existiam
+devem ser marcados com `alembic stamp 0001` em vez de executar esta revisão.
+
+Revision ID: 0001
+Revises: 
+Create Date: 2026-10-18 16:13:07.007218
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0001'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('clientes',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('usuario_id', sa.Integer(), nullable=False),
+    sa.Column('nome', sa.String(), nullable=False),
+    sa.Column('email', sa.String(), nullable=True),
+    sa.Column('telefone', sa.String(), nullable=True),
+    sa.Column('is_deleted', sa.Boolean(), nullable=True),
+    sa.Column('data_criacao', sa.Date(), server_default=sa.text('CURRENT_DATE'), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_clientes_id'), 'clientes', ['id'], unique=False)
+    op.create_index(op.f('ix_clientes_usuario_id'), 'clientes', ['usuario_id'], unique=False)
+    op.create_table('resumo_mensal',
+    sa.Column('usuario_id', sa.Integer(), nullable=False),
+    sa.Column('mes', sa.String(length=7), nullable=False),
+    sa.Column('total_recebido', sa.Float(), nullable=False),
+    sa.Column('total_faturado', sa.Float(), nullable=False),
+    sa.Column('total_pendente', sa.Float(), nullable=False),
+    sa.Column('qtd_pendentes', sa.Integer(), nullable=False),
+    sa.Column('qtd_honorarios', sa.Integer(), nullable=False),
+    sa.Column('clientes_ativos', sa.Integer(), nullable=False),
+    sa.Column('novos_clientes', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('usuario_id', 'mes')
+    )
+    op.create_table('status',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('nome', sa.String(), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('nome')
+    )
+    op.create_index(op.f('ix_status_id'), 'status', ['id'], unique=False)
+    op.create_table('tipos_pagamento',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('nome', sa.String(), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('nome')
+    )
+    op.create_index(op.f('ix_tipos_pagamento_id'), 'tipos_pagamento', ['id'], unique=False)
+    op.create_table('usuarios',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('nome', sa.String(), nullable=False),
+    sa.Column('email', sa.String(), nullable=False),
+    sa.Column('senha', sa.String(), nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_usuarios_email'), 'usuarios', ['email'], unique=True)
+    op.create_index(op.f('ix_usuarios_id'), 'usuarios', ['id'], unique=False)
+    op.create_table('honorarios',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('usuario_id', sa.Integer(), nullable=False),
+    sa.Column('cliente_id', sa.Integer(), nullable=True),
+    sa.Column('valor', sa.Float(), nullable=False),
+    sa.Column('status_id', sa.Integer(), nullable=True),
+    sa.Column('data_vencimento', sa.Date(), nullable=False),
+    sa.Column('mes_referencia', sa.String(length=7), nullable=False),
+    sa.Column('descricao', sa.String(), nullable=True),
+    sa.Column('notificado', sa.Boolean(), nullable=False),
+    sa.Column('notificado1a', sa.Boolean(), nullable=False),
+    sa.Column('notificado3', sa.Boolean(), nullable=False),
+    sa.Column('is_deleted', sa.Boolean(), nullable=False),
+    sa.ForeignKeyConstraint(['cliente_id'], ['clientes.id'], ),
+    sa.ForeignKeyConstraint(['status_id'], ['status.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_honorarios_id'), 'honorarios', ['id'], unique=False)
+    op.create_index(op.f('ix_honorarios_usuario_id'), 'honorarios', ['usuario_id'], unique=False)
+    op.create_table('pagamentos',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('usuario_id', sa.Integer(), nullable=False),
+    sa.Column('honorario_id', sa.Integer(), nullable=False),
+    sa.Column('valor', sa.Float(), nullable=False),
+    sa.Column('data_pagamento', sa.Date(), nullable=True),
+    sa.Column('tipo_pagamento_id', sa.Integer(), nullable=False),
+    sa.Column('observacao', sa.String(), nullable=True),
+    sa.Column('is_deleted', sa.Boolean(), nullable=True),
+    sa.ForeignKeyConstraint(['honorario_id'], ['honorarios.id'], ),
+    sa.ForeignKeyConstraint(['tipo_pagamento_id'], ['tipos_pagamento.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_pagamentos_id'), 'pagamentos', ['id'], unique=False)
+    op.create_index(op.f('ix_pagamentos_usuario_id'), 'pagamentos', ['usuario_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_pagamentos_usuario_id'), table_name='pagamentos')
+    op.drop_index(op.f('ix_pagamentos_id'), table_name='pagamentos')
+    op.drop_table('pagamentos')
+    op.drop_index(op.f('ix_honorarios_usuario_id'), table_name='honorarios')
+    op.drop_index(op.f('ix_honorarios_id'), table_name='honorarios')
+    op.drop_table('honorarios')
+    op.drop_index(op.f('ix_usuarios_id'), table_name='usuarios')
+    op.drop_index(op.f('ix_usuarios_email'), table_name='usuarios')
+    op.drop_table('usuarios')
+    op.drop_index(op.f('ix_tipos_pagamento_id'), table_name='tipos_pagamento')
+    op.drop_table('tipos_pagamento')
+    op.drop_index(op.f('ix_status_id'), table_name='status')
+    op.drop_table('status')
+    op.drop_table('resumo_mensal')
+    op.drop_index(op.f('ix_clientes_usuario_id'), table_name='clientes')
+    op.drop_index(op.f('ix_clientes_id'), table_name='clientes')
+    op.drop_table('clientes')
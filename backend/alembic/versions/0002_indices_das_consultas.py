@@ -0,0 +1,54 @@
+"""indices das consultas
+
+Índices compostos/parciais no formato das consultas de crud_* e do dashboard
+(usuario_id + is_deleted = false + coluna de data ou mês filtrada), além das
+FKs usadas nos joins e do filtro da varredura de atrasados.
+Criados com CONCURRENTLY para não bloquear escritas em tabelas grandes.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 16:13:18.100109
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0002'
+down_revision: Union[str, None] = '0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+INDICES = [
+    ("ix_clientes_usuario_criacao", "clientes", ["usuario_id", "data_criacao"], "is_deleted = false"),
+    ("ix_honorarios_usuario_vencimento", "honorarios", ["usuario_id", "data_vencimento", "id"], "is_deleted = false"),
+    ("ix_honorarios_usuario_mes", "honorarios", ["usuario_id", "mes_referencia"], "is_deleted = false"),
+    ("ix_honorarios_pendentes_vencimento", "honorarios", ["data_vencimento"], "status_id = 1"),
+    ("ix_honorarios_cliente_id", "honorarios", ["cliente_id"], None),
+    ("ix_pagamentos_usuario_data", "pagamentos", ["usuario_id", "data_pagamento"], "is_deleted = false"),
+    ("ix_pagamentos_honorario_id", "pagamentos", ["honorario_id"], None),
+]
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        for nome, tabela, colunas, condicao in INDICES:
+            op.create_index(
+                nome,
+                tabela,
+                colunas,
+                unique=False,
+                postgresql_where=sa.text(condicao) if condicao else None,
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for nome, tabela, _, _ in reversed(INDICES):
+            op.drop_index(nome, table_name=tabela, postgresql_concurrently=True, if_exists=True)
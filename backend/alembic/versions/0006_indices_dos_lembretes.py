@@ -0,0 +1,52 @@
+"""indices dos lembretes
+
+Índices parciais para a seleção dos lembretes de vencimento: um por flag
+(notificado3, notificado1a, notificado), só com os honorários ativos, a receber e
+ainda não avisados, que são uma fração pequena da tabela.
+Criados com CONCURRENTLY para não bloquear escritas em tabelas grandes.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-18 16:37:53.945726
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0006'
+down_revision: Union[str, None] = '0005'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+PENDENTES = "is_deleted = false AND status_id IN (1, 3, 4)"
+
+INDICES = [
+    ("ix_honorarios_lembrete_3_dias", "honorarios", ["data_vencimento"], f"notificado3 = false AND {PENDENTES}"),
+    ("ix_honorarios_lembrete_1_dia", "honorarios", ["data_vencimento"], f"notificado1a = false AND {PENDENTES}"),
+    ("ix_honorarios_lembrete_atraso", "honorarios", ["data_vencimento"], f"notificado = false AND {PENDENTES}"),
+]
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        for nome, tabela, colunas, condicao in INDICES:
+            op.create_index(
+                nome,
+                tabela,
+                colunas,
+                unique=False,
+                postgresql_where=sa.text(condicao),
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for nome, tabela, _, _ in reversed(INDICES):
+            op.drop_index(nome, table_name=tabela, postgresql_concurrently=True, if_exists=True)
@@ -0,0 +1,67 @@
+"""recorrencias por recorrencia e mes
+
+O índice único dos honorários gerados passa de (cliente_id, mes_referencia) para
+(recorrencia_id, mes_referencia): um cliente pode ter mais de uma recorrência (ex.:
+mensalidade e um serviço trimestral) e a segunda era descartada pelo ON CONFLICT
+do gerador. Os dados existentes já são únicos pela chave nova, porque cada
+recorrência pertence a um único cliente.
+Criado com CONCURRENTLY, antes de remover o antigo, para não bloquear escritas.
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-18 21:12:40.118302
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0007'
+down_revision: Union[str, None] = '0006'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+GERADOS = "recorrencia_id IS NOT NULL"
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ux_honorarios_recorrencia_mes',
+            'honorarios',
+            ['recorrencia_id', 'mes_referencia'],
+            unique=True,
+            postgresql_where=sa.text(GERADOS),
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.drop_index(
+            'ux_honorarios_recorrentes_cliente_mes',
+            table_name='honorarios',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
+
+
+def downgrade() -> None:
+    # Falha se algum cliente já tiver dois honorários gerados no mesmo mês
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ux_honorarios_recorrentes_cliente_mes',
+            'honorarios',
+            ['cliente_id', 'mes_referencia'],
+            unique=True,
+            postgresql_where=sa.text(GERADOS),
+            postgresql_concurrently=True,
+            if_not_exists=True,
+        )
+        op.drop_index(
+            'ux_honorarios_recorrencia_mes',
+            table_name='honorarios',
+            postgresql_concurrently=True,
+            if_exists=True,
+        )
@@ -0,0 +1,30 @@
+"""
+Cabeçalhos de cache HTTP (ETag e Cache-Control) para respostas de leitura.
+"""
+from fastapi import Request, Response
+
+def etag_confere(request: Request, etag: str) -> bool:
+    """True se o cliente já tem a versão `etag` (If-None-Match, comparação fraca)"""
+    enviado = request.headers.get("if-none-match")
+    if not enviado:
+        return False
+    if enviado.strip() == "*":
+        return True
+    return _sem_prefixo_fraco(etag) in [_sem_prefixo_fraco(valor.strip()) for valor in enviado.split(",")]
+
+def _sem_prefixo_fraco(etag: str) -> str:
+    return etag[2:] if etag.startswith("W/") else etag
+
+def cache_control(max_age: int, privado: bool = True) -> str:
+    # Sem max-age o navegador revalida (If-None-Match) a cada uso
+    validade = f"max-age={max_age}" if max_age else "no-cache"
+    return f"{'private' if privado else 'public'}, {validade}"
+
+def aplicar_cache(response: Response, etag: str, max_age: int, privado: bool = True) -> None:
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = cache_control(max_age, privado)
+
+def nao_modificado(etag: str, max_age: int, privado: bool = True) -> Response:
+    response = Response(status_code=304)
+    aplicar_cache(response, etag, max_age, privado)
+    return response
@@ -0,0 +1,222 @@
+"""
+Comandos administrativos.
+
+Uso: python -m app.cli <comando> [opções]
+"""
+import argparse
+import asyncio
+import re
+import sys
+from datetime import date
+from app.database import SessionLocal, AsyncSessionLocal
+from app.schemas.honorarios import MES_REFERENCIA_PATTERN
+from app.services.resumo_mensal import reconstruir_resumo
+from app.services.crud_honorarios import backfill_mes_referencia, reconciliar_status, sweep_overdue_honorarios
+from app.services.crud_recorrencias import gerar_honorarios_recorrentes
+from app.services.lembretes import criar_transporte, enviar_lembretes, transporte_configurado
+from app.services.diagnostico_indices import verificar_indices
+from app.services.diagnostico_projecoes import conferir_pagamentos
+
+def cmd_reconstruir_resumo(args) -> None:
+    db = SessionLocal()
+    try:
+        linhas = reconstruir_resumo(db, args.usuario_id)
+        db.commit()
+        print(f"Resumo mensal reconstruído: {linhas} linhas")
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+def cmd_backfill_mes_referencia(args) -> None:
+    db = SessionLocal()
+    try:
+        preenchidos = backfill_mes_referencia(db)
+        db.commit()
+        print(f"mes_referencia preenchido em {preenchidos} honorários")
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+def cmd_reconciliar_status(args) -> None:
+    db = SessionLocal()
+    try:
+        alterados = reconciliar_status(db)
+        db.commit()
+        print(f"valor_pago/status corrigidos em {alterados} honorários")
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+def cmd_varrer_atrasados(args) -> None:
+    db = SessionLocal()
+    try:
+        atualizados = sweep_overdue_honorarios(db)
+        print(f"Atualizados {len(atualizados)} honorários para status ATRASADO")
+    finally:
+        db.close()
+
+def cmd_gerar_recorrentes(args) -> None:
+    db = SessionLocal()
+    try:
+        gerados = gerar_honorarios_recorrentes(db, args.mes)
+        print(f"Gerados {len(gerados)} honorários recorrentes")
+    finally:
+        db.close()
+
+def cmd_enviar_lembretes(args) -> None:
+    if args.transporte is None and not transporte_configurado():
+        sys.exit("Nenhum transporte configurado: defina SMTP_HOST ou LEMBRETES_TRANSPORTE, ou use --transporte")
+    transporte = criar_transporte(args.transporte, args.diretorio)
+    db = SessionLocal()
+    try:
+        enviados = enviar_lembretes(db, transporte, args.data)
+    finally:
+        db.close()
+        transporte.fechar()
+    for faixa, quantidade in enviados.items():
+        print(f"{faixa}: {quantidade} lembretes enviados")
+
+def cmd_verificar_indices(args) -> None:
+    db = SessionLocal()
+    try:
+        planos = verificar_indices(db, args.usuario_id)
+    finally:
+        db.close()
+
+    falhas = 0
+    for nome, leituras in planos.items():
+        sequenciais = [tabela for tipo, tabela, _ in leituras if tipo == "Seq Scan"]
+        falhas += bool(sequenciais)
+        situacao = f"SEQ SCAN em {', '.join(sequenciais)}" if sequenciais else "ok"
+        print(f"{nome}: {situacao}")
+        for tipo, tabela, indice in leituras:
+            print(f"    {tipo} {tabela} {indice}".rstrip())
+    sys.exit(1 if falhas else 0)
+
+async def _conferir_pagamentos(usuario_id):
+    async with AsyncSessionLocal() as db:
+        return await conferir_pagamentos(db, usuario_id)
+
+def cmd_conferir_projecoes(args) -> None:
+    divergencias = asyncio.run(_conferir_pagamentos(args.usuario_id))
+    falhas = 0
+    for usuario_id, lista in divergencias.items():
+        falhas += bool(lista)
+        print(f"GET /pagamentos (usuário {usuario_id}): {'ok' if not lista else f'{len(lista)} divergências'}")
+        for divergencia in lista[:20]:
+            print(f"    {divergencia}")
+    sys.exit(1 if falhas else 0)
+
+async def _conferir_orcamentos(usuario_id):
+    # Importado aqui para não carregar a aplicação nos demais comandos
+    from app.main import app
+    from app.database import engine, async_engine
+    from app.instrumentacao import registrar_engines
+    from app.services.diagnostico_consultas import conferir_orcamentos
+    registrar_engines(engine, async_engine.sync_engine)
+    try:
+        return await conferir_orcamentos(app, usuario_id)
+    finally:
+        await async_engine.dispose()
+
+def cmd_verificar_consultas(args) -> None:
+    resultado = asyncio.run(_conferir_orcamentos(args.usuario_id))
+    falhas = 0
+    for rota, (status, consultas, orcamento) in resultado.items():
+        excedeu = status != 200 or consultas > orcamento
+        falhas += excedeu
+        situacao = f"HTTP {status}" if status != 200 else ("EXCEDIDO" if excedeu else "ok")
+        print(f"{rota}: {consultas}/{orcamento} consultas - {situacao}")
+    sys.exit(1 if falhas else 0)
+
+def mes_argumento(valor: str) -> str:
+    if not re.match(MES_REFERENCIA_PATTERN, valor):
+        raise argparse.ArgumentTypeError("use o formato YYYY-MM")
+    return valor
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m app.cli", description="Comandos administrativos")
+    subparsers = parser.add_subparsers(dest="comando", required=True)
+
+    reconstruir = subparsers.add_parser(
+        "reconstruir-resumo",
+        help="Recalcula a tabela resumo_mensal a partir de pagamentos, honorários e clientes"
+    )
+    reconstruir.add_argument("--usuario-id", type=int, default=None, help="Reconstrói apenas um usuário")
+    reconstruir.set_defaults(func=cmd_reconstruir_resumo)
+
+    backfill = subparsers.add_parser(
+        "backfill-mes-referencia",
+        help="Preenche mes_referencia nulo com o mês do vencimento"
+    )
+    backfill.set_defaults(func=cmd_backfill_mes_referencia)
+
+    reconciliar = subparsers.add_parser(
+        "reconciliar-status",
+        help="Recalcula valor_pago e o status (PAGO/PARCIAL/pendente) dos honorários a partir dos pagamentos"
+    )
+    reconciliar.set_defaults(func=cmd_reconciliar_status)
+
+    varrer = subparsers.add_parser(
+        "varrer-atrasados",
+        help="Marca como ATRASADO os honorários pendentes vencidos de todos os usuários"
+    )
+    varrer.set_defaults(func=cmd_varrer_atrasados)
+
+    recorrentes = subparsers.add_parser(
+        "gerar-recorrentes",
+        help="Gera os honorários das recorrências vigentes de todos os usuários (idempotente)"
+    )
+    recorrentes.add_argument(
+        "--mes", default=None, type=mes_argumento,
+        help="Mês de referência YYYY-MM (padrão: o mês atual e o próximo)"
+    )
+    recorrentes.set_defaults(func=cmd_gerar_recorrentes)
+
+    lembretes = subparsers.add_parser(
+        "enviar-lembretes",
+        help="Envia os lembretes de vencimento (3 dias, 1 dia e atraso) de todos os usuários"
+    )
+    lembretes.add_argument(
+        "--transporte", choices=["smtp", "arquivo"], default=None,
+        help="Padrão: LEMBRETES_TRANSPORTE, ou smtp se SMTP_HOST estiver definido"
+    )
+    lembretes.add_argument("--diretorio", default=None, help="Diretório dos .eml no transporte arquivo")
+    lembretes.add_argument(
+        "--data", type=date.fromisoformat, default=None,
+        help="Data de referência YYYY-MM-DD (padrão: hoje)"
+    )
+    lembretes.set_defaults(func=cmd_enviar_lembretes)
+
+    indices = subparsers.add_parser(
+        "verificar-indices",
+        help="Falha se alguma consulta principal fizer seq scan (EXPLAIN com enable_seqscan=off)"
+    )
+    indices.add_argument("--usuario-id", type=int, default=1)
+    indices.set_defaults(func=cmd_verificar_indices)
+
+    consultas = subparsers.add_parser(
+        "verificar-consultas",
+        help="Falha se alguma rota GET executar mais consultas SQL que o orçamento declarado"
+    )
+    consultas.add_argument("--usuario-id", type=int, default=1)
+    consultas.set_defaults(func=cmd_verificar_consultas)
+
+    projecoes = subparsers.add_parser(
+        "conferir-projecoes",
+        help="Falha se a listagem de pagamentos em projeção divergir da serialização pelo schema"
+    )
+    projecoes.add_argument("--usuario-id", type=int, default=None, help="Confere apenas um usuário")
+    projecoes.set_defaults(func=cmd_conferir_projecoes)
+
+    args = parser.parse_args(argv)
+    args.func(args)
+
+if __name__ == "__main__":
+    main()
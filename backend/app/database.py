@@ -1,24 +1,84 @@
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 import os
 from dotenv import load_dotenv
+from app.pool import (
+    QueuePoolMonitorado,
+    NullPoolMonitorado,
+    AsyncQueuePoolMonitorado,
+    AsyncNullPoolMonitorado
+)
 
 # Carrega variáveis do arquivo .env
 load_dotenv()
 
 DATABASE_URL = os.getenv("DATABASE_URL")
+# Engine assíncrona (asyncpg) das rotas async; por padrão, a mesma base de DATABASE_URL
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL") or (
+    make_url(DATABASE_URL).set(drivername="postgresql+asyncpg").render_as_string(hide_password=False)
+    if DATABASE_URL else None
+)
 
+def _env_bool(nome: str, padrao: bool) -> bool:
+    return os.getenv(nome, str(padrao)).lower() in ("1", "true", "sim")
 
-engine = create_engine(
-    DATABASE_URL,
-    pool_size=2,
-    max_overflow=3,
-    pool_pre_ping=True,
-    pool_recycle=1800,
-    pool_timeout=30
-)
+# Configuração do pool. Por padrão, o limite de conexões que a API pode abrir
+# (DB_MAX_CONNECTIONS) é dividido entre os workers do uvicorn (WEB_CONCURRENCY)
+# e, dentro de cada worker, entre a engine síncrona e a assíncrona.
+# DB_POOL_MODE=null usa NullPool, indicado atrás do PgBouncer em modo transaction,
+# que já faz o pooling: cada sessão abre e fecha sua conexão com o PgBouncer.
+DB_POOL_MODE = os.getenv("DB_POOL_MODE", "queue").lower()
+WORKERS = max(1, int(os.getenv("WEB_CONCURRENCY", "1")))
+DB_MAX_CONNECTIONS = int(os.getenv("DB_MAX_CONNECTIONS", "20"))
+_conexoes_por_engine = max(1, DB_MAX_CONNECTIONS // WORKERS // 2)
+
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", max(1, _conexoes_por_engine * 2 // 3)))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", max(0, _conexoes_por_engine - DB_POOL_SIZE)))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "10"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+DB_POOL_PRE_PING = _env_bool("DB_POOL_PRE_PING", True)
+
+if DB_POOL_MODE == "null":
+    engine = create_engine(
+        DATABASE_URL,
+        poolclass=NullPoolMonitorado,
+        pool_pre_ping=DB_POOL_PRE_PING
+    )
+else:
+    engine = create_engine(
+        DATABASE_URL,
+        poolclass=QueuePoolMonitorado,
+        pool_size=DB_POOL_SIZE,
+        max_overflow=DB_MAX_OVERFLOW,
+        pool_pre_ping=DB_POOL_PRE_PING,
+        pool_recycle=DB_POOL_RECYCLE,
+        pool_timeout=DB_POOL_TIMEOUT
+    )
 SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)
+
+if DB_POOL_MODE == "null":
+    async_engine = create_async_engine(
+        ASYNC_DATABASE_URL,
+        poolclass=AsyncNullPoolMonitorado,
+        pool_pre_ping=DB_POOL_PRE_PING,
+        # O PgBouncer em modo transaction não suporta prepared statements nomeados
+        connect_args={"statement_cache_size": 0, "prepared_statement_cache_size": 0}
+    )
+else:
+    async_engine = create_async_engine(
+        ASYNC_DATABASE_URL,
+        poolclass=AsyncQueuePoolMonitorado,
+        pool_size=DB_POOL_SIZE,
+        max_overflow=DB_MAX_OVERFLOW,
+        pool_pre_ping=DB_POOL_PRE_PING,
+        pool_recycle=DB_POOL_RECYCLE,
+        pool_timeout=DB_POOL_TIMEOUT
+    )
+AsyncSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
+
 Base = declarative_base()
 
 def get_db():
@@ -29,4 +89,12 @@ def get_db():
         db.rollback()
         raise e
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        try:
+            yield db
+        except Exception as e:
+            await db.rollback()
+            raise e
@@ -1,9 +1,58 @@
-from fastapi import Header, HTTPException
+from fastapi import Depends, Header, HTTPException, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+import hmac
+from datetime import date
 from typing import Optional
+from app.cache_http import aplicar_cache, cache_control, etag_confere
+from app.database import get_async_db
+from app.perfil import PERFIL_ADMIN_TOKEN
+from app.services.referencias import TabelaReferenciaCache
+from app.services.tokens import validar_token
+from app.services.versao_dados import etag_da_versao, obter_versao
 
-def get_usuario_id(user_id: Optional[int] = Header(None, alias="user-id")) -> int:
-    """Obtém o ID do usuário do header da requisição"""
-    if user_id is None:
-        raise HTTPException(status_code=401, detail="Usuário não autenticado")
-    return user_id
+async def get_usuario_id(authorization: Optional[str] = Header(None)) -> int:
+    """Obtém o ID do usuário do token de acesso (Authorization: Bearer <token>)"""
+    if authorization is None or not authorization.startswith("Bearer "):
+        raise HTTPException(
+            status_code=401,
+            detail="Usuário não autenticado",
+            headers={"WWW-Authenticate": "Bearer"}
+        )
+    return validar_token(authorization[len("Bearer "):])
 
+def exigir_admin(x_admin_token: Optional[str] = Header(None)) -> None:
+    """Rotas operacionais: exigem o token de admin (PERFIL_ADMIN_TOKEN) no header X-Admin-Token"""
+    if not PERFIL_ADMIN_TOKEN:
+        # Sem token configurado as rotas ficam desligadas
+        raise HTTPException(status_code=404, detail="Not Found")
+    if x_admin_token is None or not hmac.compare_digest(x_admin_token.encode(), PERFIL_ADMIN_TOKEN.encode()):
+        raise HTTPException(status_code=403, detail="Token de admin inválido")
+
+def versao_com_referencias(*caches: TabelaReferenciaCache):
+    """
+    GET condicional pela versão dos dados do usuário: responde 304 antes de a rota
+    executar qualquer consulta se o If-None-Match do cliente ainda for o atual.
+    Os `caches` das tabelas de referência exibidas pela rota entram no ETag, para
+    que renomear um status ou tipo de pagamento invalide as respostas guardadas.
+    """
+    async def versao_condicional(
+        request: Request,
+        response: Response,
+        usuario_id: int = Depends(get_usuario_id),
+        db: AsyncSession = Depends(get_async_db)
+    ) -> None:
+        referencias = []
+        for cache in caches:
+            # A rota lê o mesmo cache em seguida; aqui só garante que está carregado
+            await cache.obter_async(db)
+            referencias.append(cache.etag)
+        etag = etag_da_versao(usuario_id, await obter_versao(db, usuario_id), date.today(), referencias)
+        if etag_confere(request, etag):
+            raise HTTPException(
+                status_code=304,
+                headers={"ETag": etag, "Cache-Control": cache_control(max_age=0)}
+            )
+        aplicar_cache(response, etag, max_age=0)
+    return versao_condicional
+
+versao_condicional = versao_com_referencias()
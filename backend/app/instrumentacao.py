@@ -0,0 +1,179 @@
+"""
+Instrumentação das consultas SQL por requisição.
+
+Os eventos before/after_cursor_execute das engines (síncrona e assíncrona) somam,
+na medição da requisição atual (ContextVar), a quantidade de comandos, o tempo total
+no banco e o comando mais lento. O middleware abre a medição, devolve o resultado
+no cabeçalho Server-Timing e registra uma linha JSON por requisição no logger
+"app.sql".
+
+Rotas podem declarar um orçamento de consultas com `orcamento_consultas(n)`. Acima
+dele a requisição gera um aviso no log; com SQL_ORCAMENTO_ESTRITO=true (testes/CI)
+a resposta vira um 500 descrevendo o excesso, para que um N+1 novo quebre a build.
+"""
+import json
+import logging
+import os
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional
+from fastapi import Depends
+from sqlalchemy import event
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+logger = logging.getLogger("app.sql")
+
+INSTRUMENTACAO_SQL = os.getenv("INSTRUMENTACAO_SQL", "true").lower() in ("1", "true", "sim")
+SQL_ORCAMENTO_ESTRITO = os.getenv("SQL_ORCAMENTO_ESTRITO", "false").lower() in ("1", "true", "sim")
+# Tamanho máximo do SQL do comando mais lento no log
+SQL_LOG_TAMANHO = 300
+
+class MedicaoSQL:
+    __slots__ = ("consultas", "tempo", "mais_lenta", "sql_mais_lenta", "orcamento")
+
+    def __init__(self):
+        self.consultas = 0
+        self.tempo = 0.0
+        self.mais_lenta = 0.0
+        self.sql_mais_lenta: Optional[str] = None
+        self.orcamento: Optional[int] = None
+
+    def registrar(self, duracao: float, sql: str) -> None:
+        self.consultas += 1
+        self.tempo += duracao
+        if duracao > self.mais_lenta:
+            self.mais_lenta = duracao
+            self.sql_mais_lenta = sql
+
+    def excedeu(self) -> bool:
+        return self.orcamento is not None and self.consultas > self.orcamento
+
+    def server_timing(self, total: float) -> str:
+        return (
+            f'sql;dur={self.tempo * 1000:.2f};desc="{self.consultas} consultas", '
+            f"sql-lenta;dur={self.mais_lenta * 1000:.2f}, "
+            f"total;dur={total * 1000:.2f}"
+        )
+
+_medicao_atual: ContextVar[Optional[MedicaoSQL]] = ContextVar("medicao_sql", default=None)
+
+def medicao_atual() -> Optional[MedicaoSQL]:
+    return _medicao_atual.get()
+
+@contextmanager
+def medir_consultas():
+    """Abre uma medição fora do middleware (comandos e diagnósticos)"""
+    medicao = MedicaoSQL()
+    token = _medicao_atual.set(medicao)
+    try:
+        yield medicao
+    finally:
+        _medicao_atual.reset(token)
+
+# O início fica no contexto de execução de cada comando (e não numa pilha da conexão):
+# um comando que falha não chega ao after_cursor_execute e não deixa resto para trás
+def _antes(conn, cursor, statement, parameters, context, executemany):
+    if context is not None:
+        context._inicio_consulta = time.perf_counter()
+
+def _registrar(context, statement: str) -> None:
+    inicio = getattr(context, "_inicio_consulta", None)
+    medicao = _medicao_atual.get()
+    if inicio is not None and medicao is not None:
+        medicao.registrar(time.perf_counter() - inicio, statement)
+
+def _depois(conn, cursor, statement, parameters, context, executemany):
+    _registrar(context, statement)
+
+def _erro(contexto_erro) -> None:
+    # Comandos que falham também ocuparam o banco
+    if contexto_erro.execution_context is not None and contexto_erro.statement is not None:
+        _registrar(contexto_erro.execution_context, contexto_erro.statement)
+
+def registrar_engines(*engines) -> None:
+    """Liga os eventos nas engines síncronas (para a assíncrona, passe async_engine.sync_engine)"""
+    for engine in engines:
+        if not event.contains(engine, "before_cursor_execute", _antes):
+            event.listen(engine, "before_cursor_execute", _antes)
+            event.listen(engine, "after_cursor_execute", _depois)
+            event.listen(engine, "handle_error", _erro)
+
+def orcamento_consultas(maximo: int):
+    """Dependência que declara quantos comandos SQL a rota pode executar"""
+    async def declarar_orcamento() -> None:
+        medicao = _medicao_atual.get()
+        if medicao is not None:
+            medicao.orcamento = maximo
+    declarar_orcamento.orcamento = maximo
+    return Depends(declarar_orcamento)
+
+class InstrumentacaoSQL:
+    """Middleware ASGI puro, para medir também respostas em streaming"""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        # Reaproveita a medição aberta por quem chamou a aplicação (verificar-consultas)
+        medicao = _medicao_atual.get() or MedicaoSQL()
+        token = _medicao_atual.set(medicao)
+        inicio = time.perf_counter()
+        status = 500
+        bloqueada = False
+
+        async def enviar(mensagem: Message) -> None:
+            nonlocal status, bloqueada
+            if mensagem["type"] == "http.response.start":
+                status = mensagem["status"]
+                if medicao.excedeu() and SQL_ORCAMENTO_ESTRITO:
+                    bloqueada = True
+                    status = 500
+                    corpo = json.dumps({
+                        "detail": f"Orçamento de consultas excedido: {medicao.consultas} > {medicao.orcamento}"
+                    }).encode()
+                    await send({
+                        "type": "http.response.start",
+                        "status": 500,
+                        "headers": [
+                            (b"content-type", b"application/json"),
+                            (b"content-length", str(len(corpo)).encode()),
+                            (b"server-timing", medicao.server_timing(time.perf_counter() - inicio).encode())
+                        ]
+                    })
+                    await send({"type": "http.response.body", "body": corpo})
+                    return
+                headers = MutableHeaders(scope=mensagem)
+                headers.append("Server-Timing", medicao.server_timing(time.perf_counter() - inicio))
+            if not bloqueada:
+                await send(mensagem)
+
+        try:
+            await self.app(scope, receive, enviar)
+        finally:
+            _medicao_atual.reset(token)
+            self._registrar_log(scope, status, medicao, time.perf_counter() - inicio)
+
+    @staticmethod
+    def _registrar_log(scope: Scope, status: int, medicao: MedicaoSQL, total: float) -> None:
+        rota = getattr(scope.get("route"), "path", None) or scope["path"]
+        registro = {
+            "metodo": scope["method"],
+            "rota": rota,
+            "status": status,
+            "consultas": medicao.consultas,
+            "tempo_sql_ms": round(medicao.tempo * 1000, 2),
+            "mais_lenta_ms": round(medicao.mais_lenta * 1000, 2),
+            "sql_mais_lenta": (medicao.sql_mais_lenta or "")[:SQL_LOG_TAMANHO] or None,
+            "total_ms": round(total * 1000, 2),
+            "orcamento": medicao.orcamento
+        }
+        if medicao.excedeu():
+            logger.warning(json.dumps({"evento": "orcamento_excedido", **registro}, ensure_ascii=False))
+        else:
+            logger.info(json.dumps(registro, ensure_ascii=False))
@@ -1,13 +1,14 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
-from app.database import engine, Base
-from app.routers import clientes, honorarios, pagamentos, tipo_pagamento, dashboard, auth
-from app import models  # Isso importa os modelos e garante que as tabelas sejam criadas
+from prometheus_client import CONTENT_TYPE_LATEST
+from app.routers import clientes, honorarios, pagamentos, recorrencias, tipo_pagamento, status, dashboard, auth, metricas
+from app.services import agendador, senhas
+from app.migracoes import verificar_esquema
+from app.database import engine, async_engine
+from app import instrumentacao, perfil, prometheus
+from app.respostas import RespostaJSON
 
-# Create database tables
-Base.metadata.create_all(bind=engine)
-
-app = FastAPI(title="Controle de Honorários API")
+app = FastAPI(title="Controle de Honorários API", default_response_class=RespostaJSON)
 
 # Configuração do CORS
 app.add_middleware(
@@ -16,14 +17,67 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "ETag", "Content-Disposition", "Server-Timing"],
 )
 
+# Quantidade e tempo das consultas SQL por requisição (Server-Timing e log "app.sql")
+if instrumentacao.INSTRUMENTACAO_SQL:
+    instrumentacao.registrar_engines(engine, async_engine.sync_engine)
+    app.add_middleware(instrumentacao.InstrumentacaoSQL)
+
+# Métricas Prometheus (GET /metrics); veja app/prometheus.py para vários workers
+if prometheus.METRICAS_ATIVAS:
+    prometheus.registrar_pools({"sync": engine, "async": async_engine.sync_engine})
+    app.add_middleware(prometheus.MetricasHTTP)
+
+    @app.get("/metrics", include_in_schema=False)
+    def metricas_prometheus():
+        # Content-Type pelo header: com media_type o Starlette acrescentaria outro charset
+        return Response(prometheus.gerar(), headers={"Content-Type": CONTENT_TYPE_LATEST})
+
+# Perfil sob demanda de uma requisição (header X-Perfil com o token de admin)
+if perfil.PERFIL_ADMIN_TOKEN:
+    instrumentacao.registrar_engines(engine, async_engine.sync_engine)
+    app.add_middleware(perfil.PerfilRequisicao, token=perfil.PERFIL_ADMIN_TOKEN)
+
 app.include_router(clientes.router)
 app.include_router(honorarios.router)
 app.include_router(pagamentos.router)
+app.include_router(recorrencias.router)
 app.include_router(tipo_pagamento.router)
+app.include_router(status.router)
 app.include_router(dashboard.router)
 app.include_router(auth.router)
+app.include_router(metricas.router)
+
+@app.on_event("startup")
+def verificar_migracoes():
+    # O esquema é criado/atualizado pelo Alembic; aqui só confere a revisão
+    verificar_esquema()
+
+@app.on_event("startup")
+async def iniciar_agendador():
+    agendador.iniciar()
+
+@app.on_event("startup")
+async def iniciar_pool_senhas():
+    await senhas.iniciar()
+
+@app.on_event("shutdown")
+async def parar_pool_senhas():
+    senhas.parar()
+
+@app.on_event("shutdown")
+async def parar_agendador():
+    await agendador.parar()
+
+@app.on_event("shutdown")
+async def fechar_conexoes_async():
+    await async_engine.dispose()
+
+@app.on_event("shutdown")
+def encerrar_metricas():
+    prometheus.encerrar_processo()
 
 @app.get("/")
 def read_root():
@@ -0,0 +1,58 @@
+"""
+Verificação do esquema na subida da aplicação.
+
+O esquema é gerenciado pelas migrações do Alembic (backend/alembic). Na subida, cada
+worker só confere se o banco está na revisão head do código (uma consulta), em vez de
+refletir o esquema inteiro. O comportamento é definido por DB_STARTUP_MODE:
+
+- check (padrão): falha a subida se o banco não estiver na revisão head
+- upgrade: aplica as migrações pendentes (útil em desenvolvimento; evite com vários workers)
+- off: não verifica nada
+"""
+import os
+from pathlib import Path
+from typing import Optional
+from alembic import command
+from alembic.config import Config
+from alembic.script import ScriptDirectory
+from sqlalchemy import text
+from sqlalchemy.exc import ProgrammingError
+from app.database import engine
+
+DB_STARTUP_MODE = os.getenv("DB_STARTUP_MODE", "check").lower()
+
+_BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+def alembic_config() -> Config:
+    config = Config(str(_BACKEND_DIR / "alembic.ini"))
+    config.set_main_option("script_location", str(_BACKEND_DIR / "alembic"))
+    # Não reconfigura o logging da aplicação ao rodar dentro do processo
+    config.attributes["configurar_logging"] = False
+    return config
+
+def revisao_head() -> str:
+    """Revisão head das migrações do código (lida dos arquivos, sem acessar o banco)"""
+    return ScriptDirectory.from_config(alembic_config()).get_current_head()
+
+def revisao_banco() -> Optional[str]:
+    """Revisão aplicada no banco, ou None se o banco nunca foi migrado"""
+    with engine.connect() as conexao:
+        try:
+            return conexao.execute(text("SELECT version_num FROM alembic_version")).scalar()
+        except ProgrammingError:
+            return None
+
+def verificar_esquema() -> None:
+    if DB_STARTUP_MODE == "off":
+        return
+    if DB_STARTUP_MODE == "upgrade":
+        command.upgrade(alembic_config(), "head")
+        return
+
+    esperada = revisao_head()
+    atual = revisao_banco()
+    if atual != esperada:
+        raise RuntimeError(
+            f"Banco na revisão {atual or 'nenhuma'}, mas o código espera {esperada}. "
+            "Rode `alembic upgrade head` em backend/ antes de subir a API."
+        )
@@ -5,6 +5,9 @@ from .status import Status
 from .pagamentos import Pagamento
 from .tipo_pagamento import TipoPagamento
 from .usuario import Usuario
+from .resumo_mensal import ResumoMensal
+from .versao_dados import VersaoDados
+from .recorrencias import Recorrencia
 
 __all__ = [
     'Cliente',
@@ -12,5 +15,8 @@ __all__ = [
     'Status',
     'Pagamento',
     'TipoPagamento',
-    'Usuario'
+    'Usuario',
+    'ResumoMensal',
+    'VersaoDados',
+    'Recorrencia'
 ]
\ No newline at end of file
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean, Date
+from sqlalchemy import Column, Integer, String, Boolean, Date, Index
 from sqlalchemy.orm import relationship
 from app.database import Base
 from datetime import date
@@ -6,6 +6,13 @@ from sqlalchemy.sql import text
 
 class Cliente(Base):
     __tablename__ = "clientes"
+    __table_args__ = (
+        Index(
+            "ix_clientes_usuario_criacao",
+            "usuario_id", "data_criacao",
+            postgresql_where=text("is_deleted = false")
+        ),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     usuario_id = Column(Integer, nullable=False, index=True)
@@ -1,5 +1,6 @@
-from sqlalchemy import Column, Integer, String, Float, ForeignKey, Date, Boolean
+from sqlalchemy import Column, Integer, String, Float, ForeignKey, Date, Boolean, Index
 from sqlalchemy.orm import relationship
+from sqlalchemy.sql import text
 from datetime import date
 from app.database import Base
 from app.models.clientes import Cliente
@@ -8,11 +9,57 @@ from app.models.status import Status
 
 class Honorario(Base):
     __tablename__ = "honorarios"
+    __table_args__ = (
+        # Listagem paginada (keyset) e clientes com vencimentos futuros
+        Index(
+            "ix_honorarios_usuario_vencimento",
+            "usuario_id", "data_vencimento", "id",
+            postgresql_where=text("is_deleted = false")
+        ),
+        # Resumo mensal e filtros por mês de referência
+        Index(
+            "ix_honorarios_usuario_mes",
+            "usuario_id", "mes_referencia",
+            postgresql_where=text("is_deleted = false")
+        ),
+        # Varredura de atrasados (todos os usuários)
+        Index(
+            "ix_honorarios_pendentes_vencimento",
+            "data_vencimento",
+            postgresql_where=text("status_id = 1")
+        ),
+        Index("ix_honorarios_cliente_id", "cliente_id"),
+        # Lembretes de vencimento: uma faixa por flag, só as linhas ainda não avisadas
+        Index(
+            "ix_honorarios_lembrete_3_dias",
+            "data_vencimento",
+            postgresql_where=text("notificado3 = false AND is_deleted = false AND status_id IN (1, 3, 4)")
+        ),
+        Index(
+            "ix_honorarios_lembrete_1_dia",
+            "data_vencimento",
+            postgresql_where=text("notificado1a = false AND is_deleted = false AND status_id IN (1, 3, 4)")
+        ),
+        Index(
+            "ix_honorarios_lembrete_atraso",
+            "data_vencimento",
+            postgresql_where=text("notificado = false AND is_deleted = false AND status_id IN (1, 3, 4)")
+        ),
+        # Idempotência do gerador de recorrências: um honorário por recorrência e mês
+        Index(
+            "ux_honorarios_recorrencia_mes",
+            "recorrencia_id", "mes_referencia",
+            unique=True,
+            postgresql_where=text("recorrencia_id IS NOT NULL")
+        ),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     usuario_id = Column(Integer, nullable=False, index=True)
     cliente_id = Column(Integer, ForeignKey("clientes.id"))
     valor = Column(Float, nullable=False)
+    # Soma dos pagamentos ativos, mantida por situacao_honorarios
+    valor_pago = Column(Float, nullable=False, default=0, server_default=text("0"))
     status_id = Column(Integer, ForeignKey("status.id"))
     data_vencimento = Column(Date, nullable=False)
     mes_referencia = Column(String(7), nullable=False)
@@ -21,6 +68,7 @@ class Honorario(Base):
     notificado1a = Column(Boolean, default=False, nullable=False)
     notificado3 = Column(Boolean, default=False, nullable=False)
     is_deleted = Column(Boolean, default=False, nullable=False)
+    recorrencia_id = Column(Integer, ForeignKey("recorrencias.id"), nullable=True)
 
     cliente = relationship("Cliente", back_populates="honorarios")
     status = relationship("Status")
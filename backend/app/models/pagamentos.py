@@ -1,10 +1,19 @@
-from sqlalchemy import Column, Integer, String, Float, ForeignKey, Date, Boolean
+from sqlalchemy import Column, Integer, String, Float, ForeignKey, Date, Boolean, Index
 from sqlalchemy.orm import relationship
+from sqlalchemy.sql import text
 from datetime import date
 from app.database import Base
 
 class Pagamento(Base):
     __tablename__ = "pagamentos"
+    __table_args__ = (
+        Index(
+            "ix_pagamentos_usuario_data",
+            "usuario_id", "data_pagamento",
+            postgresql_where=text("is_deleted = false")
+        ),
+        Index("ix_pagamentos_honorario_id", "honorario_id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     usuario_id = Column(Integer, nullable=False, index=True)
@@ -0,0 +1,29 @@
+from sqlalchemy import Column, Integer, String, Float, ForeignKey, Boolean, Index
+from sqlalchemy.orm import relationship
+from sqlalchemy.sql import text
+from app.database import Base
+
+class Recorrencia(Base):
+    """Honorário que se repete (mensalidade); o gerador cria um honorário por período"""
+    __tablename__ = "recorrencias"
+    __table_args__ = (
+        Index(
+            "ix_recorrencias_usuario_id",
+            "usuario_id",
+            postgresql_where=text("is_deleted = false")
+        ),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    usuario_id = Column(Integer, nullable=False)
+    cliente_id = Column(Integer, ForeignKey("clientes.id"), nullable=False)
+    valor = Column(Float, nullable=False)
+    dia_vencimento = Column(Integer, nullable=False)
+    # Intervalo em meses entre dois honorários (1 mensal, 3 trimestral, 12 anual)
+    periodicidade_meses = Column(Integer, nullable=False, default=1)
+    mes_inicio = Column(String(7), nullable=False)
+    mes_fim = Column(String(7), nullable=True)
+    descricao = Column(String, nullable=True)
+    is_deleted = Column(Boolean, default=False, nullable=False)
+
+    cliente = relationship("Cliente")
@@ -0,0 +1,16 @@
+from sqlalchemy import Column, Integer, String, Float
+from app.database import Base
+
+class ResumoMensal(Base):
+    """Totais mensais por usuário, mantidos pelos serviços a cada escrita"""
+    __tablename__ = "resumo_mensal"
+
+    usuario_id = Column(Integer, primary_key=True)
+    mes = Column(String(7), primary_key=True)
+    total_recebido = Column(Float, nullable=False, default=0)
+    total_faturado = Column(Float, nullable=False, default=0)
+    total_pendente = Column(Float, nullable=False, default=0)
+    qtd_pendentes = Column(Integer, nullable=False, default=0)
+    qtd_honorarios = Column(Integer, nullable=False, default=0)
+    clientes_ativos = Column(Integer, nullable=False, default=0)
+    novos_clientes = Column(Integer, nullable=False, default=0)
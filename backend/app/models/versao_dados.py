@@ -0,0 +1,9 @@
+from sqlalchemy import Column, Integer, BigInteger
+from app.database import Base
+
+class VersaoDados(Base):
+    """Contador por usuário, incrementado a cada escrita nos dados dele (usado nos ETags)"""
+    __tablename__ = "versao_dados"
+
+    usuario_id = Column(Integer, primary_key=True)
+    versao = Column(BigInteger, nullable=False, default=1)
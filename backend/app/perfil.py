@@ -0,0 +1,173 @@
+"""
+Perfil (cProfile) de uma requisição específica, sob demanda, para investigar em
+produção uma rota lenta relatada por um usuário.
+
+Só é instalado com PERFIL_ADMIN_TOKEN definido; sem ele, nada deste módulo roda.
+Com o middleware instalado, uma requisição é perfilada quando traz o token no header
+X-Perfil; as demais só pagam a procura pelo header. O token não é aceito na query
+string, que acaba em logs de acesso, históricos e proxies.
+
+O relatório separa o tempo total da requisição em:
+
+- sql: execução dos comandos no banco (eventos de app.instrumentacao)
+- orm: montagem dos objetos a partir das linhas (sqlalchemy.orm.loading)
+- serializacao: validação pelo response_model e render do JSON
+
+e lista as funções com maior tempo acumulado. Ele é gravado em PERFIL_DIRETORIO
+(.txt, e .prof para abrir no snakeviz/pstats), com o nome no header X-Perfil e os
+tempos no Server-Timing. Com ?perfil_saida=relatorio, o relatório substitui o corpo
+da resposta.
+
+Limitações: o cProfile mede só a thread do event loop (o trabalho de rotas síncronas
+no threadpool não aparece, mas o SQL delas sim) e, enquanto mede, inclui o que outras
+requisições executarem no mesmo loop. Um perfil por vez em cada worker.
+"""
+import cProfile
+import hmac
+import io
+import os
+import pstats
+import re
+import time
+from contextlib import ExitStack
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Optional
+from urllib.parse import parse_qs
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.instrumentacao import MedicaoSQL, medicao_atual, medir_consultas
+
+PERFIL_ADMIN_TOKEN = os.getenv("PERFIL_ADMIN_TOKEN")
+PERFIL_DIRETORIO = os.getenv("PERFIL_DIRETORIO", "perfis")
+# Funções listadas no relatório, por tempo acumulado
+PERFIL_FUNCOES = 40
+
+# (fim do caminho do arquivo, função) cujo tempo acumulado forma cada categoria
+CATEGORIAS = {
+    "orm": [("sqlalchemy/orm/loading.py", "instances")],
+    "serializacao": [("fastapi/routing.py", "serialize_response"), ("app/respostas.py", "render")],
+}
+
+_em_andamento = False
+
+def _token_da_requisicao(scope: Scope) -> Optional[str]:
+    for nome, valor in scope["headers"]:
+        if nome == b"x-perfil":
+            return valor.decode("latin-1")
+    return None
+
+def _saida(scope: Scope) -> str:
+    return parse_qs(scope["query_string"].decode("latin-1")).get("perfil_saida", ["arquivo"])[0]
+
+def _tempos(estatisticas: pstats.Stats, total: float, medicao: MedicaoSQL) -> Dict[str, float]:
+    tempos = {"total": total, "sql": medicao.tempo}
+    for categoria, funcoes in CATEGORIAS.items():
+        tempos[categoria] = sum(
+            acumulado
+            for (arquivo, _, funcao), (_, _, _, acumulado, _) in estatisticas.stats.items()
+            if any(arquivo.replace("\\", "/").endswith(fim) and funcao == nome for fim, nome in funcoes)
+        )
+    tempos["outros"] = max(0.0, total - sum(tempos[categoria] for categoria in ("sql", *CATEGORIAS)))
+    return tempos
+
+def _relatorio(scope: Scope, tempos: Dict[str, float], medicao: MedicaoSQL, estatisticas: pstats.Stats) -> str:
+    saida = io.StringIO()
+    saida.write(f"{scope['method']} {scope['path']}?{scope['query_string'].decode('latin-1')}\n")
+    saida.write(f"{datetime.now().isoformat(timespec='seconds')} - {medicao.consultas} consultas SQL\n\n")
+    for categoria, segundos in tempos.items():
+        parcela = segundos / tempos["total"] * 100 if tempos["total"] else 0
+        saida.write(f"{categoria:<14}{segundos * 1000:>10.2f} ms{parcela:>7.1f}%\n")
+    if medicao.sql_mais_lenta:
+        saida.write(f"\nSQL mais lento ({medicao.mais_lenta * 1000:.2f} ms):\n{medicao.sql_mais_lenta}\n")
+    saida.write("\n")
+    estatisticas.stream = saida
+    estatisticas.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(PERFIL_FUNCOES)
+    return saida.getvalue()
+
+def _gravar(scope: Scope, relatorio: str, perfil: cProfile.Profile) -> str:
+    diretorio = Path(PERFIL_DIRETORIO)
+    diretorio.mkdir(parents=True, exist_ok=True)
+    rota = re.sub(r"[^a-zA-Z0-9]+", "-", scope["path"]).strip("-") or "raiz"
+    nome = f"{datetime.now():%Y%m%d-%H%M%S}-{scope['method'].lower()}-{rota}-{os.getpid()}"
+    (diretorio / f"{nome}.txt").write_text(relatorio, encoding="utf-8")
+    perfil.dump_stats(str(diretorio / f"{nome}.prof"))
+    return f"{nome}.txt"
+
+class PerfilRequisicao:
+    """Middleware ASGI puro; instale só quando PERFIL_ADMIN_TOKEN estiver definido"""
+
+    def __init__(self, app: ASGIApp, token: str):
+        self.app = app
+        self.token = token.encode()
+
+    def _autorizada(self, scope: Scope) -> bool:
+        token = _token_da_requisicao(scope)
+        return token is not None and hmac.compare_digest(token.encode(), self.token)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        global _em_andamento
+        if scope["type"] != "http" or not self._autorizada(scope):
+            await self.app(scope, receive, send)
+            return
+        if _em_andamento:
+            await self.app(scope, receive, self._com_header(send, "ocupado"))
+            return
+
+        _em_andamento = True
+        perfil = cProfile.Profile()
+        substituida = False
+        with ExitStack() as pilha:
+            # Usa a medição do InstrumentacaoSQL, se ativo, ou abre uma só para o perfil
+            medicao = medicao_atual() or pilha.enter_context(medir_consultas())
+            inicio = time.perf_counter()
+
+            async def enviar(mensagem: Message) -> None:
+                nonlocal substituida
+                if substituida:
+                    return
+                if mensagem["type"] == "http.response.start":
+                    # O corpo já foi serializado; o envio em si fica fora do perfil
+                    perfil.disable()
+                    total = time.perf_counter() - inicio
+                    estatisticas = pstats.Stats(perfil)
+                    tempos = _tempos(estatisticas, total, medicao)
+                    relatorio = _relatorio(scope, tempos, medicao, estatisticas)
+                    arquivo = _gravar(scope, relatorio, perfil)
+                    timing = ", ".join(
+                        f"perfil-{categoria};dur={segundos * 1000:.2f}" for categoria, segundos in tempos.items()
+                    )
+                    if _saida(scope) == "relatorio":
+                        substituida = True
+                        corpo = relatorio.encode()
+                        await send({
+                            "type": "http.response.start",
+                            "status": 200,
+                            "headers": [
+                                (b"content-type", b"text/plain; charset=utf-8"),
+                                (b"content-length", str(len(corpo)).encode()),
+                                (b"x-perfil", arquivo.encode()),
+                                (b"server-timing", timing.encode()),
+                            ]
+                        })
+                        await send({"type": "http.response.body", "body": corpo})
+                        return
+                    headers = MutableHeaders(scope=mensagem)
+                    headers.append("X-Perfil", arquivo)
+                    headers.append("Server-Timing", timing)
+                await send(mensagem)
+
+            try:
+                perfil.enable()
+                await self.app(scope, receive, enviar)
+            finally:
+                perfil.disable()
+                _em_andamento = False
+
+    @staticmethod
+    def _com_header(send: Send, valor: str) -> Send:
+        async def enviar(mensagem: Message) -> None:
+            if mensagem["type"] == "http.response.start":
+                MutableHeaders(scope=mensagem).append("X-Perfil", valor)
+            await send(mensagem)
+        return enviar
@@ -0,0 +1,106 @@
+"""
+Pools de conexão instrumentados.
+
+Medem o tempo que cada requisição espera por uma conexão, quantas esperas estouram
+o pool_timeout e até onde o overflow foi usado, para dimensionar o pool com dados reais.
+"""
+import threading
+import time
+from typing import Dict
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool, QueuePool
+
+# Limites (em segundos) dos buckets do histograma de espera por conexão
+BUCKETS_ESPERA = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 30.0)
+
+class MetricasPool:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.aguardando = 0
+        self.espera_total = 0.0
+        self.espera_maxima = 0.0
+        self.overflow_maximo = 0
+        self.buckets = [0] * (len(BUCKETS_ESPERA) + 1)
+
+    def inicio_espera(self) -> None:
+        with self._lock:
+            self.aguardando += 1
+
+    def fim_espera(self, espera: float, timeout: bool, overflow: int) -> None:
+        with self._lock:
+            self.aguardando -= 1
+            if timeout:
+                self.timeouts += 1
+                return
+            self.checkouts += 1
+            self.espera_total += espera
+            self.espera_maxima = max(self.espera_maxima, espera)
+            self.overflow_maximo = max(self.overflow_maximo, overflow)
+            for i, limite in enumerate(BUCKETS_ESPERA):
+                if espera <= limite:
+                    self.buckets[i] += 1
+                    break
+            else:
+                self.buckets[-1] += 1
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            return {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "aguardando": self.aguardando,
+                "espera_media_ms": round(self.espera_total / self.checkouts * 1000, 3) if self.checkouts else 0,
+                "espera_maxima_ms": round(self.espera_maxima * 1000, 3),
+                "overflow_maximo": self.overflow_maximo,
+                "histograma_espera": {
+                    **{f"<={limite}s": total for limite, total in zip(BUCKETS_ESPERA, self.buckets)},
+                    f">{BUCKETS_ESPERA[-1]}s": self.buckets[-1]
+                }
+            }
+
+class _PoolMonitorado:
+    """Mixin que cronometra a obtenção de conexões do pool"""
+    metricas: MetricasPool
+
+    def _do_get(self):
+        self.metricas.inicio_espera()
+        inicio = time.perf_counter()
+        timeout = False
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            timeout = True
+            raise
+        finally:
+            overflow = self.overflow() if hasattr(self, "overflow") else 0
+            self.metricas.fim_espera(time.perf_counter() - inicio, timeout, max(overflow, 0))
+
+class QueuePoolMonitorado(_PoolMonitorado, QueuePool):
+    metricas = MetricasPool()
+
+class NullPoolMonitorado(_PoolMonitorado, NullPool):
+    metricas = MetricasPool()
+
+class AsyncQueuePoolMonitorado(_PoolMonitorado, AsyncAdaptedQueuePool):
+    metricas = MetricasPool()
+
+class AsyncNullPoolMonitorado(_PoolMonitorado, NullPool):
+    metricas = MetricasPool()
+
+def estado_pool(pool) -> Dict:
+    """Estado atual do pool e métricas acumuladas desde a subida do processo"""
+    estado = {"tipo": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        estado.update(
+            tamanho=pool.size(),
+            em_uso=pool.checkedout(),
+            livres=pool.checkedin(),
+            overflow=max(pool.overflow(), 0),
+            max_overflow=pool._max_overflow,
+            timeout=pool.timeout()
+        )
+    if isinstance(pool, _PoolMonitorado):
+        estado.update(pool.metricas.snapshot())
+    return estado
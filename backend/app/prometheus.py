@@ -0,0 +1,168 @@
+"""
+Métricas Prometheus da API, expostas em GET /metrics.
+
+Com vários workers do uvicorn, defina PROMETHEUS_MULTIPROC_DIR (diretório vazio,
+limpo a cada deploy) antes de subir a API: cada processo grava seus contadores,
+histogramas e gauges em arquivos mmap nesse diretório e o /metrics, atendido por
+qualquer worker, soma todos. Sem a variável, as métricas são só do processo.
+
+- requisições por rota/método/status, histograma de latência e requisições em andamento
+- ocupação do threadpool do anyio (rotas síncronas e run_in_threadpool)
+- pools do SQLAlchemy: conexões em uso, overflow e requisições aguardando conexão
+- negócio: honorários criados, pagamentos registrados e varreduras de atrasados
+"""
+import os
+import time
+from typing import Dict
+import anyio.to_thread
+from prometheus_client import (
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess
+)
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+METRICAS_ATIVAS = os.getenv("METRICAS_ATIVAS", "true").lower() in ("1", "true", "sim")
+MULTIPROCESSO = bool(os.getenv("PROMETHEUS_MULTIPROC_DIR"))
+
+# Limites (em segundos) do histograma de latência das requisições
+BUCKETS_LATENCIA = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+requisicoes = Counter(
+    "api_requisicoes_total",
+    "Requisições atendidas",
+    ["metodo", "rota", "status"]
+)
+latencia = Histogram(
+    "api_requisicao_duracao_segundos",
+    "Duração das requisições até o fim da resposta",
+    ["metodo", "rota"],
+    buckets=BUCKETS_LATENCIA
+)
+em_andamento = Gauge(
+    "api_requisicoes_em_andamento",
+    "Requisições sendo atendidas",
+    multiprocess_mode="livesum"
+)
+threadpool_em_uso = Gauge(
+    "api_threadpool_em_uso",
+    "Threads do anyio ocupadas (rotas síncronas e run_in_threadpool)",
+    multiprocess_mode="livesum"
+)
+threadpool_limite = Gauge(
+    "api_threadpool_limite",
+    "Limite de threads do anyio",
+    multiprocess_mode="livesum"
+)
+pool_em_uso = Gauge(
+    "db_pool_conexoes_em_uso",
+    "Conexões do pool emprestadas",
+    ["pool"],
+    multiprocess_mode="livesum"
+)
+pool_overflow = Gauge(
+    "db_pool_overflow",
+    "Conexões abertas além do pool_size",
+    ["pool"],
+    multiprocess_mode="livesum"
+)
+pool_aguardando = Gauge(
+    "db_pool_aguardando",
+    "Requisições esperando uma conexão do pool",
+    ["pool"],
+    multiprocess_mode="livesum"
+)
+
+honorarios_criados = Counter(
+    "honorarios_criados_total",
+    "Honorários criados",
+    ["origem"]
+)
+pagamentos_registrados = Counter(
+    "pagamentos_registrados_total",
+    "Pagamentos registrados",
+    ["origem"]
+)
+varreduras_atrasados = Counter(
+    "varreduras_atrasados_total",
+    "Varreduras de honorários atrasados executadas"
+)
+
+def _atualizar_pool(nome: str, pool, devolvendo: int = 0) -> None:
+    if not hasattr(pool, "checkedout"):
+        # NullPool: não há conexões guardadas nem overflow
+        return
+    pool_em_uso.labels(nome).set(pool.checkedout() - devolvendo)
+    pool_overflow.labels(nome).set(max(pool.overflow(), 0))
+    metricas = getattr(pool, "metricas", None)
+    if metricas is not None:
+        pool_aguardando.labels(nome).set(metricas.aguardando)
+
+def registrar_pools(engines: Dict[str, Engine]) -> None:
+    """Atualiza os gauges a cada checkout/checkin das engines (síncronas) informadas por nome"""
+    for nome, engine in engines.items():
+        def checkout(*_, nome=nome, engine=engine):
+            _atualizar_pool(nome, engine.pool)
+
+        def checkin(*_, nome=nome, engine=engine):
+            # O evento dispara antes de a conexão voltar para a fila
+            _atualizar_pool(nome, engine.pool, devolvendo=1)
+
+        event.listen(engine, "checkout", checkout)
+        event.listen(engine, "checkin", checkin)
+        _atualizar_pool(nome, engine.pool)
+
+def _atualizar_threadpool() -> None:
+    limitador = anyio.to_thread.current_default_thread_limiter()
+    threadpool_em_uso.set(limitador.borrowed_tokens)
+    threadpool_limite.set(limitador.total_tokens)
+
+class MetricasHTTP:
+    """Middleware ASGI puro; rotas sem correspondência ficam agrupadas em um só rótulo"""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        inicio = time.perf_counter()
+        status = 500
+        em_andamento.inc()
+        _atualizar_threadpool()
+
+        async def enviar(mensagem: Message) -> None:
+            nonlocal status
+            if mensagem["type"] == "http.response.start":
+                status = mensagem["status"]
+            await send(mensagem)
+
+        try:
+            await self.app(scope, receive, enviar)
+        finally:
+            rota = getattr(scope.get("route"), "path", None) or "nao_encontrada"
+            requisicoes.labels(scope["method"], rota, str(status)).inc()
+            latencia.labels(scope["method"], rota).observe(time.perf_counter() - inicio)
+            em_andamento.dec()
+            _atualizar_threadpool()
+
+def gerar() -> bytes:
+    """Texto de exposição; no modo multiprocesso, agrega os arquivos de todos os workers"""
+    if MULTIPROCESSO:
+        registro = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registro)
+        return generate_latest(registro)
+    return generate_latest(REGISTRY)
+
+def encerrar_processo() -> None:
+    """Remove os gauges "live" deste worker do agregado ao desligar"""
+    if MULTIPROCESSO:
+        multiprocess.mark_process_dead(os.getpid())
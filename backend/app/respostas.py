@@ -0,0 +1,26 @@
+"""
+Classe de resposta JSON padrão da API, serializada com orjson.
+
+orjson já converte date/datetime (ISO 8601), UUID e dataclasses nativamente; os
+demais tipos que aparecem nas respostas (Decimal de agregações do banco e modelos
+Pydantic devolvidos sem response_model) são tratados em _converter.
+"""
+from decimal import Decimal
+from typing import Any
+import orjson
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel
+
+def _converter(valor: Any) -> Any:
+    if isinstance(valor, Decimal):
+        return float(valor)
+    if isinstance(valor, BaseModel):
+        return valor.model_dump(mode="json")
+    raise TypeError(f"Tipo não serializável em JSON: {type(valor).__name__}")
+
+def dumps(conteudo: Any) -> bytes:
+    return orjson.dumps(conteudo, default=_converter, option=orjson.OPT_NON_STR_KEYS)
+
+class RespostaJSON(ORJSONResponse):
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
@@ -1,20 +1,29 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from app.database import get_db
-from app.schemas.usuario import UsuarioCreate, Usuario, UsuarioLogin
-from app.services.crud_usuario import create_usuario, authenticate_usuario
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import get_async_db
+from app.schemas.usuario import UsuarioCreate, Usuario, UsuarioLogin, RefreshRequest
+from app.services.crud_usuario import create_usuario, authenticate_usuario, usuario_existe
+from app.services import tokens
 
 router = APIRouter(prefix="/auth", tags=["autenticacao"])
 
+def _emitir_tokens(usuario_id: int) -> dict:
+    return {
+        "access_token": tokens.emitir_token(usuario_id, tokens.ACESSO),
+        "refresh_token": tokens.emitir_token(usuario_id, tokens.REFRESH),
+        "token_type": "bearer",
+        "expires_in": tokens.validade(tokens.ACESSO)
+    }
+
 @router.post("/cadastro", response_model=Usuario, status_code=status.HTTP_201_CREATED)
-def cadastrar_usuario(usuario: UsuarioCreate, db: Session = Depends(get_db)):
+async def cadastrar_usuario(usuario: UsuarioCreate, db: AsyncSession = Depends(get_async_db)):
     """Endpoint para cadastrar novo usuário"""
-    return create_usuario(db=db, usuario=usuario)
+    return await create_usuario(db=db, usuario=usuario)
 
 @router.post("/login")
-def login(credenciais: UsuarioLogin, db: Session = Depends(get_db)):
+async def login(credenciais: UsuarioLogin, db: AsyncSession = Depends(get_async_db)):
     """Endpoint para fazer login"""
-    usuario = authenticate_usuario(db=db, email=credenciais.email, senha=credenciais.senha)
+    usuario = await authenticate_usuario(db=db, email=credenciais.email, senha=credenciais.senha)
     
     if not usuario:
         raise HTTPException(
@@ -22,11 +31,23 @@ def login(credenciais: UsuarioLogin, db: Session = Depends(get_db)):
             detail="Email ou senha incorretos"
         )
     
-    # Retorna dados do usuário (sem senha)
+    # Retorna dados do usuário (sem senha) e os tokens da sessão
     return {
         "id": usuario.id,
         "nome": usuario.nome,
         "email": usuario.email,
-        "message": "Login realizado com sucesso"
+        "message": "Login realizado com sucesso",
+        **_emitir_tokens(usuario.id)
     }
 
+@router.post("/refresh")
+async def renovar_tokens(requisicao: RefreshRequest, db: AsyncSession = Depends(get_async_db)):
+    """Troca um refresh token válido por um novo par de tokens"""
+    usuario_id = tokens.validar_token(requisicao.refresh_token, tokens.REFRESH)
+    if not await usuario_existe(db, usuario_id):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Token inválido ou expirado"
+        )
+    return _emitir_tokens(usuario_id)
+
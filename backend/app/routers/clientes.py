@@ -1,9 +1,14 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
-from app.database import get_db
-from app.dependencies import get_usuario_id
+from app.database import get_db, get_async_db
+from app.dependencies import get_usuario_id, versao_condicional
+from app.instrumentacao import orcamento_consultas
 from app.schemas.clientes import Cliente, ClienteCreate
+from app.schemas.importacao import ResultadoImportacao
+from app.services import importacao
 from app.services.crud_clientes import (
     get_clientes,
     get_cliente_by_id,
@@ -17,12 +22,12 @@ router = APIRouter(
     tags=["clientes"]
 )
 
-@router.get("/", response_model=List[Cliente])
-def listar_clientes(
-    db: Session = Depends(get_db),
+@router.get("/", response_model=List[Cliente], dependencies=[Depends(versao_condicional), orcamento_consultas(2)])
+async def listar_clientes(
+    db: AsyncSession = Depends(get_async_db),
     usuario_id: int = Depends(get_usuario_id)
 ):
-    return get_clientes(db, usuario_id)
+    return await get_clientes(db, usuario_id)
 
 @router.get("/{cliente_id}", response_model=Cliente)
 def obter_cliente(
@@ -43,6 +48,19 @@ def criar_cliente(
 ):
     return create_cliente(db, cliente, usuario_id)
 
+@router.post("/import", response_model=ResultadoImportacao)
+async def importar_clientes(
+    request: Request,
+    db: Session = Depends(get_db),
+    usuario_id: int = Depends(get_usuario_id)
+):
+    """
+    Importa clientes em lote: array JSON, CSV no corpo (text/csv) ou arquivo CSV
+    (multipart, campo `arquivo`) com os mesmos campos da criação.
+    """
+    registros = await importacao.ler_registros(request)
+    return await run_in_threadpool(importacao.importar, db, "clientes", registros, usuario_id)
+
 @router.put("/{cliente_id}", response_model=Cliente)
 def atualizar_cliente(
     cliente_id: int, 
@@ -1,33 +1,87 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query, Request, Response
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
-from app.database import get_db
-from app.dependencies import get_usuario_id
+from datetime import date
+from app.database import get_db, get_async_db
+from app.dependencies import get_usuario_id, versao_com_referencias
+from app.instrumentacao import orcamento_consultas
 from app.schemas.honorarios import (
     Honorario,
     HonorarioCreate,
-    HonorarioUpdate
+    HonorarioUpdate,
+    MES_REFERENCIA_PATTERN
 )
-from app.services import crud_honorarios
+from app.schemas.importacao import ResultadoImportacao
+from app.services import crud_honorarios, exportacao, importacao
+from app.services.referencias import cache_status
 
 router = APIRouter(prefix="/honorarios", tags=["honorarios"])
 
-@router.get("/", response_model=List[Honorario])
-def listar_honorarios(
+@router.get("/", response_model=List[Honorario], dependencies=[Depends(versao_com_referencias(cache_status)), orcamento_consultas(3)])
+async def listar_honorarios(
+    response: Response,
     cliente_id: int | None = None,
     status_id: int | None = None,
-    db: Session = Depends(get_db),
+    data_inicio: date | None = Query(None, description="Vencimento a partir de"),
+    data_fim: date | None = Query(None, description="Vencimento até"),
+    mes_inicio: str | None = Query(None, pattern=MES_REFERENCIA_PATTERN),
+    mes_fim: str | None = Query(None, pattern=MES_REFERENCIA_PATTERN),
+    busca: str | None = Query(None, description="Texto na descrição ou no nome do cliente"),
+    limit: int | None = Query(None, ge=1, le=500),
+    cursor: str | None = None,
+    db: AsyncSession = Depends(get_async_db),
     usuario_id: int = Depends(get_usuario_id)
 ):
     """
-    Lista todos os honorários com opções de filtro.
+    Lista os honorários com opções de filtro, ordenados por vencimento.
+    Com `limit`, o cursor da próxima página vem no header X-Next-Cursor.
     """
-    return crud_honorarios.get_honorarios(
+    honorarios, next_cursor = await crud_honorarios.get_honorarios(
         db,
         usuario_id,
         cliente_id=cliente_id,
-        status_id=status_id
+        status_id=status_id,
+        vencimento_inicio=data_inicio,
+        vencimento_fim=data_fim,
+        mes_inicio=mes_inicio,
+        mes_fim=mes_fim,
+        busca=busca,
+        limit=limit,
+        cursor=cursor
     )
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return honorarios
+
+@router.get("/export")
+async def exportar_honorarios(
+    formato: str = Query("csv", pattern="^(csv|xlsx)$"),
+    cliente_id: int | None = None,
+    status_id: int | None = None,
+    data_inicio: date | None = Query(None, description="Vencimento a partir de"),
+    data_fim: date | None = Query(None, description="Vencimento até"),
+    mes_inicio: str | None = Query(None, pattern=MES_REFERENCIA_PATTERN),
+    mes_fim: str | None = Query(None, pattern=MES_REFERENCIA_PATTERN),
+    busca: str | None = Query(None, description="Texto na descrição ou no nome do cliente"),
+    usuario_id: int = Depends(get_usuario_id)
+):
+    """
+    Exporta todos os honorários do filtro (os mesmos da listagem) em CSV ou XLSX,
+    ordenados por vencimento e enviados em streaming.
+    """
+    consulta = exportacao.consulta_honorarios(
+        usuario_id,
+        cliente_id=cliente_id,
+        status_id=status_id,
+        vencimento_inicio=data_inicio,
+        vencimento_fim=data_fim,
+        mes_inicio=mes_inicio,
+        mes_fim=mes_fim,
+        busca=busca
+    )
+    return await exportacao.resposta_exportacao("honorarios", formato, consulta)
 
 @router.post("/", response_model=Honorario)
 def criar_honorario(
@@ -40,6 +94,19 @@ def criar_honorario(
     """
     return crud_honorarios.create_honorario(db, honorario, usuario_id)
 
+@router.post("/import", response_model=ResultadoImportacao)
+async def importar_honorarios(
+    request: Request,
+    db: Session = Depends(get_db),
+    usuario_id: int = Depends(get_usuario_id)
+):
+    """
+    Importa honorários em lote: array JSON, CSV no corpo (text/csv) ou arquivo CSV
+    (multipart, campo `arquivo`) com os mesmos campos da criação.
+    """
+    registros = await importacao.ler_registros(request)
+    return await run_in_threadpool(importacao.importar, db, "honorarios", registros, usuario_id)
+
 @router.put("/{honorario_id}", response_model=Honorario)
 def atualizar_honorario(
     honorario_id: int,
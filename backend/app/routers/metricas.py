@@ -0,0 +1,25 @@
+from fastapi import APIRouter, Depends
+from app.database import engine, async_engine, WORKERS
+from app.dependencies import exigir_admin
+from app.pool import estado_pool
+from app.services import senhas
+
+# Estado interno do processo: só com o token de admin (header X-Admin-Token)
+router = APIRouter(prefix="/metricas", tags=["metricas"], dependencies=[Depends(exigir_admin)])
+
+@router.get("/pool")
+def metricas_pool():
+    """
+    Estado dos pools de conexão deste worker: ocupação, overflow, tempos de espera
+    por conexão e timeouts desde a subida do processo.
+    """
+    return {
+        "workers": WORKERS,
+        "pool": estado_pool(engine.pool),
+        "pool_async": estado_pool(async_engine.sync_engine.pool)
+    }
+
+@router.get("/senhas")
+def metricas_senhas():
+    """Ocupação do pool de processos de hash de senhas deste worker"""
+    return senhas.estado()
@@ -1,27 +1,49 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query, Request, Response
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
-from app.database import get_db
-from app.dependencies import get_usuario_id
+from app.database import get_db, get_async_db
+from app.dependencies import get_usuario_id, versao_com_referencias
+from app.instrumentacao import orcamento_consultas
+from app.respostas import RespostaJSON
 from app.schemas.pagamentos import Pagamento, PagamentoCreate, PagamentoUpdate
-from app.services import crud_pagamentos
+from app.schemas.importacao import ResultadoImportacao
+from app.services import crud_pagamentos, exportacao, importacao
+from app.services.referencias import cache_tipos_pagamento
 
 router = APIRouter(prefix="/pagamentos", tags=["pagamentos"])
 
-@router.get("/", response_model=List[Pagamento])
-def listar_pagamentos(
+@router.get("/", response_model=List[Pagamento], dependencies=[Depends(versao_com_referencias(cache_tipos_pagamento)), orcamento_consultas(3)])
+async def listar_pagamentos(
+    response: Response,
     honorario_id: int | None = None,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     usuario_id: int = Depends(get_usuario_id)
 ):
     """
     Lista todos os pagamentos com opções de filtro.
     """
-    return crud_pagamentos.get_pagamentos(
+    pagamentos = await crud_pagamentos.get_pagamentos(
         db,
         usuario_id,
         honorario_id=honorario_id
     )
+    # Os dicts já seguem o schema Pagamento: serializa direto, sem revalidar
+    return RespostaJSON(pagamentos, headers=dict(response.headers))
+
+@router.get("/export")
+async def exportar_pagamentos(
+    formato: str = Query("csv", pattern="^(csv|xlsx)$"),
+    honorario_id: int | None = None,
+    usuario_id: int = Depends(get_usuario_id)
+):
+    """
+    Exporta todos os pagamentos do filtro (os mesmos da listagem) em CSV ou XLSX,
+    ordenados pela data do pagamento e enviados em streaming.
+    """
+    consulta = exportacao.consulta_pagamentos(usuario_id, honorario_id)
+    return await exportacao.resposta_exportacao("pagamentos", formato, consulta)
 
 @router.post("/", response_model=Pagamento)
 def criar_pagamento(
@@ -34,6 +56,19 @@ def criar_pagamento(
     """
     return crud_pagamentos.create_pagamento(db, pagamento, usuario_id)
 
+@router.post("/import", response_model=ResultadoImportacao)
+async def importar_pagamentos(
+    request: Request,
+    db: Session = Depends(get_db),
+    usuario_id: int = Depends(get_usuario_id)
+):
+    """
+    Importa pagamentos em lote: array JSON, CSV no corpo (text/csv) ou arquivo CSV
+    (multipart, campo `arquivo`) com os mesmos campos da criação.
+    """
+    registros = await importacao.ler_registros(request)
+    return await run_in_threadpool(importacao.importar, db, "pagamentos", registros, usuario_id)
+
 @router.put("/{pagamento_id}", response_model=Pagamento)
 def atualizar_pagamento(
     pagamento_id: int,
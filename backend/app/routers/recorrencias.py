@@ -0,0 +1,57 @@
+from fastapi import APIRouter, Depends
+from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List
+from app.database import get_db, get_async_db
+from app.dependencies import get_usuario_id
+from app.instrumentacao import orcamento_consultas
+from app.schemas.recorrencias import Recorrencia, RecorrenciaCreate, RecorrenciaUpdate
+from app.services import crud_recorrencias
+
+router = APIRouter(prefix="/recorrencias", tags=["recorrencias"])
+
+@router.get("/", response_model=List[Recorrencia], dependencies=[orcamento_consultas(1)])
+async def listar_recorrencias(
+    db: AsyncSession = Depends(get_async_db),
+    usuario_id: int = Depends(get_usuario_id)
+):
+    """
+    Lista os honorários recorrentes do usuário.
+    """
+    return await crud_recorrencias.get_recorrencias(db, usuario_id)
+
+@router.post("/", response_model=Recorrencia)
+def criar_recorrencia(
+    recorrencia: RecorrenciaCreate,
+    db: Session = Depends(get_db),
+    usuario_id: int = Depends(get_usuario_id)
+):
+    """
+    Cadastra um honorário recorrente. Os honorários de cada período são gerados
+    pela rotina diária no mês anterior ao vencimento.
+    """
+    return crud_recorrencias.create_recorrencia(db, recorrencia, usuario_id)
+
+@router.put("/{recorrencia_id}", response_model=Recorrencia)
+def atualizar_recorrencia(
+    recorrencia_id: int,
+    recorrencia: RecorrenciaUpdate,
+    db: Session = Depends(get_db),
+    usuario_id: int = Depends(get_usuario_id)
+):
+    """
+    Atualiza um honorário recorrente (vale para os honorários ainda não gerados).
+    """
+    return crud_recorrencias.update_recorrencia(db, recorrencia_id, recorrencia, usuario_id)
+
+@router.delete("/{recorrencia_id}")
+def remover_recorrencia(
+    recorrencia_id: int,
+    db: Session = Depends(get_db),
+    usuario_id: int = Depends(get_usuario_id)
+):
+    """
+    Encerra um honorário recorrente; os honorários já gerados são mantidos.
+    """
+    crud_recorrencias.delete_recorrencia(db, recorrencia_id, usuario_id)
+    return {"message": "Recorrência removida com sucesso"}
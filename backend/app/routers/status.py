@@ -0,0 +1,27 @@
+from fastapi import APIRouter, Depends, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List
+from app.cache_http import aplicar_cache, etag_confere, nao_modificado
+from app.database import get_async_db
+from app.instrumentacao import orcamento_consultas
+from app.schemas.status import Status
+from app.services import crud_status
+from app.services.referencias import cache_status, REFERENCIAS_MAX_AGE
+
+router = APIRouter(prefix="/status", tags=["status"])
+
+@router.get("/", response_model=List[Status], dependencies=[orcamento_consultas(1)])
+async def listar_status(
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Lista os status de honorário.
+    """
+    status = await crud_status.get_status(db)
+    etag = cache_status.etag
+    if etag_confere(request, etag):
+        return nao_modificado(etag, REFERENCIAS_MAX_AGE, privado=False)
+    aplicar_cache(response, etag, REFERENCIAS_MAX_AGE, privado=False)
+    return status
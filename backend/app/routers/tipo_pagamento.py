@@ -1,17 +1,27 @@
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
-from app.database import get_db
+from app.cache_http import aplicar_cache, etag_confere, nao_modificado
+from app.database import get_async_db
+from app.instrumentacao import orcamento_consultas
 from app.schemas.tipo_pagamento import TipoPagamento
 from app.services import crud_tipo_pagamento
+from app.services.referencias import cache_tipos_pagamento, REFERENCIAS_MAX_AGE
 
 router = APIRouter(prefix="/tipos-pagamento", tags=["tipos_pagamento"])
 
-@router.get("/", response_model=List[TipoPagamento])
-def listar_tipos_pagamento(
-    db: Session = Depends(get_db)
+@router.get("/", response_model=List[TipoPagamento], dependencies=[orcamento_consultas(1)])
+async def listar_tipos_pagamento(
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Lista todos os tipos de pagamento.
     """
-    return crud_tipo_pagamento.get_tipos_pagamento(db) 
\ No newline at end of file
+    tipos = await crud_tipo_pagamento.get_tipos_pagamento(db)
+    etag = cache_tipos_pagamento.etag
+    if etag_confere(request, etag):
+        return nao_modificado(etag, REFERENCIAS_MAX_AGE, privado=False)
+    aplicar_cache(response, etag, REFERENCIAS_MAX_AGE, privado=False)
+    return tipos
@@ -0,0 +1,19 @@
+from pydantic import BaseModel
+
+class DashboardStats(BaseModel):
+    totalRecebido: float
+    crescimentoMensal: float
+    clientesAtivos: int
+    novosClientes: int
+    honorariosPendentes: float
+    qtdHonorariosPendentes: int
+    honorariosCadastrados: int
+
+class RevenueData(BaseModel):
+    month: str
+    value: float
+
+class ClientData(BaseModel):
+    month: str
+    active: int
+    new: int
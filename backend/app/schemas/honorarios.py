@@ -5,13 +5,15 @@ import re
 from app.schemas.clientes import Cliente
 from app.schemas.status import Status
 
+MES_REFERENCIA_PATTERN = r'^\d{4}-(?:0[1-9]|1[0-2])$'
+
 class HonorarioBase(BaseModel):
     valor: float = Field(..., gt=0, description="Valor do honorário")
     cliente_id: int
     data_vencimento: date
     mes_referencia: str = Field(
         default_factory=lambda: datetime.now().strftime("%Y-%m"),
-        pattern=r'^\d{4}-(?:0[1-9]|1[0-2])$',
+        pattern=MES_REFERENCIA_PATTERN,
         description="Mês de referência no formato YYYY-MM"
     )
     descricao: Optional[str] = None
@@ -39,7 +41,7 @@ class HonorarioUpdate(BaseModel):
     data_vencimento: Optional[date] = None
     mes_referencia: Optional[str] = Field(
         None,
-        pattern=r'^\d{4}-(?:0[1-9]|1[0-2])$'
+        pattern=MES_REFERENCIA_PATTERN
     )
     descricao: Optional[str] = None
 
@@ -60,9 +62,11 @@ class HonorarioUpdate(BaseModel):
 class Honorario(HonorarioBase):
     id: int
     status_id: int
+    valor_pago: float = 0
     notificado: bool = False
     notificado1a: bool = False
     notificado3: bool = False
+    recorrencia_id: Optional[int] = None
     cliente: Optional[Cliente]
     status: Optional[Status]
 
@@ -0,0 +1,16 @@
+from pydantic import BaseModel
+from typing import List
+
+class LinhaImportada(BaseModel):
+    linha: int
+    id: int
+
+class ErroImportacao(BaseModel):
+    linha: int
+    erros: List[str]
+
+class ResultadoImportacao(BaseModel):
+    recebidas: int
+    importadas: int
+    criados: List[LinhaImportada]
+    erros: List[ErroImportacao]
@@ -11,7 +11,7 @@ class HonorarioWithCliente(BaseModel):
     mes_referencia: str
 
     class Config:
-        orm_mode = True
+        from_attributes = True
 
 class PagamentoBase(BaseModel):
     honorario_id: int
@@ -35,4 +35,4 @@ class Pagamento(PagamentoBase):
     tipo_pagamento: Optional[TipoPagamento]
 
     class Config:
-        orm_mode = True 
\ No newline at end of file
+        from_attributes = True 
\ No newline at end of file
@@ -0,0 +1,44 @@
+from pydantic import BaseModel, Field, field_validator
+from typing import Optional
+from app.schemas.clientes import Cliente
+from app.schemas.honorarios import MES_REFERENCIA_PATTERN
+
+class RecorrenciaBase(BaseModel):
+    cliente_id: int
+    valor: float = Field(..., gt=0, description="Valor de cada honorário gerado")
+    dia_vencimento: int = Field(
+        ..., ge=1, le=31,
+        description="Dia do vencimento; em meses mais curtos vence no último dia"
+    )
+    periodicidade_meses: int = Field(
+        1, ge=1, le=12,
+        description="Meses entre dois honorários (1 mensal, 3 trimestral, 12 anual)"
+    )
+    mes_inicio: str = Field(..., pattern=MES_REFERENCIA_PATTERN, description="Primeiro mês (YYYY-MM)")
+    mes_fim: Optional[str] = Field(None, pattern=MES_REFERENCIA_PATTERN, description="Último mês (YYYY-MM), opcional")
+    descricao: Optional[str] = None
+
+    @field_validator('mes_fim')
+    @classmethod
+    def validate_mes_fim(cls, v, info):
+        mes_inicio = info.data.get('mes_inicio')
+        if v is not None and mes_inicio and v < mes_inicio:
+            raise ValueError('mes_fim deve ser igual ou posterior a mes_inicio')
+        return v
+
+class RecorrenciaCreate(RecorrenciaBase):
+    pass
+
+class RecorrenciaUpdate(BaseModel):
+    valor: Optional[float] = Field(None, gt=0)
+    dia_vencimento: Optional[int] = Field(None, ge=1, le=31)
+    periodicidade_meses: Optional[int] = Field(None, ge=1, le=12)
+    mes_fim: Optional[str] = Field(None, pattern=MES_REFERENCIA_PATTERN)
+    descricao: Optional[str] = None
+
+class Recorrencia(RecorrenciaBase):
+    id: int
+    cliente: Optional[Cliente]
+
+    class Config:
+        from_attributes = True
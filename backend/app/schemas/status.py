@@ -10,4 +10,4 @@ class Status(StatusBase):
     id: int
 
     class Config:
-        orm_mode = True 
\ No newline at end of file
+        from_attributes = True 
\ No newline at end of file
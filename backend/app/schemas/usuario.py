@@ -23,3 +23,6 @@ class UsuarioLogin(BaseModel):
     email: EmailStr
     senha: str
 
+
+class RefreshRequest(BaseModel):
+    refresh_token: str
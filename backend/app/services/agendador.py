@@ -0,0 +1,86 @@
+"""
+Agendador em processo para as rotinas diárias.
+
+Cada worker do uvicorn roda seu próprio agendador; cada rotina só roda em um
+worker por vez, sob um advisory lock do Postgres (os demais pulam a rotina).
+Desative com AGENDADOR_ATIVO=false quando as rotinas rodarem por cron via `python -m app.cli`.
+Os lembretes de vencimento só entram nas rotinas com um transporte configurado
+(SMTP_HOST ou LEMBRETES_TRANSPORTE).
+"""
+import asyncio
+import logging
+import os
+from datetime import datetime, timedelta
+from typing import Callable, List, Optional, Tuple
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+from app.database import SessionLocal, engine
+from app.services import crud_honorarios, crud_recorrencias, lembretes
+
+logger = logging.getLogger(__name__)
+
+AGENDADOR_ATIVO = os.getenv("AGENDADOR_ATIVO", "true").lower() in ("1", "true", "sim")
+# Horário (HH:MM) em que as rotinas diárias rodam
+AGENDADOR_HORARIO = os.getenv("AGENDADOR_HORARIO", "00:05")
+
+TAREFAS_DIARIAS: List[Tuple[str, Callable[[Session], object]]] = [
+    ("honorarios-atrasados", crud_honorarios.sweep_overdue_honorarios),
+    ("honorarios-recorrentes", crud_recorrencias.gerar_honorarios_recorrentes),
+]
+if lembretes.transporte_configurado():
+    TAREFAS_DIARIAS.append(("lembretes-vencimento", lembretes.enviar_lembretes))
+
+# Primeira chave dos advisory locks das rotinas; a segunda é a posição em TAREFAS_DIARIAS
+TRAVA_AGENDADOR = 2
+
+_tarefa: Optional[asyncio.Task] = None
+
+def executar_tarefas_diarias() -> None:
+    """Executa cada rotina diária com sua própria sessão; a falha de uma não impede as demais"""
+    for posicao, (nome, tarefa) in enumerate(TAREFAS_DIARIAS):
+        # A trava é de sessão, numa conexão à parte, e vale enquanto a rotina roda
+        with engine.connect() as trava:
+            if not trava.scalar(select(func.pg_try_advisory_lock(TRAVA_AGENDADOR, posicao))):
+                logger.info("Rotina diária %s já em execução em outro processo", nome)
+                continue
+            db = SessionLocal()
+            try:
+                tarefa(db)
+            except Exception:
+                logger.exception("Falha na rotina diária %s", nome)
+            finally:
+                db.close()
+                trava.scalar(select(func.pg_advisory_unlock(TRAVA_AGENDADOR, posicao)))
+                trava.commit()
+
+def _segundos_ate_proxima_execucao(agora: datetime) -> float:
+    hora, minuto = (int(parte) for parte in AGENDADOR_HORARIO.split(':'))
+    proxima = agora.replace(hour=hora, minute=minuto, second=0, microsecond=0)
+    if proxima <= agora:
+        proxima += timedelta(days=1)
+    return (proxima - agora).total_seconds()
+
+async def _loop() -> None:
+    # Roda na subida para cobrir o período em que o processo ficou parado
+    await run_in_threadpool(executar_tarefas_diarias)
+    while True:
+        await asyncio.sleep(_segundos_ate_proxima_execucao(datetime.now()))
+        await run_in_threadpool(executar_tarefas_diarias)
+
+def iniciar() -> None:
+    global _tarefa
+    if AGENDADOR_ATIVO and _tarefa is None:
+        if not lembretes.transporte_configurado():
+            logger.warning("Lembretes de vencimento desativados: nenhum transporte configurado")
+        _tarefa = asyncio.get_running_loop().create_task(_loop())
+
+async def parar() -> None:
+    global _tarefa
+    if _tarefa is not None:
+        _tarefa.cancel()
+        try:
+            await _tarefa
+        except asyncio.CancelledError:
+            pass
+        _tarefa = None
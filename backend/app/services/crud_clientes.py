@@ -1,16 +1,22 @@
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.models.clientes import Cliente
 from app.schemas.clientes import ClienteCreate
 from app.models.honorarios import Honorario
 from app.models.pagamentos import Pagamento
 from datetime import date
-from sqlalchemy import func, and_
+from sqlalchemy import func, and_, select
+from app.services.resumo_mensal import atualizar_resumo, meses_de_datas
+from app.services.versao_dados import incrementar_versao
 from fastapi import HTTPException
 
-def get_clientes(db: Session, usuario_id: int):
-    return db.query(Cliente).filter(
-        and_(Cliente.usuario_id == usuario_id, Cliente.is_deleted == False)
-    ).all()
+async def get_clientes(db: AsyncSession, usuario_id: int):
+    clientes = await db.scalars(
+        select(Cliente).where(
+            and_(Cliente.usuario_id == usuario_id, Cliente.is_deleted == False)
+        )
+    )
+    return clientes.all()
 
 def get_cliente_by_id(db: Session, cliente_id: int, usuario_id: int):
     return db.query(Cliente).filter(
@@ -28,6 +34,8 @@ def create_cliente(db: Session, cliente: ClienteCreate, usuario_id: int):
         db_cliente = Cliente(**cliente_dict)
         db_cliente.data_criacao = date.today()
         db.add(db_cliente)
+        atualizar_resumo(db, usuario_id, meses_de_datas(db_cliente.data_criacao))
+        incrementar_versao(db, [usuario_id])
         db.commit()
         db.refresh(db_cliente)
         return db_cliente
@@ -41,6 +49,7 @@ def update_cliente(db: Session, cliente_id: int, cliente_data: ClienteCreate, us
         update_data = cliente_data.dict(exclude_unset=True)
         for key, value in update_data.items():
             setattr(db_cliente, key, value)
+        incrementar_versao(db, [usuario_id])
         db.commit()
         db.refresh(db_cliente)
     return db_cliente
@@ -48,9 +57,22 @@ def update_cliente(db: Session, cliente_id: int, cliente_data: ClienteCreate, us
 def delete_cliente(db: Session, cliente_id: int, usuario_id: int):
     db_cliente = get_cliente_by_id(db, cliente_id, usuario_id)
     if db_cliente:
+        honorarios_do_cliente = select(Honorario.id).where(Honorario.cliente_id == cliente_id)
+        meses_afetados = meses_de_datas(db_cliente.data_criacao)
+        meses_afetados += db.scalars(
+            select(Honorario.mes_referencia).where(Honorario.cliente_id == cliente_id).distinct()
+        ).all()
+        meses_afetados += meses_de_datas(*db.scalars(
+            select(Pagamento.data_pagamento).where(Pagamento.honorario_id.in_(honorarios_do_cliente)).distinct()
+        ).all())
+
         db_cliente.is_deleted = True
+        db.query(Pagamento).filter(
+            Pagamento.honorario_id.in_(honorarios_do_cliente)
+        ).update({"is_deleted": True}, synchronize_session=False)
         db.query(Honorario).filter(Honorario.cliente_id == cliente_id).update({"is_deleted": True})
-        db.query(Pagamento).filter(Pagamento.cliente_id == cliente_id).update({"is_deleted": True})
+        atualizar_resumo(db, usuario_id, meses_afetados)
+        incrementar_versao(db, [usuario_id])
         db.commit()
         return True
     return False
\ No newline at end of file
@@ -1,43 +1,133 @@
-from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import and_
-from datetime import datetime
-from typing import Optional, List
+from sqlalchemy.orm import Session, joinedload, contains_eager
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import and_, or_, tuple_, update, func, select
+from datetime import datetime, date
+from typing import Optional, List, Tuple
+import base64
+import logging
+from app import prometheus
+from app.models.clientes import Cliente
 from app.models.honorarios import Honorario
 from app.schemas.honorarios import HonorarioCreate, HonorarioUpdate
+from app.services.referencias import cache_status, preencher_relacionamento
+from app.services.resumo_mensal import atualizar_resumo
+from app.services.series_mensais import mes_da_data
+from app.services.situacao_honorarios import reconciliar_honorarios
+from app.services.versao_dados import incrementar_versao
 from fastapi import HTTPException
 
-def get_honorarios(
-    db: Session,
+logger = logging.getLogger(__name__)
+
+# Data da última varredura de atrasados feita por este processo
+ultima_varredura: date | None = None
+
+def codificar_cursor(honorario: Honorario) -> str:
+    """Gera o cursor opaco (data_vencimento, id) do último item de uma página"""
+    chave = f"{honorario.data_vencimento.isoformat()}|{honorario.id}"
+    return base64.urlsafe_b64encode(chave.encode()).decode()
+
+def decodificar_cursor(cursor: str) -> Tuple[date, int]:
+    try:
+        data_vencimento, honorario_id = base64.urlsafe_b64decode(cursor.encode()).decode().split('|')
+        return date.fromisoformat(data_vencimento), int(honorario_id)
+    except Exception:
+        raise HTTPException(status_code=400, detail="Cursor inválido")
+
+def filtrar_honorarios(
+    query,
     usuario_id: int,
     cliente_id: int | None = None,
-    status_id: int | None = None
-) -> List[Honorario]:
-    query = db.query(Honorario).join(
-        Honorario.cliente
-    ).options(
-        joinedload(Honorario.cliente),
-        joinedload(Honorario.status)
-    ).filter(
+    status_id: int | None = None,
+    vencimento_inicio: date | None = None,
+    vencimento_fim: date | None = None,
+    mes_inicio: str | None = None,
+    mes_fim: str | None = None,
+    busca: str | None = None
+):
+    """Aplica os filtros da listagem de honorários (a consulta já deve ter o join com Cliente)"""
+    query = query.filter(
         and_(
             Honorario.usuario_id == usuario_id,
             Honorario.is_deleted == False
         )
     )
-    
+
     if cliente_id:
         query = query.filter(Honorario.cliente_id == cliente_id)
     if status_id:
         query = query.filter(Honorario.status_id == status_id)
-        
-    honorarios = query.all()
-    
-    for honorario in honorarios:
-        if honorario.mes_referencia is None:
-            hoje = datetime.now()
-            honorario.mes_referencia = f"{hoje.year}-{str(hoje.month).zfill(2)}"
-            db.commit()
-    
-    return honorarios
+    if vencimento_inicio:
+        query = query.filter(Honorario.data_vencimento >= vencimento_inicio)
+    if vencimento_fim:
+        query = query.filter(Honorario.data_vencimento <= vencimento_fim)
+    if mes_inicio:
+        query = query.filter(Honorario.mes_referencia >= mes_inicio)
+    if mes_fim:
+        query = query.filter(Honorario.mes_referencia <= mes_fim)
+    if busca:
+        # % e _ digitados na busca são literais, não curingas do LIKE
+        literal = busca.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        termo = f"%{literal}%"
+        query = query.filter(
+            or_(
+                Honorario.descricao.ilike(termo, escape="\\"),
+                Cliente.nome.ilike(termo, escape="\\")
+            )
+        )
+    return query
+
+async def get_honorarios(
+    db: AsyncSession,
+    usuario_id: int,
+    cliente_id: int | None = None,
+    status_id: int | None = None,
+    vencimento_inicio: date | None = None,
+    vencimento_fim: date | None = None,
+    mes_inicio: str | None = None,
+    mes_fim: str | None = None,
+    busca: str | None = None,
+    limit: int | None = None,
+    cursor: str | None = None
+) -> Tuple[List[Honorario], Optional[str]]:
+    """
+    Lista honorários ordenados por (data_vencimento, id) com paginação por cursor.
+    Retorna a página e o cursor da próxima (None quando não há mais itens).
+    """
+    query = select(Honorario).join(
+        Honorario.cliente
+    ).options(
+        contains_eager(Honorario.cliente)
+    )
+    query = filtrar_honorarios(
+        query,
+        usuario_id,
+        cliente_id=cliente_id,
+        status_id=status_id,
+        vencimento_inicio=vencimento_inicio,
+        vencimento_fim=vencimento_fim,
+        mes_inicio=mes_inicio,
+        mes_fim=mes_fim,
+        busca=busca
+    )
+
+    if cursor:
+        query = query.filter(
+            tuple_(Honorario.data_vencimento, Honorario.id) > decodificar_cursor(cursor)
+        )
+    query = query.order_by(Honorario.data_vencimento, Honorario.id)
+
+    if limit is not None:
+        # Busca um item a mais para saber se existe próxima página
+        query = query.limit(limit + 1)
+    honorarios = (await db.scalars(query)).all()
+    # O status vem do cache da tabela de referência, sem join
+    status = cache_status.instancias(await cache_status.obter_async(db))
+    preencher_relacionamento(honorarios, "status", "status_id", status)
+
+    if limit is not None and len(honorarios) > limit:
+        honorarios = honorarios[:limit]
+        return honorarios, codificar_cursor(honorarios[-1])
+    return honorarios, None
 
 def get_honorario(db: Session, honorario_id: int, usuario_id: int) -> Honorario:
     honorario = db.query(Honorario).join(
@@ -72,7 +162,10 @@ def create_honorario(db: Session, honorario: HonorarioCreate, usuario_id: int) -
     
     try:
         db.add(db_honorario)
+        atualizar_resumo(db, usuario_id, [db_honorario.mes_referencia])
+        incrementar_versao(db, [usuario_id])
         db.commit()
+        prometheus.honorarios_criados.labels("api").inc()
         db.refresh(db_honorario)
         return db_honorario
     except Exception as e:
@@ -86,17 +179,31 @@ def update_honorario(
     usuario_id: int
 ) -> Honorario:
     db_honorario = get_honorario(db, honorario_id, usuario_id)
+    mes_anterior = db_honorario.mes_referencia
     
     update_data = honorario_update.dict(exclude_unset=True)
     
     if 'mes_referencia' in update_data and update_data['mes_referencia'] is None:
         hoje = datetime.now()
         update_data['mes_referencia'] = f"{hoje.year}-{str(hoje.month).zfill(2)}"
+
+    novo_vencimento = (
+        'data_vencimento' in update_data
+        and update_data['data_vencimento'] != db_honorario.data_vencimento
+    )
+    if novo_vencimento:
+        # Os lembretes já enviados eram do vencimento antigo
+        update_data.update(notificado=False, notificado1a=False, notificado3=False)
     
     for field, value in update_data.items():
         setattr(db_honorario, field, value)
     
     try:
+        if 'valor' in update_data:
+            # O valor pago pode ter passado a cobrir (ou não) o novo valor
+            reconciliar_honorarios(db, [honorario_id], manter_pagos_sem_pagamento=True, usuario_id=usuario_id)
+        atualizar_resumo(db, usuario_id, [mes_anterior, db_honorario.mes_referencia])
+        incrementar_versao(db, [usuario_id])
         db.commit()
         db.refresh(db_honorario)
         return db_honorario
@@ -109,6 +216,8 @@ def delete_honorario(db: Session, honorario_id: int, usuario_id: int) -> bool:
     
     try:
         db_honorario.is_deleted = True
+        atualizar_resumo(db, usuario_id, [db_honorario.mes_referencia])
+        incrementar_versao(db, [usuario_id])
         db.commit()
         return True
     except Exception as e:
@@ -130,6 +239,8 @@ def restore_honorario(db: Session, honorario_id: int, usuario_id: int) -> Honora
     
     try:
         honorario.is_deleted = False
+        atualizar_resumo(db, usuario_id, [honorario.mes_referencia])
+        incrementar_versao(db, [usuario_id])
         db.commit()
         db.refresh(honorario)
         return honorario
@@ -137,29 +248,83 @@ def restore_honorario(db: Session, honorario_id: int, usuario_id: int) -> Honora
         db.rollback()
         raise HTTPException(status_code=400, detail=str(e))
 
-def check_overdue_honorarios(db: Session, usuario_id: int) -> None:
-    """Update status of overdue honorarios to ATRASADO"""
-    from datetime import date
-    
-    hoje = date.today()
-    
-    overdue_honorarios = db.query(Honorario).filter(
-        and_(
-            Honorario.usuario_id == usuario_id,
-            Honorario.status_id == 1,
-            Honorario.data_vencimento < hoje
-        )
+def backfill_mes_referencia(db: Session) -> int:
+    """
+    Preenche em lote os honorários sem mes_referencia com o mês do vencimento
+    (bancos antigos, de antes do esquema exigir a coluna). Não faz commit.
+    """
+    preenchidos = db.execute(
+        update(Honorario).where(
+            Honorario.mes_referencia.is_(None)
+        ).values(
+            mes_referencia=mes_da_data(Honorario.data_vencimento)
+        ).returning(Honorario.usuario_id, Honorario.mes_referencia)
     ).all()
-    
-    count = 0
-    for honorario in overdue_honorarios:
-        honorario.status_id = 3
-        count += 1
-    
-    if count > 0:
+
+    meses_por_usuario = {}
+    for usuario_id, mes in preenchidos:
+        meses_por_usuario.setdefault(usuario_id, set()).add(mes)
+    for usuario_id, meses in meses_por_usuario.items():
+        atualizar_resumo(db, usuario_id, meses)
+    incrementar_versao(db, meses_por_usuario)
+
+    return len(preenchidos)
+
+def reconciliar_status(db: Session) -> int:
+    """
+    Corrige em lote valor_pago e status de todos os honorários a partir dos
+    pagamentos e recalcula o resumo dos meses afetados. Honorários marcados como
+    PAGO sem nenhum pagamento lançado são mantidos. Não faz commit.
+    """
+    alterados = reconciliar_honorarios(db, manter_pagos_sem_pagamento=True)
+
+    meses_por_usuario = {}
+    for _, usuario_id, mes in alterados:
+        meses_por_usuario.setdefault(usuario_id, set()).add(mes)
+    for usuario_id, meses in meses_por_usuario.items():
+        atualizar_resumo(db, usuario_id, meses)
+    incrementar_versao(db, meses_por_usuario)
+
+    return len(alterados)
+
+def sweep_overdue_honorarios(db: Session) -> List[Tuple[int, int]]:
+    """
+    Marca como ATRASADO, em um único UPDATE para todos os usuários, os honorários
+    pendentes já vencidos. Retorna os pares (id, usuario_id) atualizados.
+    """
+    global ultima_varredura
+
+    try:
+        atualizados = db.execute(
+            update(Honorario).where(
+                and_(
+                    Honorario.status_id == 1,
+                    Honorario.data_vencimento < func.current_date()
+                )
+            ).values(
+                status_id=3
+            ).returning(
+                Honorario.id, Honorario.usuario_id
+            ).execution_options(synchronize_session=False)
+        ).all()
+        incrementar_versao(db, (usuario_id for _, usuario_id in atualizados))
         db.commit()
-        print(f"Atualizados {count} honorários para status ATRASADO")
-    else:
-        print("Nenhum honorário atrasado encontrado")
-    
-    return count
\ No newline at end of file
+    except Exception:
+        db.rollback()
+        raise
+
+    ultima_varredura = date.today()
+    prometheus.varreduras_atrasados.inc()
+    logger.info("Atualizados %d honorários para status ATRASADO", len(atualizados))
+    return atualizados
+
+def check_overdue_honorarios(db: Session, usuario_id: int) -> int:
+    """
+    Garante que a varredura de atrasados rodou hoje e retorna quantos honorários
+    do usuário ela atualizou. Se já rodou hoje (agendador ou outra requisição), não faz nada.
+    """
+    if ultima_varredura == date.today():
+        return 0
+
+    atualizados = sweep_overdue_honorarios(db)
+    return sum(1 for _, dono in atualizados if dono == usuario_id)
@@ -1,31 +1,103 @@
 from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import and_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import and_, select
+from typing import Any, Dict, List
+from app import prometheus
+from app.models.clientes import Cliente
 from app.models.pagamentos import Pagamento
 from app.models.honorarios import Honorario
 from app.schemas.pagamentos import PagamentoCreate, PagamentoUpdate
+from app.services.referencias import cache_tipos_pagamento
+from app.services.resumo_mensal import atualizar_resumo, meses_de_datas
+from app.services.situacao_honorarios import reconciliar_honorarios
+from app.services.versao_dados import incrementar_versao
 from fastapi import HTTPException
 
-def get_pagamentos(
-    db: Session,
+def filtrar_pagamentos(query, usuario_id: int, honorario_id: int | None = None):
+    """Aplica os filtros da listagem de pagamentos"""
+    query = query.where(
+        and_(
+            Pagamento.usuario_id == usuario_id,
+            Pagamento.is_deleted == False
+        )
+    )
+    if honorario_id:
+        query = query.where(Pagamento.honorario_id == honorario_id)
+    return query
+
+async def get_pagamentos(
+    db: AsyncSession,
+    usuario_id: int,
+    honorario_id: int | None = None
+) -> List[Dict[str, Any]]:
+    """
+    Lista os pagamentos já no formato do schema Pagamento, selecionando só as
+    colunas usadas e montando os dicts direto das linhas, sem hidratar objetos do
+    ORM nem validar com o Pydantic.
+    """
+    query = select(
+        Pagamento.id,
+        Pagamento.honorario_id,
+        Pagamento.valor,
+        Pagamento.tipo_pagamento_id,
+        Pagamento.data_pagamento,
+        Pagamento.observacao,
+        Honorario.mes_referencia,
+        Cliente.id.label("cliente_id"),
+        Cliente.nome.label("cliente_nome"),
+        Cliente.email.label("cliente_email"),
+        Cliente.telefone.label("cliente_telefone"),
+        Cliente.is_deleted.label("cliente_is_deleted"),
+        Cliente.data_criacao.label("cliente_data_criacao")
+    ).join(
+        Pagamento.honorario
+    ).outerjoin(
+        Honorario.cliente
+    )
+    query = filtrar_pagamentos(query, usuario_id, honorario_id)
+
+    linhas = (await db.execute(query)).all()
+    # O tipo de pagamento vem do cache da tabela de referência, sem join
+    tipos = await cache_tipos_pagamento.obter_async(db)
+    return [
+        {
+            "honorario_id": linha.honorario_id,
+            "valor": linha.valor,
+            "tipo_pagamento_id": linha.tipo_pagamento_id,
+            "data_pagamento": linha.data_pagamento,
+            "observacao": linha.observacao,
+            "id": linha.id,
+            "honorario": {
+                "id": linha.honorario_id,
+                "cliente": None if linha.cliente_id is None else {
+                    "nome": linha.cliente_nome,
+                    "email": linha.cliente_email,
+                    "telefone": linha.cliente_telefone,
+                    "id": linha.cliente_id,
+                    "is_deleted": linha.cliente_is_deleted,
+                    "data_criacao": linha.cliente_data_criacao
+                },
+                "mes_referencia": linha.mes_referencia
+            },
+            "tipo_pagamento": tipos.get(linha.tipo_pagamento_id)
+        }
+        for linha in linhas
+    ]
+
+async def get_pagamentos_modelos(
+    db: AsyncSession,
     usuario_id: int,
     honorario_id: int | None = None
-):
-    query = db.query(Pagamento).join(
+) -> List[Pagamento]:
+    """Mesma listagem como objetos do ORM (referência para conferir get_pagamentos)"""
+    query = select(Pagamento).join(
         Pagamento.honorario
     ).options(
         joinedload(Pagamento.honorario).joinedload(Honorario.cliente),
         joinedload(Pagamento.tipo_pagamento)
-    ).filter(
-        and_(
-            Pagamento.usuario_id == usuario_id,
-            Pagamento.is_deleted == False
-        )
     )
-    
-    if honorario_id:
-        query = query.filter(Pagamento.honorario_id == honorario_id)
-        
-    return query.all()
+    query = filtrar_pagamentos(query, usuario_id, honorario_id)
+    return (await db.scalars(query)).all()
 
 def get_pagamento(db: Session, pagamento_id: int, usuario_id: int):
     pagamento = db.query(Pagamento).join(
@@ -45,13 +117,32 @@ def get_pagamento(db: Session, pagamento_id: int, usuario_id: int):
         raise HTTPException(status_code=404, detail="Pagamento não encontrado")
     return pagamento
 
+def _meses_afetados(db: Session, usuario_id: int, honorario_id: int, *datas) -> List[str]:
+    """
+    Atualiza valor_pago e status do honorário do pagamento e retorna os meses do
+    resumo a recalcular: os das datas do pagamento e o do honorário, se ele mudou.
+    """
+    alterados = reconciliar_honorarios(db, [honorario_id], usuario_id=usuario_id)
+    return meses_de_datas(*datas) + [mes for _, _, mes in alterados]
+
 def create_pagamento(db: Session, pagamento: PagamentoCreate, usuario_id: int):
+    honorario = db.query(Honorario.id).filter(
+        Honorario.id == pagamento.honorario_id,
+        Honorario.usuario_id == usuario_id,
+        Honorario.is_deleted == False
+    ).first()
+    if not honorario:
+        raise HTTPException(status_code=404, detail="Honorário não encontrado")
+
     pagamento_dict = pagamento.dict()
     pagamento_dict['usuario_id'] = usuario_id
     db_pagamento = Pagamento(**pagamento_dict, is_deleted=False)
     try:
         db.add(db_pagamento)
+        atualizar_resumo(db, usuario_id, _meses_afetados(db, usuario_id, db_pagamento.honorario_id, db_pagamento.data_pagamento))
+        incrementar_versao(db, [usuario_id])
         db.commit()
+        prometheus.pagamentos_registrados.labels("api").inc()
         db.refresh(db_pagamento)
         return db_pagamento
     except Exception as e:
@@ -60,12 +151,19 @@ def create_pagamento(db: Session, pagamento: PagamentoCreate, usuario_id: int):
 
 def update_pagamento(db: Session, pagamento_id: int, pagamento: PagamentoUpdate, usuario_id: int):
     db_pagamento = get_pagamento(db, pagamento_id, usuario_id)
+    data_anterior = db_pagamento.data_pagamento
     
     update_data = pagamento.dict(exclude_unset=True)
     for field, value in update_data.items():
         setattr(db_pagamento, field, value)
     
     try:
+        atualizar_resumo(
+            db,
+            usuario_id,
+            _meses_afetados(db, usuario_id, db_pagamento.honorario_id, data_anterior, db_pagamento.data_pagamento)
+        )
+        incrementar_versao(db, [usuario_id])
         db.commit()
         db.refresh(db_pagamento)
         return db_pagamento
@@ -77,6 +175,8 @@ def delete_pagamento(db: Session, pagamento_id: int, usuario_id: int):
     db_pagamento = get_pagamento(db, pagamento_id, usuario_id)
     try:
         db_pagamento.is_deleted = True
+        atualizar_resumo(db, usuario_id, _meses_afetados(db, usuario_id, db_pagamento.honorario_id, db_pagamento.data_pagamento))
+        incrementar_versao(db, [usuario_id])
         db.commit()
         return True
     except Exception as e:
@@ -96,6 +196,8 @@ def restore_pagamento(db: Session, pagamento_id: int, usuario_id: int):
         
     try:
         pagamento.is_deleted = False
+        atualizar_resumo(db, usuario_id, _meses_afetados(db, usuario_id, pagamento.honorario_id, pagamento.data_pagamento))
+        incrementar_versao(db, [usuario_id])
         db.commit()
         return pagamento
     except Exception as e:
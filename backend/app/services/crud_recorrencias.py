@@ -0,0 +1,173 @@
+import calendar
+import logging
+from sqlalchemy.orm import Session, joinedload
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import Integer, and_, case, cast, false, func, literal, or_, select
+from sqlalchemy.dialects.postgresql import insert
+from datetime import date
+from typing import List, Optional, Tuple
+from app import prometheus
+from app.models.clientes import Cliente
+from app.models.honorarios import Honorario
+from app.models.recorrencias import Recorrencia
+from app.schemas.recorrencias import RecorrenciaCreate, RecorrenciaUpdate
+from app.services.resumo_mensal import atualizar_resumo_usuarios
+from app.services.series_mensais import adicionar_meses, inicio_do_mes, mes_referencia
+from app.services.situacao_honorarios import ATRASADO, PENDENTE
+from app.services.versao_dados import incrementar_versao
+from fastapi import HTTPException
+
+logger = logging.getLogger(__name__)
+
+async def get_recorrencias(db: AsyncSession, usuario_id: int) -> List[Recorrencia]:
+    recorrencias = await db.scalars(
+        select(Recorrencia).options(
+            joinedload(Recorrencia.cliente)
+        ).where(
+            Recorrencia.usuario_id == usuario_id,
+            Recorrencia.is_deleted == False
+        ).order_by(Recorrencia.id)
+    )
+    return recorrencias.all()
+
+def get_recorrencia(db: Session, recorrencia_id: int, usuario_id: int) -> Recorrencia:
+    recorrencia = db.query(Recorrencia).filter(
+        Recorrencia.id == recorrencia_id,
+        Recorrencia.usuario_id == usuario_id,
+        Recorrencia.is_deleted == False
+    ).first()
+    if not recorrencia:
+        raise HTTPException(status_code=404, detail="Recorrência não encontrada")
+    return recorrencia
+
+def create_recorrencia(db: Session, recorrencia: RecorrenciaCreate, usuario_id: int) -> Recorrencia:
+    cliente = db.query(Cliente.id).filter(
+        Cliente.id == recorrencia.cliente_id,
+        Cliente.usuario_id == usuario_id,
+        Cliente.is_deleted == False
+    ).first()
+    if not cliente:
+        raise HTTPException(status_code=404, detail="Cliente não encontrado")
+
+    db_recorrencia = Recorrencia(**recorrencia.dict(), usuario_id=usuario_id, is_deleted=False)
+    try:
+        db.add(db_recorrencia)
+        db.commit()
+        db.refresh(db_recorrencia)
+        return db_recorrencia
+    except Exception as e:
+        db.rollback()
+        raise HTTPException(status_code=400, detail=f"Erro ao criar recorrência: {str(e)}")
+
+def update_recorrencia(
+    db: Session,
+    recorrencia_id: int,
+    recorrencia: RecorrenciaUpdate,
+    usuario_id: int
+) -> Recorrencia:
+    """Altera apenas os próximos honorários; os já gerados continuam como estão"""
+    db_recorrencia = get_recorrencia(db, recorrencia_id, usuario_id)
+    for campo, valor in recorrencia.dict(exclude_unset=True).items():
+        setattr(db_recorrencia, campo, valor)
+    if db_recorrencia.mes_fim is not None and db_recorrencia.mes_fim < db_recorrencia.mes_inicio:
+        db.rollback()
+        raise HTTPException(status_code=400, detail="mes_fim deve ser igual ou posterior a mes_inicio")
+    try:
+        db.commit()
+        db.refresh(db_recorrencia)
+        return db_recorrencia
+    except Exception as e:
+        db.rollback()
+        raise HTTPException(status_code=400, detail=f"Erro ao atualizar recorrência: {str(e)}")
+
+def delete_recorrencia(db: Session, recorrencia_id: int, usuario_id: int) -> bool:
+    db_recorrencia = get_recorrencia(db, recorrencia_id, usuario_id)
+    try:
+        db_recorrencia.is_deleted = True
+        db.commit()
+        return True
+    except Exception as e:
+        db.rollback()
+        raise HTTPException(status_code=400, detail=f"Erro ao excluir recorrência: {str(e)}")
+
+def _inserir_do_mes(mes: str):
+    """INSERT ... SELECT dos honorários de `mes` das recorrências vigentes nele"""
+    inicio = inicio_do_mes(mes)
+    ultimo_dia = calendar.monthrange(inicio.year, inicio.month)[1]
+    vencimento = func.make_date(inicio.year, inicio.month, func.least(Recorrencia.dia_vencimento, ultimo_dia))
+
+    # Meses desde o início da recorrência; gera quando é múltiplo da periodicidade
+    indice_inicio = (
+        cast(func.substr(Recorrencia.mes_inicio, 1, 4), Integer) * 12
+        + cast(func.substr(Recorrencia.mes_inicio, 6, 2), Integer)
+    )
+    meses_decorridos = literal(inicio.year * 12 + inicio.month) - indice_inicio
+
+    origem = select(
+        Recorrencia.usuario_id,
+        Recorrencia.cliente_id,
+        Recorrencia.valor,
+        # No mês corrente o vencimento pode já ter passado
+        case((vencimento < func.current_date(), ATRASADO), else_=PENDENTE),
+        vencimento,
+        literal(mes),
+        Recorrencia.descricao,
+        false(),
+        false(),
+        false(),
+        false(),
+        Recorrencia.id
+    ).join(
+        Cliente,
+        and_(
+            Cliente.id == Recorrencia.cliente_id,
+            Cliente.usuario_id == Recorrencia.usuario_id,
+            Cliente.is_deleted == False
+        )
+    ).where(
+        Recorrencia.is_deleted == False,
+        Recorrencia.mes_inicio <= mes,
+        or_(Recorrencia.mes_fim.is_(None), Recorrencia.mes_fim >= mes),
+        meses_decorridos % Recorrencia.periodicidade_meses == 0
+    )
+
+    return insert(Honorario).from_select(
+        [
+            "usuario_id", "cliente_id", "valor", "status_id", "data_vencimento", "mes_referencia",
+            "descricao", "notificado", "notificado1a", "notificado3", "is_deleted", "recorrencia_id"
+        ],
+        origem
+    ).on_conflict_do_nothing(
+        index_elements=[Honorario.recorrencia_id, Honorario.mes_referencia],
+        index_where=Honorario.recorrencia_id.isnot(None)
+    ).returning(Honorario.id, Honorario.usuario_id)
+
+def gerar_honorarios_recorrentes(db: Session, mes: Optional[str] = None) -> List[Tuple[int, int]]:
+    """
+    Gera os honorários das recorrências vigentes no mês informado ou, por padrão, no
+    mês atual e no próximo: uma recorrência criada com início no mês corrente ganha o
+    honorário dele na próxima execução, sem precisar de --mes. Um INSERT ... SELECT
+    por mês, para todos os usuários, na mesma transação. Idempotente: o índice único
+    de (recorrencia_id, mes_referencia) dos honorários gerados faz as linhas já
+    existentes serem ignoradas, inclusive as excluídas pelo usuário; recorrências
+    diferentes do mesmo cliente geram cada uma o seu honorário. Retorna os pares
+    (id, usuario_id) criados.
+    """
+    hoje = date.today()
+    meses = [mes] if mes else [mes_referencia(hoje), mes_referencia(adicionar_meses(hoje, 1))]
+
+    try:
+        gerados = []
+        for mes_gerado in meses:
+            gerados_no_mes = db.execute(_inserir_do_mes(mes_gerado)).all()
+            atualizar_resumo_usuarios(db, {usuario_id for _, usuario_id in gerados_no_mes}, [mes_gerado])
+            gerados += gerados_no_mes
+        incrementar_versao(db, {usuario_id for _, usuario_id in gerados})
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
+    prometheus.honorarios_criados.labels("recorrencia").inc(len(gerados))
+    logger.info("Gerados %d honorários recorrentes para %s", len(gerados), ", ".join(meses))
+    return gerados
@@ -1,25 +1,39 @@
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.models.status import Status
 from app.schemas.status import StatusCreate
+from app.services.referencias import cache_status
 from fastapi import HTTPException
 
-def get_status(db: Session, skip: int = 0, limit: int = 100):
-    return db.query(Status).offset(skip).limit(limit).all()
+async def get_status(db: AsyncSession):
+    return list((await cache_status.obter_async(db)).values())
 
-def get_status_by_id(db: Session, status_id: int):
+def get_status_by_id(db: Session, status_id: int) -> dict:
+    """Status pelo id ({"id", "nome"}), servido do cache"""
+    status = cache_status.obter(db).get(status_id)
+    if not status:
+        raise HTTPException(status_code=404, detail="Status não encontrado")
+    return dict(status)
+
+def get_status_by_nome(db: Session, nome: str) -> dict | None:
+    for status in cache_status.obter(db).values():
+        if status["nome"] == nome:
+            return dict(status)
+    return None
+
+def _carregar_status(db: Session, status_id: int) -> Status:
+    """Objeto do ORM, para as escritas (o cache só guarda cópias)"""
     status = db.query(Status).filter(Status.id == status_id).first()
     if not status:
         raise HTTPException(status_code=404, detail="Status não encontrado")
     return status
 
-def get_status_by_nome(db: Session, nome: str):
-    return db.query(Status).filter(Status.nome == nome).first()
-
 def create_status(db: Session, status: StatusCreate):
     db_status = Status(**status.dict())
     try:
         db.add(db_status)
         db.commit()
+        cache_status.invalidar()
         db.refresh(db_status)
         return db_status
     except Exception as e:
@@ -27,11 +41,12 @@ def create_status(db: Session, status: StatusCreate):
         raise HTTPException(status_code=400, detail=str(e))
 
 def update_status(db: Session, status_id: int, nome: str | None = None):
-    db_status = get_status_by_id(db, status_id)
+    db_status = _carregar_status(db, status_id)
     db_status.nome = nome
     
     try:
         db.commit()
+        cache_status.invalidar()
         db.refresh(db_status)
         return db_status
     except Exception as e:
@@ -39,10 +54,11 @@ def update_status(db: Session, status_id: int, nome: str | None = None):
         raise HTTPException(status_code=400, detail=str(e))
 
 def delete_status(db: Session, status_id: int):
-    db_status = get_status_by_id(db, status_id)
+    db_status = _carregar_status(db, status_id)
     try:
         db.delete(db_status)
         db.commit()
+        cache_status.invalidar()
         return True
     except Exception as e:
         db.rollback()
@@ -1,22 +1,26 @@
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.models.tipo_pagamento import TipoPagamento
 from app.schemas.tipo_pagamento import TipoPagamentoCreate
+from app.services.referencias import cache_tipos_pagamento
 from fastapi import HTTPException
 
-def get_tipos_pagamento(db: Session):
-    return db.query(TipoPagamento).all()
+async def get_tipos_pagamento(db: AsyncSession):
+    return list((await cache_tipos_pagamento.obter_async(db)).values())
 
-def get_tipo_pagamento_by_id(db: Session, tipo_id: int):
-    tipo = db.query(TipoPagamento).filter(TipoPagamento.id == tipo_id).first()
+def get_tipo_pagamento_by_id(db: Session, tipo_id: int) -> dict:
+    """Tipo de pagamento pelo id ({"id", "nome"}), servido do cache"""
+    tipo = cache_tipos_pagamento.obter(db).get(tipo_id)
     if not tipo:
         raise HTTPException(status_code=404, detail="Tipo de pagamento não encontrado")
-    return tipo
+    return dict(tipo)
 
 def create_tipo_pagamento(db: Session, tipo: TipoPagamentoCreate):
     db_tipo = TipoPagamento(**tipo.dict())
     try:
         db.add(db_tipo)
         db.commit()
+        cache_tipos_pagamento.invalidar()
         db.refresh(db_tipo)
         return db_tipo
     except Exception as e:
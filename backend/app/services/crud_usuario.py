@@ -1,46 +1,18 @@
 from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.models.usuario import Usuario
 from app.schemas.usuario import UsuarioCreate, UsuarioUpdate
-import bcrypt
+from app.services import senhas
 from fastapi import HTTPException
-from sqlalchemy import and_
+from sqlalchemy import and_, select
 
 def get_password_hash(password: str) -> str:
-    """Gera hash da senha usando bcrypt"""
-    # Bcrypt tem limite de 72 bytes
-    password_bytes = password.encode('utf-8')
-    
-    # Se exceder 72 bytes, trunca
-    if len(password_bytes) > 72:
-        password_bytes = password_bytes[:72]
-        # Tenta decodificar, se falhar remove os últimos bytes até funcionar
-        while True:
-            try:
-                password = password_bytes.decode('utf-8')
-                password_bytes = password.encode('utf-8')
-                break
-            except UnicodeDecodeError:
-                password_bytes = password_bytes[:-1]
-                if len(password_bytes) == 0:
-                    raise ValueError("Não foi possível processar a senha")
-    
-    # Gera salt e hash
-    salt = bcrypt.gensalt()
-    hashed = bcrypt.hashpw(password_bytes, salt)
-    return hashed.decode('utf-8')
+    """Gera hash da senha usando bcrypt (bloqueante; nas rotas use senhas.gerar_hash)"""
+    return senhas.gerar_hash_sync(password)
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
-    """Verifica se a senha está correta"""
-    try:
-        plain_bytes = plain_password.encode('utf-8')
-        # Se a senha exceder 72 bytes, trunca (mesma lógica do hash)
-        if len(plain_bytes) > 72:
-            plain_bytes = plain_bytes[:72]
-        hashed_bytes = hashed_password.encode('utf-8')
-        return bcrypt.checkpw(plain_bytes, hashed_bytes)
-    except Exception as e:
-        print(f"Erro ao verificar senha: {e}")
-        return False
+    """Verifica se a senha está correta (bloqueante; nas rotas use senhas.verificar_senha)"""
+    return senhas.verificar_senha_sync(plain_password, hashed_password)
 
 def get_usuario_by_id(db: Session, usuario_id: int):
     """Busca usuário por ID"""
@@ -50,7 +22,13 @@ def get_usuario_by_email(db: Session, email: str):
     """Busca usuário por email"""
     return db.query(Usuario).filter(Usuario.email == email).first()
 
-def create_usuario(db: Session, usuario: UsuarioCreate):
+async def _buscar_por_email(db: AsyncSession, email: str):
+    return await db.scalar(select(Usuario).where(Usuario.email == email))
+
+async def usuario_existe(db: AsyncSession, usuario_id: int) -> bool:
+    return await db.scalar(select(Usuario.id).where(Usuario.id == usuario_id)) is not None
+
+async def create_usuario(db: AsyncSession, usuario: UsuarioCreate):
     """Cria novo usuário"""
     # Valida tamanho da senha antes de processar
     senha_bytes = len(usuario.senha.encode('utf-8'))
@@ -61,13 +39,13 @@ def create_usuario(db: Session, usuario: UsuarioCreate):
         )
     
     # Verifica se já existe usuário com esse email
-    db_usuario = get_usuario_by_email(db, usuario.email)
+    db_usuario = await _buscar_por_email(db, usuario.email)
     if db_usuario:
         raise HTTPException(status_code=400, detail="Email já cadastrado")
     
     try:
-        # Cria hash da senha
-        hashed_password = get_password_hash(usuario.senha)
+        # Cria hash da senha no pool de processos
+        hashed_password = await senhas.gerar_hash(usuario.senha)
         
         # Cria novo usuário
         db_usuario = Usuario(
@@ -76,11 +54,12 @@ def create_usuario(db: Session, usuario: UsuarioCreate):
             senha=hashed_password
         )
         db.add(db_usuario)
-        db.commit()
-        db.refresh(db_usuario)
+        await db.commit()
         return db_usuario
+    except HTTPException:
+        raise
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         raise HTTPException(status_code=400, detail=str(e))
 
 def update_usuario(db: Session, usuario_id: int, usuario_data: UsuarioUpdate):
@@ -120,15 +99,23 @@ def update_usuario(db: Session, usuario_id: int, usuario_data: UsuarioUpdate):
         db.rollback()
         raise HTTPException(status_code=400, detail=str(e))
 
-def authenticate_usuario(db: Session, email: str, senha: str):
+async def authenticate_usuario(db: AsyncSession, email: str, senha: str):
     """Autentica usuário (verifica email e senha)"""
-    usuario = get_usuario_by_email(db, email)
+    usuario = await _buscar_por_email(db, email)
     if not usuario:
         return None
     
-    if not verify_password(senha, usuario.senha):
+    if not await senhas.verificar_senha(senha, usuario.senha):
         return None
     
+    # Refaz o hash quando o custo configurado mudou; falhar aqui não impede o login
+    if senhas.precisa_rehash(usuario.senha):
+        try:
+            usuario.senha = await senhas.gerar_hash(senha)
+            await db.commit()
+        except HTTPException:
+            pass
+    
     return usuario
 
 def delete_usuario(db: Session, usuario_id: int):
@@ -0,0 +1,113 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, func, and_
+from datetime import datetime, date
+from typing import Any, Dict, List
+from app.models.clientes import Cliente
+from app.models.honorarios import Honorario
+from app.models.resumo_mensal import ResumoMensal
+from app.schemas.dashboard import DashboardStats, RevenueData, ClientData
+from app.services.series_mensais import (
+    adicionar_meses,
+    janela_meses,
+    mes_referencia,
+    preencher_serie
+)
+
+def _stats_query(usuario_id: int, agora: datetime):
+    """Lê os indicadores do resumo mensal; só clientes ativos é consultado na origem"""
+    hoje = agora.date()
+    mes_atual = mes_referencia(hoje)
+    mes_anterior = mes_referencia(adicionar_meses(hoje, -1))
+
+    # Depende do instante atual (vencimentos futuros), por isso não cabe no resumo mensal
+    clientes_ativos = select(
+        func.count(func.distinct(Cliente.id))
+    ).select_from(
+        Cliente
+    ).join(
+        Honorario
+    ).where(
+        and_(
+            Cliente.usuario_id == usuario_id,
+            Honorario.usuario_id == usuario_id,
+            Cliente.is_deleted == False,
+            Honorario.is_deleted == False,
+            Honorario.data_vencimento >= agora
+        )
+    ).scalar_subquery()
+
+    return select(
+        func.coalesce(
+            func.sum(ResumoMensal.total_recebido).filter(ResumoMensal.mes == mes_atual), 0
+        ).label("recebido_atual"),
+        func.coalesce(
+            func.sum(ResumoMensal.total_recebido).filter(ResumoMensal.mes == mes_anterior), 0
+        ).label("recebido_anterior"),
+        func.coalesce(
+            func.sum(ResumoMensal.novos_clientes).filter(ResumoMensal.mes == mes_atual), 0
+        ).label("novos_clientes"),
+        func.coalesce(func.sum(ResumoMensal.total_pendente), 0).label("pendentes"),
+        func.coalesce(func.sum(ResumoMensal.qtd_pendentes), 0).label("qtd_pendentes"),
+        func.coalesce(func.sum(ResumoMensal.qtd_honorarios), 0).label("cadastrados"),
+        clientes_ativos.label("clientes_ativos")
+    ).where(
+        ResumoMensal.usuario_id == usuario_id
+    )
+
+async def _resumo_da_janela(db: AsyncSession, usuario_id: int, janela: List[date]) -> Dict[str, Dict[str, Any]]:
+    """Linhas do resumo mensal dentro da janela, indexadas pelo mês"""
+    resumos = await db.scalars(
+        select(ResumoMensal).where(
+            and_(
+                ResumoMensal.usuario_id == usuario_id,
+                ResumoMensal.mes >= mes_referencia(janela[0]),
+                ResumoMensal.mes <= mes_referencia(janela[-1])
+            )
+        )
+    )
+    return {
+        resumo.mes: {
+            "total": resumo.total_recebido,
+            "active": resumo.clientes_ativos,
+            "new": resumo.novos_clientes
+        }
+        for resumo in resumos
+    }
+
+async def get_dashboard_stats(db: AsyncSession, usuario_id: int) -> DashboardStats:
+    """Calcula os indicadores do dashboard em uma única ida ao banco"""
+    row = (await db.execute(_stats_query(usuario_id, datetime.now()))).one()
+
+    crescimento_mensal = 0
+    if row.recebido_anterior > 0:
+        crescimento_mensal = ((row.recebido_atual - row.recebido_anterior) / row.recebido_anterior) * 100
+
+    return DashboardStats(
+        totalRecebido=row.recebido_atual,
+        crescimentoMensal=round(crescimento_mensal, 2),
+        clientesAtivos=row.clientes_ativos,
+        novosClientes=row.novos_clientes,
+        honorariosPendentes=row.pendentes,
+        qtdHonorariosPendentes=row.qtd_pendentes,
+        honorariosCadastrados=row.cadastrados
+    )
+
+async def get_revenue_series(db: AsyncSession, usuario_id: int, meses: int = 6) -> List[RevenueData]:
+    """Total recebido por mês nos últimos `meses` meses, lido do resumo mensal"""
+    janela = janela_meses(meses)
+    resumo = await _resumo_da_janela(db, usuario_id, janela)
+
+    return [
+        RevenueData(month=mes.strftime("%b/%Y"), value=valores["total"])
+        for mes, valores in preencher_serie(janela, resumo, ["total"])
+    ]
+
+async def get_client_series(db: AsyncSession, usuario_id: int, meses: int = 6) -> List[ClientData]:
+    """Clientes ativos (com honorário no mês de referência) e novos por mês"""
+    janela = janela_meses(meses)
+    resumo = await _resumo_da_janela(db, usuario_id, janela)
+
+    return [
+        ClientData(month=mes.strftime("%b/%Y"), active=valores["active"], new=valores["new"])
+        for mes, valores in preencher_serie(janela, resumo, ["active", "new"])
+    ]
@@ -0,0 +1,84 @@
+"""
+Confere o orçamento de consultas SQL das rotas GET.
+
+Chama em processo (ASGI, sem servidor) cada rota GET sem parâmetros de caminho que
+declara `orcamento_consultas`, autenticada como o usuário informado, e compara a
+quantidade de comandos medida pela instrumentação com o orçamento. Um N+1 novo
+(lazy load na serialização, consulta dentro de laço) aparece aqui como excesso.
+"""
+from typing import Dict, List, Optional, Tuple
+import anyio
+from fastapi.routing import APIRoute
+from app.instrumentacao import medir_consultas
+from app.services.tokens import emitir_token
+
+def _orcamento(rota: APIRoute) -> Optional[int]:
+    for dependencia in rota.dependant.dependencies:
+        orcamento = getattr(dependencia.call, "orcamento", None)
+        if orcamento is not None:
+            return orcamento
+    return None
+
+def rotas_com_orcamento(app) -> List[Tuple[str, int]]:
+    return [
+        (rota.path, _orcamento(rota))
+        for rota in app.routes
+        if isinstance(rota, APIRoute)
+        and "GET" in rota.methods
+        and not rota.param_convertors
+        and _orcamento(rota) is not None
+    ]
+
+async def _get(app, caminho: str, token: str) -> int:
+    """GET direto na aplicação ASGI; retorna o status da resposta"""
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": caminho,
+        "raw_path": caminho.encode(),
+        "query_string": b"",
+        "root_path": "",
+        "headers": [(b"host", b"localhost"), (b"authorization", f"Bearer {token}".encode())],
+        "client": ("127.0.0.1", 0),
+        "server": ("localhost", 80),
+    }
+    status = 500
+    pedido_enviado = False
+    concluida = anyio.Event()
+
+    async def receive():
+        nonlocal pedido_enviado
+        if not pedido_enviado:
+            pedido_enviado = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        # Respostas em streaming escutam o disconnect até o fim do corpo
+        await concluida.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(mensagem):
+        nonlocal status
+        if mensagem["type"] == "http.response.start":
+            status = mensagem["status"]
+        elif mensagem["type"] == "http.response.body" and not mensagem.get("more_body", False):
+            concluida.set()
+
+    try:
+        await app(scope, receive, send)
+    except Exception:
+        # O ServerErrorMiddleware já respondeu 500 e repassa a exceção
+        pass
+    return status
+
+async def conferir_orcamentos(app, usuario_id: int) -> Dict[str, Tuple[int, int, int]]:
+    """Retorna, por rota, (status, consultas executadas, orçamento)"""
+    token = emitir_token(usuario_id)
+    resultado = {}
+    for caminho, orcamento in rotas_com_orcamento(app):
+        # A medição é aberta aqui para valer também sem o middleware (INSTRUMENTACAO_SQL=false)
+        with medir_consultas() as medicao:
+            status = await _get(app, caminho, token)
+        resultado[f"GET {caminho}"] = (status, medicao.consultas, orcamento)
+    return resultado
@@ -0,0 +1,95 @@
+"""
+Verifica via EXPLAIN se as consultas mais frequentes usam índices.
+
+As consultas são montadas com os mesmos construtores usados pelos serviços, então
+uma mudança no formato de uma consulta (ou a remoção de um índice) aparece aqui.
+"""
+import json
+from datetime import date, datetime
+from typing import Dict, List, Tuple
+from sqlalchemy import select, func, and_, text
+from sqlalchemy.orm import Session
+from app.models.clientes import Cliente
+from app.models.honorarios import Honorario
+from app.models.pagamentos import Pagamento
+from app.models.resumo_mensal import ResumoMensal
+from app.services.crud_honorarios import filtrar_honorarios
+from app.services.dashboard_stats import _stats_query
+from app.services.series_mensais import adicionar_meses, janela_meses, mes_referencia
+
+def consultas_principais(db: Session, usuario_id: int) -> Dict[str, object]:
+    hoje = date.today()
+    janela = janela_meses(6, hoje)
+    meses = [mes_referencia(mes) for mes in janela]
+    fim = adicionar_meses(hoje, 1)
+
+    return {
+        "GET /dashboard/stats": _stats_query(usuario_id, datetime.now()),
+        "GET /dashboard/revenue|clients": select(ResumoMensal).where(
+            and_(
+                ResumoMensal.usuario_id == usuario_id,
+                ResumoMensal.mes >= meses[0],
+                ResumoMensal.mes <= meses[-1]
+            )
+        ),
+        "GET /honorarios": filtrar_honorarios(
+            db.query(Honorario).join(Honorario.cliente), usuario_id
+        ).order_by(Honorario.data_vencimento, Honorario.id).limit(50).statement,
+        "GET /pagamentos": db.query(Pagamento).join(Pagamento.honorario).filter(
+            and_(Pagamento.usuario_id == usuario_id, Pagamento.is_deleted == False)
+        ).statement,
+        "GET /clientes": select(Cliente).where(
+            and_(Cliente.usuario_id == usuario_id, Cliente.is_deleted == False)
+        ),
+        "resumo: pagamentos por mês": select(func.sum(Pagamento.valor)).where(
+            and_(
+                Pagamento.usuario_id == usuario_id,
+                Pagamento.is_deleted == False,
+                Pagamento.data_pagamento >= janela[0],
+                Pagamento.data_pagamento < fim
+            )
+        ),
+        "resumo: honorários por mês": select(func.sum(Honorario.valor)).where(
+            and_(
+                Honorario.usuario_id == usuario_id,
+                Honorario.is_deleted == False,
+                Honorario.mes_referencia.in_(meses)
+            )
+        ),
+        "resumo: novos clientes": select(func.count(Cliente.id)).where(
+            and_(
+                Cliente.usuario_id == usuario_id,
+                Cliente.is_deleted == False,
+                Cliente.data_criacao >= janela[0],
+                Cliente.data_criacao < fim
+            )
+        ),
+        "varredura de atrasados": select(Honorario.id).where(
+            and_(Honorario.status_id == 1, Honorario.data_vencimento < func.current_date())
+        ),
+    }
+
+def _varreduras(plano: dict) -> List[Tuple[str, str, str]]:
+    """Lista (tipo do nó, tabela, índice) de todos os nós de leitura do plano"""
+    encontrados = []
+    if "Relation Name" in plano or "Index Name" in plano:
+        encontrados.append((plano["Node Type"], plano.get("Relation Name", ""), plano.get("Index Name", "")))
+    for filho in plano.get("Plans", []):
+        encontrados += _varreduras(filho)
+    return encontrados
+
+def verificar_indices(db: Session, usuario_id: int) -> Dict[str, List[Tuple[str, str, str]]]:
+    """
+    Executa EXPLAIN de cada consulta com seq scan desencorajado, para que o resultado
+    não dependa do tamanho das tabelas, e retorna os nós de leitura de cada plano.
+    """
+    conexao = db.connection()
+    conexao.execute(text("SET LOCAL enable_seqscan = off"))
+    planos = {}
+    for nome, consulta in consultas_principais(db, usuario_id).items():
+        compilada = consulta.compile(dialect=conexao.dialect, compile_kwargs={"render_postcompile": True})
+        resultado = conexao.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {compilada}", compilada.params).scalar()
+        plano = resultado if isinstance(resultado, list) else json.loads(resultado)
+        planos[nome] = _varreduras(plano[0]["Plan"])
+    db.rollback()
+    return planos
@@ -0,0 +1,47 @@
+"""
+Confere as listagens em projeção (dicts montados direto das linhas) contra a
+serialização pelo schema Pydantic a partir dos objetos do ORM.
+
+As projeções repetem à mão o formato dos schemas; se um campo for adicionado ao
+schema e esquecido na projeção, a divergência aparece aqui.
+"""
+import json
+from typing import Dict, List, Optional
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.pagamentos import Pagamento
+from app.respostas import dumps
+from app.schemas.pagamentos import Pagamento as PagamentoSchema
+from app.services.crud_pagamentos import get_pagamentos, get_pagamentos_modelos
+
+def _divergencias(esperado: Dict[int, dict], obtido: Dict[int, dict]) -> List[str]:
+    divergencias = []
+    for id_ in sorted(esperado.keys() | obtido.keys()):
+        if id_ not in obtido:
+            divergencias.append(f"id {id_}: ausente na projeção")
+        elif id_ not in esperado:
+            divergencias.append(f"id {id_}: só existe na projeção")
+        elif esperado[id_] != obtido[id_]:
+            divergencias.append(f"id {id_}: esperado {esperado[id_]}, obtido {obtido[id_]}")
+    return divergencias
+
+async def conferir_pagamentos(db: AsyncSession, usuario_id: Optional[int] = None) -> Dict[int, List[str]]:
+    """Divergências por usuário entre GET /pagamentos em projeção e pelo schema"""
+    if usuario_id is None:
+        usuarios = (await db.scalars(select(Pagamento.usuario_id).distinct())).all()
+    else:
+        usuarios = [usuario_id]
+
+    resultado = {}
+    for usuario in usuarios:
+        # Compara o JSON final, que é o que o cliente recebe
+        obtido = json.loads(dumps(await get_pagamentos(db, usuario)))
+        esperado = [
+            PagamentoSchema.model_validate(pagamento).model_dump(mode="json")
+            for pagamento in await get_pagamentos_modelos(db, usuario)
+        ]
+        resultado[usuario] = _divergencias(
+            {item["id"]: item for item in esperado},
+            {item["id"]: item for item in obtido}
+        )
+    return resultado
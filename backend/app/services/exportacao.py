@@ -0,0 +1,196 @@
+"""
+Exportação de honorários e pagamentos em CSV e XLSX.
+
+As linhas vêm de um cursor no servidor (yield_per) em lotes de LOTE_EXPORTACAO, e
+cada lote é escrito e descartado antes do próximo: a memória não cresce com o
+tamanho da exportação. O CSV é enviado em streaming conforme os lotes chegam; o
+XLSX precisa ser fechado antes de ir para o cliente, então é gravado em um arquivo
+temporário (openpyxl em modo write_only) e depois enviado em blocos.
+
+Cada exportação abre a própria sessão, que vive enquanto a resposta é enviada.
+"""
+import csv
+import io
+import os
+import tempfile
+from datetime import date
+from typing import AsyncIterator, Callable, Dict, Iterator, Sequence, Tuple
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
+from sqlalchemy import select
+from app.database import AsyncSessionLocal, SessionLocal
+from app.models.clientes import Cliente
+from app.models.honorarios import Honorario
+from app.models.pagamentos import Pagamento
+from app.services.crud_honorarios import filtrar_honorarios
+from app.services.crud_pagamentos import filtrar_pagamentos
+from app.services.referencias import TabelaReferenciaCache, cache_status, cache_tipos_pagamento
+
+LOTE_EXPORTACAO = 2000
+BLOCO_ARQUIVO = 64 * 1024
+
+# (título da coluna, função que monta a célula a partir da linha e da tabela de referência)
+Colunas = Sequence[Tuple[str, Callable]]
+
+COLUNAS_HONORARIOS: Colunas = [
+    ("ID", lambda linha, ref: linha.id),
+    ("Cliente", lambda linha, ref: linha.cliente_nome),
+    ("Descrição", lambda linha, ref: linha.descricao),
+    ("Mês de referência", lambda linha, ref: linha.mes_referencia),
+    ("Vencimento", lambda linha, ref: linha.data_vencimento),
+    ("Valor", lambda linha, ref: linha.valor),
+    ("Valor pago", lambda linha, ref: linha.valor_pago),
+    ("Status", lambda linha, ref: ref.get(linha.status_id, {}).get("nome")),
+]
+
+COLUNAS_PAGAMENTOS: Colunas = [
+    ("ID", lambda linha, ref: linha.id),
+    ("Data do pagamento", lambda linha, ref: linha.data_pagamento),
+    ("Valor", lambda linha, ref: linha.valor),
+    ("Tipo de pagamento", lambda linha, ref: ref.get(linha.tipo_pagamento_id, {}).get("nome")),
+    ("Honorário", lambda linha, ref: linha.honorario_id),
+    ("Mês de referência", lambda linha, ref: linha.mes_referencia),
+    ("Cliente", lambda linha, ref: linha.cliente_nome),
+    ("Observação", lambda linha, ref: linha.observacao),
+]
+
+def consulta_honorarios(usuario_id: int, **filtros):
+    query = select(
+        Honorario.id,
+        Cliente.nome.label("cliente_nome"),
+        Honorario.descricao,
+        Honorario.mes_referencia,
+        Honorario.data_vencimento,
+        Honorario.valor,
+        Honorario.valor_pago,
+        Honorario.status_id
+    ).join(
+        Honorario.cliente
+    )
+    query = filtrar_honorarios(query, usuario_id, **filtros)
+    return query.order_by(Honorario.data_vencimento, Honorario.id)
+
+def consulta_pagamentos(usuario_id: int, honorario_id: int | None = None):
+    query = select(
+        Pagamento.id,
+        Pagamento.data_pagamento,
+        Pagamento.valor,
+        Pagamento.tipo_pagamento_id,
+        Pagamento.honorario_id,
+        Honorario.mes_referencia,
+        Cliente.nome.label("cliente_nome"),
+        Pagamento.observacao
+    ).join(
+        Pagamento.honorario
+    ).outerjoin(
+        Honorario.cliente
+    )
+    query = filtrar_pagamentos(query, usuario_id, honorario_id)
+    return query.order_by(Pagamento.data_pagamento, Pagamento.id)
+
+EXPORTACOES: Dict[str, Tuple[Colunas, TabelaReferenciaCache]] = {
+    "honorarios": (COLUNAS_HONORARIOS, cache_status),
+    "pagamentos": (COLUNAS_PAGAMENTOS, cache_tipos_pagamento),
+}
+
+# Início de texto que o Excel/LibreOffice interpretam como fórmula
+INICIO_FORMULA = ("=", "+", "-", "@", "\t", "\r")
+
+def _texto_seguro(valor):
+    """
+    Neutraliza fórmulas em textos digitados pelo usuário (nome do cliente, descrição,
+    observação) com um apóstrofo na frente, para a planilha não executá-las.
+    """
+    if isinstance(valor, str) and valor.startswith(INICIO_FORMULA):
+        return "'" + valor
+    return valor
+
+def _celula_csv(valor) -> str:
+    # Formato do Excel em português: decimal com vírgula (o separador é ;)
+    if valor is None:
+        return ""
+    if isinstance(valor, float):
+        return f"{valor:.2f}".replace(".", ",")
+    if isinstance(valor, date):
+        return valor.isoformat()
+    return _texto_seguro(valor)
+
+async def gerar_csv(tipo: str, consulta) -> AsyncIterator[bytes]:
+    colunas, cache = EXPORTACOES[tipo]
+    buffer = io.StringIO()
+    escritor = csv.writer(buffer, delimiter=";")
+    # BOM para o Excel reconhecer UTF-8 (acentos)
+    buffer.write("\ufeff")
+    escritor.writerow([titulo for titulo, _ in colunas])
+
+    async with AsyncSessionLocal() as db:
+        referencia = await cache.obter_async(db)
+        resultado = await db.stream(consulta.execution_options(yield_per=LOTE_EXPORTACAO))
+        async for lote in resultado.partitions():
+            for linha in lote:
+                escritor.writerow([_celula_csv(celula(linha, referencia)) for _, celula in colunas])
+            yield buffer.getvalue().encode("utf-8")
+            buffer.seek(0)
+            buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode("utf-8")
+
+def gravar_xlsx(tipo: str, consulta) -> str:
+    """
+    Grava a planilha em um arquivo temporário e retorna o caminho (bloqueante;
+    rode em threadpool). Quem chama deve apagar o arquivo depois de enviá-lo.
+    """
+    from openpyxl import Workbook
+
+    colunas, cache = EXPORTACOES[tipo]
+    planilha = Workbook(write_only=True)
+    aba = planilha.create_sheet(tipo)
+    aba.append([titulo for titulo, _ in colunas])
+
+    db = SessionLocal()
+    try:
+        referencia = cache.obter(db)
+        for linha in db.execute(consulta.execution_options(yield_per=LOTE_EXPORTACAO)):
+            # O openpyxl grava como fórmula todo texto que começa com "="
+            aba.append([_texto_seguro(celula(linha, referencia)) for _, celula in colunas])
+    finally:
+        db.close()
+
+    descritor, caminho = tempfile.mkstemp(suffix=".xlsx")
+    os.close(descritor)
+    try:
+        planilha.save(caminho)
+    except Exception:
+        os.remove(caminho)
+        raise
+    return caminho
+
+def ler_arquivo(caminho: str) -> Iterator[bytes]:
+    with open(caminho, "rb") as arquivo:
+        while bloco := arquivo.read(BLOCO_ARQUIVO):
+            yield bloco
+
+def nome_arquivo(tipo: str, formato: str) -> str:
+    return f"{tipo}-{date.today().isoformat()}.{formato}"
+
+TIPOS_DE_CONTEUDO = {
+    "csv": "text/csv",
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+}
+
+async def resposta_exportacao(tipo: str, formato: str, consulta) -> StreamingResponse:
+    tarefa_final = None
+    if formato == "xlsx":
+        caminho = await run_in_threadpool(gravar_xlsx, tipo, consulta)
+        corpo = ler_arquivo(caminho)
+        # Roda depois do envio, mesmo se o cliente desconectar no meio
+        tarefa_final = BackgroundTask(os.remove, caminho)
+    else:
+        corpo = gerar_csv(tipo, consulta)
+    return StreamingResponse(
+        corpo,
+        media_type=TIPOS_DE_CONTEUDO[formato],
+        headers={"Content-Disposition": f'attachment; filename="{nome_arquivo(tipo, formato)}"'},
+        background=tarefa_final
+    )
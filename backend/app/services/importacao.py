@@ -0,0 +1,242 @@
+"""
+Importação em lote de clientes, honorários e pagamentos (JSON ou CSV).
+
+As linhas são validadas pelos mesmos schemas das rotas de criação, em lotes de
+LOTE_IMPORTACAO. As referências (cliente, honorário, status, tipo de pagamento) são
+conferidas com uma consulta por lote, e as linhas válidas são gravadas com um único
+INSERT de várias linhas por lote, junto com o resumo mensal e a versão dos dados,
+em uma transação por lote. Linhas inválidas não impedem a gravação das demais e
+voltam na resposta com o número da linha e os erros encontrados.
+"""
+import csv
+import io
+import json
+import os
+import re
+from datetime import date, datetime
+from typing import Callable, Dict, List, Optional, Tuple
+from fastapi import HTTPException, Request
+from pydantic import ValidationError
+from sqlalchemy import insert, select
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+from starlette.datastructures import UploadFile
+from app import prometheus
+from app.models.clientes import Cliente
+from app.models.honorarios import Honorario
+from app.models.pagamentos import Pagamento
+from app.schemas.clientes import ClienteCreate
+from app.schemas.honorarios import HonorarioCreate
+from app.schemas.pagamentos import PagamentoCreate
+from app.services.referencias import cache_status, cache_tipos_pagamento
+from app.services.resumo_mensal import atualizar_resumo, meses_de_datas
+from app.services.situacao_honorarios import reconciliar_honorarios
+from app.services.versao_dados import incrementar_versao
+
+LOTE_IMPORTACAO = 1000
+IMPORTACAO_MAX_LINHAS = int(os.getenv("IMPORTACAO_MAX_LINHAS", "50000"))
+
+CAMPOS_DECIMAIS = {"valor"}
+CAMPOS_DATA = {"data_vencimento", "data_pagamento"}
+# 1.234 ou 1.234.567: ponto seguido de exatamente três dígitos é separador de milhar
+MILHARES_SEM_DECIMAIS = re.compile(r"^-?\d{1,3}(\.\d{3})+$")
+
+# (número da linha no arquivo ou posição no array, campos da linha)
+Registro = Tuple[int, Dict]
+
+def _normalizar_csv(campos: Dict[str, str]) -> Dict[str, str]:
+    """Aceita o formato das planilhas em português: 1.234,56 e 31/12/2024"""
+    normalizados = {}
+    for campo, valor in campos.items():
+        if campo is None or valor is None:
+            continue
+        campo, valor = campo.strip(), valor.strip()
+        if not valor:
+            # Campo vazio usa o padrão do schema
+            continue
+        if campo in CAMPOS_DECIMAIS and "," in valor:
+            valor = valor.replace(".", "").replace(",", ".")
+        elif campo in CAMPOS_DECIMAIS and MILHARES_SEM_DECIMAIS.match(valor):
+            valor = valor.replace(".", "")
+        elif campo in CAMPOS_DATA and "/" in valor:
+            try:
+                valor = datetime.strptime(valor, "%d/%m/%Y").date().isoformat()
+            except ValueError:
+                pass
+        normalizados[campo] = valor
+    return normalizados
+
+def ler_csv(conteudo: bytes) -> List[Registro]:
+    try:
+        texto = conteudo.decode("utf-8-sig")
+    except UnicodeDecodeError:
+        # Planilhas salvas pelo Excel no Windows
+        texto = conteudo.decode("cp1252")
+    cabecalho = texto.split("\n", 1)[0]
+    leitor = csv.DictReader(io.StringIO(texto), delimiter=";" if ";" in cabecalho else ",")
+    return [(leitor.line_num, _normalizar_csv(campos)) for campos in leitor]
+
+def ler_json(conteudo: bytes) -> List[Registro]:
+    try:
+        dados = json.loads(conteudo)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="JSON inválido")
+    if not isinstance(dados, list):
+        raise HTTPException(status_code=400, detail="Envie um array JSON de objetos")
+    return [(posicao, item) for posicao, item in enumerate(dados, start=1)]
+
+async def ler_registros(request: Request) -> List[Registro]:
+    """
+    Lê as linhas do corpo da requisição: array JSON, CSV no corpo (text/csv) ou
+    arquivo CSV enviado como multipart no campo `arquivo`.
+    """
+    tipo_conteudo = request.headers.get("content-type", "")
+    if tipo_conteudo.startswith("multipart/form-data"):
+        formulario = await request.form()
+        arquivo = formulario.get("arquivo")
+        if not isinstance(arquivo, UploadFile):
+            raise HTTPException(status_code=400, detail="Envie o CSV no campo 'arquivo'")
+        registros = ler_csv(await arquivo.read())
+    elif tipo_conteudo.startswith(("text/csv", "text/plain")):
+        registros = ler_csv(await request.body())
+    else:
+        registros = ler_json(await request.body())
+
+    if len(registros) > IMPORTACAO_MAX_LINHAS:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Máximo de {IMPORTACAO_MAX_LINHAS} linhas por importação"
+        )
+    return registros
+
+def _mensagens(erro: ValidationError) -> List[str]:
+    return [
+        f"{'.'.join(str(parte) for parte in detalhe['loc'])}: {detalhe['msg']}" if detalhe["loc"] else detalhe["msg"]
+        for detalhe in erro.errors()
+    ]
+
+def _ids_existentes(db: Session, modelo, usuario_id: int, ids) -> set:
+    return set(db.scalars(
+        select(modelo.id).where(
+            modelo.usuario_id == usuario_id,
+            modelo.is_deleted == False,
+            modelo.id.in_(set(ids))
+        )
+    ).all())
+
+def _conferir_honorarios(db: Session, usuario_id: int, validas: List[Registro]) -> Dict[int, List[str]]:
+    clientes = _ids_existentes(db, Cliente, usuario_id, (dados["cliente_id"] for _, dados in validas))
+    status = cache_status.obter(db)
+    erros = {}
+    for numero, dados in validas:
+        if dados["status_id"] is None:
+            dados["status_id"] = 1
+        problemas = []
+        if dados["cliente_id"] not in clientes:
+            problemas.append("cliente_id: cliente não encontrado")
+        if dados["status_id"] not in status:
+            problemas.append("status_id: status não encontrado")
+        if problemas:
+            erros[numero] = problemas
+    return erros
+
+def _conferir_pagamentos(db: Session, usuario_id: int, validas: List[Registro]) -> Dict[int, List[str]]:
+    honorarios = _ids_existentes(db, Honorario, usuario_id, (dados["honorario_id"] for _, dados in validas))
+    tipos = cache_tipos_pagamento.obter(db)
+    erros = {}
+    for numero, dados in validas:
+        problemas = []
+        if dados["honorario_id"] not in honorarios:
+            problemas.append("honorario_id: honorário não encontrado")
+        if dados["tipo_pagamento_id"] not in tipos:
+            problemas.append("tipo_pagamento_id: tipo de pagamento não encontrado")
+        if problemas:
+            erros[numero] = problemas
+    return erros
+
+def _apos_gravar_pagamentos(db: Session, valores: List[Dict]) -> List[str]:
+    alterados = reconciliar_honorarios(
+        db,
+        (dados["honorario_id"] for dados in valores),
+        usuario_id=valores[0]["usuario_id"]
+    )
+    return meses_de_datas(*(dados["data_pagamento"] for dados in valores)) + [mes for _, _, mes in alterados]
+
+# Contador de negócio incrementado pelas linhas importadas de cada tipo
+CONTADORES = {
+    "honorarios": prometheus.honorarios_criados,
+    "pagamentos": prometheus.pagamentos_registrados,
+}
+
+# (schema de entrada, modelo, conferência das referências (None quando não há),
+#  valores fixos, ajustes após o INSERT que retornam os meses afetados no resumo)
+IMPORTACOES: Dict[str, Tuple[type, type, Optional[Callable], Callable, Callable]] = {
+    "clientes": (
+        ClienteCreate,
+        Cliente,
+        None,
+        lambda: {"data_criacao": date.today(), "is_deleted": False},
+        lambda db, valores: meses_de_datas(*(dados["data_criacao"] for dados in valores))
+    ),
+    "honorarios": (
+        HonorarioCreate,
+        Honorario,
+        _conferir_honorarios,
+        lambda: {"is_deleted": False},
+        lambda db, valores: [dados["mes_referencia"] for dados in valores]
+    ),
+    "pagamentos": (
+        PagamentoCreate,
+        Pagamento,
+        _conferir_pagamentos,
+        lambda: {"is_deleted": False},
+        _apos_gravar_pagamentos
+    ),
+}
+
+def importar(db: Session, tipo: str, registros: List[Registro], usuario_id: int) -> Dict:
+    """Valida e grava as linhas em lotes; bloqueante (rode em threadpool)"""
+    schema, modelo, conferir, fixos, apos_gravar = IMPORTACOES[tipo]
+    resultado = {"recebidas": len(registros), "importadas": 0, "criados": [], "erros": []}
+
+    for inicio in range(0, len(registros), LOTE_IMPORTACAO):
+        validas: List[Registro] = []
+        erros: Dict[int, List[str]] = {}
+        for numero, campos in registros[inicio:inicio + LOTE_IMPORTACAO]:
+            if not isinstance(campos, dict):
+                erros[numero] = ["a linha deve ser um objeto"]
+                continue
+            try:
+                validas.append((numero, schema.model_validate(campos).model_dump()))
+            except ValidationError as e:
+                erros[numero] = _mensagens(e)
+
+        if validas and conferir is not None:
+            erros.update(conferir(db, usuario_id, validas))
+            validas = [(numero, dados) for numero, dados in validas if numero not in erros]
+
+        if validas:
+            valores = [{**dados, **fixos(), "usuario_id": usuario_id} for _, dados in validas]
+            try:
+                ids = db.scalars(
+                    insert(modelo).returning(modelo.id, sort_by_parameter_order=True),
+                    valores
+                ).all()
+                atualizar_resumo(db, usuario_id, apos_gravar(db, valores))
+                incrementar_versao(db, [usuario_id])
+                db.commit()
+            except SQLAlchemyError as e:
+                db.rollback()
+                motivo = str(getattr(e, "orig", None) or e).splitlines()[0]
+                for numero, _ in validas:
+                    erros[numero] = [f"erro ao gravar o lote: {motivo}"]
+            else:
+                if tipo in CONTADORES:
+                    CONTADORES[tipo].labels("importacao").inc(len(ids))
+                resultado["importadas"] += len(ids)
+                resultado["criados"] += [
+                    {"linha": numero, "id": id_} for (numero, _), id_ in zip(validas, ids)
+                ]
+
+        resultado["erros"] += [{"linha": numero, "erros": erros[numero]} for numero in sorted(erros)]
+    return resultado
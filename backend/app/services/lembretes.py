@@ -0,0 +1,293 @@
+"""
+Lembretes de vencimento dos honorários, enviados por e-mail aos clientes.
+
+Três faixas, cada uma com sua flag no honorário:
+
+- 3 dias antes (notificado3): vencimento entre hoje + 2 e hoje + 3
+- 1 dia antes (notificado1a): vencimento hoje ou amanhã
+- atraso (notificado): vencido há até LEMBRETES_ATRASO_DIAS dias
+
+Cada faixa é selecionada para todos os usuários com uma consulta por lote, apoiada
+nos índices parciais das linhas ainda não avisadas. As linhas ficam travadas
+(FOR UPDATE SKIP LOCKED) até o commit do lote, então agendadores de workers
+diferentes não mandam o mesmo lembrete duas vezes. As mensagens saem por um pool
+limitado de threads, o mesmo durante toda a execução (cada thread mantém sua
+conexão SMTP), e as flags dos enviados são marcadas com um único UPDATE.
+
+O transporte é plugável: SMTP (SMTP_HOST configurado) ou arquivos .eml em
+LEMBRETES_DIRETORIO, para desenvolvimento e testes. O de arquivos precisa ser pedido
+explicitamente (LEMBRETES_TRANSPORTE=arquivo ou --transporte arquivo); sem transporte
+configurado nada é enviado, nem gravado no lugar do envio.
+"""
+import logging
+import os
+import smtplib
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import date, timedelta
+from email.message import EmailMessage
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+from sqlalchemy import Integer, and_, any_, bindparam, select, update
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.orm import Session
+from app.models.clientes import Cliente
+from app.models.honorarios import Honorario
+from app.models.usuario import Usuario
+from app.services.situacao_honorarios import STATUS_PENDENTES
+from app.services.versao_dados import incrementar_versao
+
+logger = logging.getLogger(__name__)
+
+LEMBRETES_WORKERS = int(os.getenv("LEMBRETES_WORKERS", "4"))
+LEMBRETES_LOTE = int(os.getenv("LEMBRETES_LOTE", "500"))
+# Honorários vencidos há mais tempo que isso não recebem o aviso de atraso
+LEMBRETES_ATRASO_DIAS = int(os.getenv("LEMBRETES_ATRASO_DIAS", "30"))
+LEMBRETES_REMETENTE = os.getenv("LEMBRETES_REMETENTE") or os.getenv("SMTP_USUARIO") or "nao-responda@localhost"
+
+class TransporteArquivo:
+    """Grava cada mensagem como .eml em um diretório (desenvolvimento e testes)"""
+
+    def __init__(self, diretorio: str):
+        self.diretorio = Path(diretorio)
+        self.diretorio.mkdir(parents=True, exist_ok=True)
+
+    def enviar(self, mensagem: EmailMessage) -> None:
+        (self.diretorio / f"{uuid.uuid4().hex}.eml").write_bytes(bytes(mensagem))
+
+    def fechar(self) -> None:
+        pass
+
+class TransporteSMTP:
+    """Uma conexão SMTP por thread do pool, reaberta se o servidor desconectar"""
+
+    def __init__(
+        self,
+        host: str,
+        porta: int = 587,
+        usuario: Optional[str] = None,
+        senha: Optional[str] = None,
+        starttls: bool = True,
+        timeout: float = 30
+    ):
+        self.host = host
+        self.porta = porta
+        self.usuario = usuario
+        self.senha = senha
+        self.starttls = starttls
+        self.timeout = timeout
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._conexoes: List[smtplib.SMTP] = []
+
+    def _conectar(self) -> smtplib.SMTP:
+        conexao = smtplib.SMTP(self.host, self.porta, timeout=self.timeout)
+        if self.starttls:
+            conexao.starttls()
+        if self.usuario:
+            conexao.login(self.usuario, self.senha or "")
+        with self._lock:
+            self._conexoes.append(conexao)
+        self._local.conexao = conexao
+        return conexao
+
+    def enviar(self, mensagem: EmailMessage) -> None:
+        conexao = getattr(self._local, "conexao", None) or self._conectar()
+        try:
+            conexao.send_message(mensagem)
+        except smtplib.SMTPServerDisconnected:
+            self._conectar().send_message(mensagem)
+
+    def fechar(self) -> None:
+        with self._lock:
+            conexoes, self._conexoes = self._conexoes, []
+        for conexao in conexoes:
+            try:
+                conexao.quit()
+            except smtplib.SMTPException:
+                conexao.close()
+
+def _tipo_configurado() -> Optional[str]:
+    return os.getenv("LEMBRETES_TRANSPORTE") or ("smtp" if os.getenv("SMTP_HOST") else None)
+
+def transporte_configurado() -> bool:
+    return _tipo_configurado() is not None
+
+def criar_transporte(tipo: Optional[str] = None, diretorio: Optional[str] = None):
+    tipo = tipo or _tipo_configurado()
+    if tipo is None:
+        raise RuntimeError(
+            "Nenhum transporte de lembretes configurado; defina SMTP_HOST ou LEMBRETES_TRANSPORTE"
+        )
+    if tipo == "smtp":
+        return TransporteSMTP(
+            os.environ["SMTP_HOST"],
+            int(os.getenv("SMTP_PORTA", "587")),
+            os.getenv("SMTP_USUARIO"),
+            os.getenv("SMTP_SENHA"),
+            os.getenv("SMTP_TLS", "true").lower() in ("1", "true", "sim")
+        )
+    if tipo == "arquivo":
+        return TransporteArquivo(diretorio or os.getenv("LEMBRETES_DIRETORIO", "lembretes"))
+    raise ValueError(f"Transporte de lembretes desconhecido: {tipo}")
+
+# (nome, flag, intervalo de vencimento a partir de hoje, assunto, abertura do texto)
+Faixa = Tuple[str, str, Callable[[date], Tuple[date, date]], str, str]
+
+FAIXAS: Sequence[Faixa] = [
+    (
+        "3-dias",
+        "notificado3",
+        lambda hoje: (hoje + timedelta(days=2), hoje + timedelta(days=3)),
+        "Lembrete: honorário vence em {vencimento}",
+        "Este é um lembrete de que o honorário abaixo vence em {vencimento}."
+    ),
+    (
+        "1-dia",
+        "notificado1a",
+        lambda hoje: (hoje, hoje + timedelta(days=1)),
+        "Honorário vence em {vencimento}",
+        "O honorário abaixo vence em {vencimento}. Se o pagamento já foi feito, desconsidere esta mensagem."
+    ),
+    (
+        "atraso",
+        "notificado",
+        lambda hoje: (hoje - timedelta(days=LEMBRETES_ATRASO_DIAS), hoje - timedelta(days=1)),
+        "Honorário em atraso desde {vencimento}",
+        "Não identificamos o pagamento do honorário abaixo, vencido em {vencimento}."
+    ),
+]
+
+def _moeda(valor: float) -> str:
+    return "R$ " + f"{valor:,.2f}".replace(",", "_").replace(".", ",").replace("_", ".")
+
+def montar_mensagem(faixa: Faixa, linha) -> EmailMessage:
+    _, _, _, assunto, abertura = faixa
+    vencimento = linha.data_vencimento.strftime("%d/%m/%Y")
+    descricao = f"{linha.descricao} " if linha.descricao else ""
+
+    mensagem = EmailMessage()
+    mensagem["From"] = LEMBRETES_REMETENTE
+    mensagem["To"] = linha.cliente_email
+    if linha.usuario_email:
+        mensagem["Reply-To"] = linha.usuario_email
+    mensagem["Subject"] = assunto.format(vencimento=vencimento)
+    mensagem.set_content(
+        f"Olá, {linha.cliente_nome}.\n\n"
+        f"{abertura.format(vencimento=vencimento)}\n\n"
+        f"Honorário: {descricao}(referência {linha.mes_referencia})\n"
+        f"Valor em aberto: {_moeda(linha.valor - (linha.valor_pago or 0))}\n"
+        f"Vencimento: {vencimento}\n\n"
+        f"{linha.usuario_nome}\n"
+    )
+    return mensagem
+
+def _consulta(faixa: Faixa, hoje: date, excluir: Sequence[int]):
+    _, flag, intervalo, _, _ = faixa
+    inicio, fim = intervalo(hoje)
+    filtros = [
+        # Mesmas condições dos índices parciais ix_honorarios_lembrete_*
+        getattr(Honorario, flag) == False,
+        Honorario.is_deleted == False,
+        Honorario.status_id.in_(STATUS_PENDENTES),
+        Honorario.data_vencimento.between(inicio, fim),
+        Cliente.is_deleted == False,
+        Cliente.email.isnot(None),
+        Cliente.email != ""
+    ]
+    if excluir:
+        filtros.append(Honorario.id.notin_(excluir))
+    return select(
+        Honorario.id,
+        Honorario.usuario_id,
+        Honorario.valor,
+        Honorario.valor_pago,
+        Honorario.data_vencimento,
+        Honorario.mes_referencia,
+        Honorario.descricao,
+        Cliente.nome.label("cliente_nome"),
+        Cliente.email.label("cliente_email"),
+        Usuario.nome.label("usuario_nome"),
+        Usuario.email.label("usuario_email")
+    ).join(
+        Cliente, Cliente.id == Honorario.cliente_id
+    ).join(
+        Usuario, Usuario.id == Honorario.usuario_id
+    ).where(
+        and_(*filtros)
+    ).order_by(
+        Honorario.id
+    ).limit(
+        LEMBRETES_LOTE
+    ).with_for_update(of=Honorario, skip_locked=True)
+
+def _enviar(
+    executor: ThreadPoolExecutor,
+    transporte,
+    mensagens: List[Tuple[int, EmailMessage]]
+) -> Tuple[List[int], List[int]]:
+    enviados, falhas = [], []
+    futuros = {executor.submit(transporte.enviar, mensagem): id_ for id_, mensagem in mensagens}
+    for futuro in as_completed(futuros):
+        if futuro.exception() is None:
+            enviados.append(futuros[futuro])
+        else:
+            logger.warning("Falha ao enviar lembrete do honorário %s: %s", futuros[futuro], futuro.exception())
+            falhas.append(futuros[futuro])
+    return enviados, falhas
+
+def _marcar(db: Session, flag: str, ids: List[int]) -> None:
+    db.execute(
+        update(Honorario).where(
+            Honorario.id == any_(bindparam("ids", ids, type_=ARRAY(Integer)))
+        ).values(
+            {flag: True}
+        ).execution_options(synchronize_session=False)
+    )
+
+def enviar_lembretes(db: Session, transporte=None, hoje: Optional[date] = None) -> Dict[str, int]:
+    """
+    Envia os lembretes de todas as faixas e retorna quantos saíram por faixa.
+    Os que falharem continuam sem flag e são tentados de novo na próxima execução.
+    """
+    hoje = hoje or date.today()
+    proprio = transporte is None
+    transporte = transporte or criar_transporte()
+    enviados_por_faixa = {}
+    # Um só pool na execução: as conexões SMTP ficam presas às threads (threading.local)
+    executor = ThreadPoolExecutor(max_workers=LEMBRETES_WORKERS, thread_name_prefix="lembretes")
+    try:
+        for faixa in FAIXAS:
+            nome, flag = faixa[0], faixa[1]
+            enviados_por_faixa[nome] = 0
+            falhas: List[int] = []
+            while True:
+                linhas = db.execute(_consulta(faixa, hoje, falhas)).all()
+                if not linhas:
+                    db.rollback()
+                    break
+                enviados, falhas_do_lote = _enviar(
+                    executor,
+                    transporte,
+                    [(linha.id, montar_mensagem(faixa, linha)) for linha in linhas]
+                )
+                falhas += falhas_do_lote
+                if enviados:
+                    _marcar(db, flag, enviados)
+                    marcados = set(enviados)
+                    incrementar_versao(db, (linha.usuario_id for linha in linhas if linha.id in marcados))
+                db.commit()
+                enviados_por_faixa[nome] += len(enviados)
+                if len(linhas) < LEMBRETES_LOTE:
+                    break
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        executor.shutdown()
+        if proprio:
+            transporte.fechar()
+
+    logger.info("Lembretes enviados: %s", enviados_por_faixa)
+    return enviados_por_faixa
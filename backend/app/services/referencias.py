@@ -0,0 +1,91 @@
+"""
+Cache em memória das tabelas de referência (status e tipos de pagamento).
+
+São tabelas de poucas linhas que quase nunca mudam, mas eram lidas (ou juntadas) em
+toda listagem. Cada processo guarda uma cópia por até REFERENCIAS_CACHE_TTL segundos
+(padrão 300). As funções de escrita do próprio processo invalidam o cache na hora;
+nos demais workers a mudança aparece quando o TTL expira.
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Dict, Iterable, Optional
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, make_transient_to_detached
+from sqlalchemy.orm.attributes import set_committed_value
+from app.models.status import Status
+from app.models.tipo_pagamento import TipoPagamento
+
+REFERENCIAS_CACHE_TTL = float(os.getenv("REFERENCIAS_CACHE_TTL", "300"))
+# Por quanto tempo o navegador pode reutilizar a resposta sem revalidar pelo ETag
+REFERENCIAS_MAX_AGE = 60
+
+class TabelaReferenciaCache:
+    def __init__(self, modelo, ttl: float = REFERENCIAS_CACHE_TTL):
+        self.modelo = modelo
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._linhas: Optional[Dict[int, Dict]] = None
+        self._expira_em = 0.0
+        self.etag = ""
+
+    def _em_cache(self) -> Optional[Dict[int, Dict]]:
+        """Linhas ainda válidas, ou None; lidas uma só vez, porque invalidar() pode rodar em paralelo"""
+        linhas = self._linhas
+        if linhas is not None and time.monotonic() < self._expira_em:
+            return linhas
+        return None
+
+    def _consulta(self):
+        return select(self.modelo.id, self.modelo.nome).order_by(self.modelo.id)
+
+    def _guardar(self, linhas: Iterable) -> Dict[int, Dict]:
+        dados = {linha.id: {"id": linha.id, "nome": linha.nome} for linha in linhas}
+        conteudo = json.dumps(list(dados.values()), sort_keys=True).encode()
+        with self._lock:
+            self._linhas = dados
+            self._expira_em = time.monotonic() + self.ttl
+            self.etag = f'"{hashlib.sha1(conteudo).hexdigest()}"'
+        return dados
+
+    def obter(self, db: Session) -> Dict[int, Dict]:
+        """Linhas da tabela indexadas pelo id ({id: {"id", "nome"}})"""
+        linhas = self._em_cache()
+        if linhas is not None:
+            return linhas
+        return self._guardar(db.execute(self._consulta()))
+
+    async def obter_async(self, db: AsyncSession) -> Dict[int, Dict]:
+        linhas = self._em_cache()
+        if linhas is not None:
+            return linhas
+        return self._guardar(await db.execute(self._consulta()))
+
+    def instancias(self, linhas: Dict[int, Dict]) -> Dict:
+        """
+        Objetos do modelo montados a partir do cache, já no estado detached, para
+        preencher relacionamentos sem consultar o banco. Crie novos a cada
+        requisição: instâncias do ORM não devem ser compartilhadas entre sessões.
+        """
+        instancias = {}
+        for id_, dados in linhas.items():
+            instancia = self.modelo(**dados)
+            make_transient_to_detached(instancia)
+            instancias[id_] = instancia
+        return instancias
+
+    def invalidar(self) -> None:
+        with self._lock:
+            self._linhas = None
+            self._expira_em = 0.0
+
+cache_status = TabelaReferenciaCache(Status)
+cache_tipos_pagamento = TabelaReferenciaCache(TipoPagamento)
+
+def preencher_relacionamento(objetos: Iterable, atributo: str, chave: str, instancias: Dict) -> None:
+    """Preenche `atributo` de cada objeto com a instância do cache indicada por `chave`"""
+    for objeto in objetos:
+        set_committed_value(objeto, atributo, instancias.get(getattr(objeto, chave)))
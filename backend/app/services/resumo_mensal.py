@@ -0,0 +1,177 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import delete, func, and_, select
+from sqlalchemy.dialects.postgresql import insert
+from datetime import date
+from typing import Dict, Iterable, List, Optional, Tuple
+from app.models.clientes import Cliente
+from app.models.honorarios import Honorario
+from app.models.pagamentos import Pagamento
+from app.models.resumo_mensal import ResumoMensal
+from app.services.situacao_honorarios import STATUS_PENDENTES
+from app.services.series_mensais import (
+    adicionar_meses,
+    inicio_do_mes,
+    mes_da_data,
+    mes_referencia,
+    agregar_por_mes
+)
+
+
+CAMPOS = (
+    "total_recebido",
+    "total_faturado",
+    "total_pendente",
+    "qtd_pendentes",
+    "qtd_honorarios",
+    "clientes_ativos",
+    "novos_clientes"
+)
+
+# Primeira chave dos advisory locks do resumo; a segunda é o usuario_id
+TRAVA_RESUMO = 1
+
+def _travar(db: Session, usuario_ids: Iterable[int]) -> None:
+    """
+    Serializa, por usuário, o recálculo e a gravação do resumo até o fim da transação.
+    Sem isso, duas escritas concorrentes do mesmo usuário podem calcular cada uma sem
+    ver a outra (ainda não commitada) e a última gravação apaga a contribuição da
+    primeira. A ordem crescente evita deadlock entre rotinas em lote.
+    """
+    for usuario_id in sorted(set(usuario_ids)):
+        db.execute(select(func.pg_advisory_xact_lock(TRAVA_RESUMO, usuario_id)))
+
+def _calcular(
+    db: Session,
+    usuario_id: Optional[int] = None,
+    meses: Optional[List[str]] = None,
+    usuario_ids: Optional[List[int]] = None
+) -> Dict[Tuple[int, str], Dict[str, float]]:
+    """Recalcula os totais a partir das tabelas de origem, agrupados por (usuario_id, mês)"""
+    filtros_pagamentos = [Pagamento.is_deleted == False]
+    filtros_honorarios = [Honorario.is_deleted == False, Honorario.mes_referencia.isnot(None)]
+    filtros_clientes = [Cliente.is_deleted == False]
+
+    if usuario_id is not None:
+        filtros_pagamentos.append(Pagamento.usuario_id == usuario_id)
+        filtros_honorarios.append(Honorario.usuario_id == usuario_id)
+        filtros_clientes.append(Cliente.usuario_id == usuario_id)
+
+    if usuario_ids is not None:
+        filtros_pagamentos.append(Pagamento.usuario_id.in_(usuario_ids))
+        filtros_honorarios.append(Honorario.usuario_id.in_(usuario_ids))
+        filtros_clientes.append(Cliente.usuario_id.in_(usuario_ids))
+
+    if meses is not None:
+        # Intervalo de datas cobrindo os meses pedidos; os meses fora da lista são descartados abaixo
+        inicio = inicio_do_mes(min(meses))
+        fim = adicionar_meses(inicio_do_mes(max(meses)), 1)
+        filtros_pagamentos += [Pagamento.data_pagamento >= inicio, Pagamento.data_pagamento < fim]
+        filtros_honorarios.append(Honorario.mes_referencia.in_(meses))
+        filtros_clientes += [Cliente.data_criacao >= inicio, Cliente.data_criacao < fim]
+
+    pendente = Honorario.status_id.in_(STATUS_PENDENTES)
+    consultas = [
+        agregar_por_mes(
+            db,
+            mes_da_data(Pagamento.data_pagamento),
+            {"total_recebido": func.sum(Pagamento.valor)},
+            filtros_pagamentos,
+            agrupar_por=(Pagamento.usuario_id,)
+        ),
+        agregar_por_mes(
+            db,
+            Honorario.mes_referencia,
+            {
+                "total_faturado": func.sum(Honorario.valor),
+                "total_pendente": func.sum(Honorario.valor - Honorario.valor_pago).filter(pendente),
+                "qtd_pendentes": func.count(Honorario.id).filter(pendente),
+                "qtd_honorarios": func.count(Honorario.id),
+                "clientes_ativos": func.count(func.distinct(Cliente.id)).filter(
+                    and_(
+                        Cliente.usuario_id == Honorario.usuario_id,
+                        Cliente.is_deleted == False
+                    )
+                )
+            },
+            filtros_honorarios,
+            agrupar_por=(Honorario.usuario_id,),
+            select_from=Honorario.__table__.outerjoin(
+                Cliente.__table__, Cliente.id == Honorario.cliente_id
+            )
+        ),
+        agregar_por_mes(
+            db,
+            mes_da_data(Cliente.data_criacao),
+            {"novos_clientes": func.count(Cliente.id)},
+            filtros_clientes,
+            agrupar_por=(Cliente.usuario_id,)
+        )
+    ]
+
+    totais = {}
+    for resultado in consultas:
+        for chave, valores in resultado.items():
+            if meses is not None and chave[1] not in meses:
+                continue
+            linha = totais.setdefault(chave, dict.fromkeys(CAMPOS, 0))
+            linha.update({campo: valor or 0 for campo, valor in valores.items()})
+    return totais
+
+def _gravar(db: Session, totais: Dict[Tuple[int, str], Dict[str, float]]) -> None:
+    linhas = [
+        {"usuario_id": usuario_id, "mes": mes, **valores}
+        for (usuario_id, mes), valores in totais.items()
+    ]
+    for i in range(0, len(linhas), 1000):
+        stmt = insert(ResumoMensal).values(linhas[i:i + 1000])
+        db.execute(stmt.on_conflict_do_update(
+            index_elements=[ResumoMensal.usuario_id, ResumoMensal.mes],
+            set_={campo: stmt.excluded[campo] for campo in CAMPOS}
+        ))
+
+def atualizar_resumo(db: Session, usuario_id: int, meses: Iterable[Optional[str]]) -> None:
+    """
+    Recalcula os meses afetados por uma escrita, na mesma transação.
+    Deve ser chamado antes do commit da operação que alterou os dados.
+    """
+    meses = sorted({mes for mes in meses if mes})
+    if not meses:
+        return
+
+    db.flush()
+    _travar(db, [usuario_id])
+    totais = _calcular(db, usuario_id, meses)
+    for mes in meses:
+        totais.setdefault((usuario_id, mes), dict.fromkeys(CAMPOS, 0))
+    _gravar(db, totais)
+
+def atualizar_resumo_usuarios(db: Session, usuario_ids: Iterable[int], meses: Iterable[Optional[str]]) -> None:
+    """Como atualizar_resumo, para vários usuários de uma vez (rotinas em lote)"""
+    usuario_ids = sorted(set(usuario_ids))
+    meses = sorted({mes for mes in meses if mes})
+    if not usuario_ids or not meses:
+        return
+
+    db.flush()
+    _travar(db, usuario_ids)
+    totais = _calcular(db, meses=meses, usuario_ids=usuario_ids)
+    for usuario_id in usuario_ids:
+        for mes in meses:
+            totais.setdefault((usuario_id, mes), dict.fromkeys(CAMPOS, 0))
+    _gravar(db, totais)
+
+def reconstruir_resumo(db: Session, usuario_id: Optional[int] = None) -> int:
+    """Apaga e recalcula o resumo do zero (de um usuário ou de todos)"""
+    stmt = delete(ResumoMensal)
+    if usuario_id is not None:
+        _travar(db, [usuario_id])
+        stmt = stmt.where(ResumoMensal.usuario_id == usuario_id)
+    db.execute(stmt)
+
+    totais = _calcular(db, usuario_id)
+    _gravar(db, totais)
+    return len(totais)
+
+def meses_de_datas(*datas: Optional[date]) -> List[str]:
+    """Meses (YYYY-MM) das datas informadas, ignorando valores nulos"""
+    return [mes_referencia(data) for data in datas if data]
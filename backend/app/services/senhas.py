@@ -0,0 +1,138 @@
+"""
+Hash e verificação de senhas com bcrypt fora do threadpool das requisições.
+
+Cada hash custa centenas de milissegundos de CPU. Rodando no threadpool, um pico de
+logins ocupava as threads que também atendem o dashboard; aqui o trabalho vai para um
+pool de processos dedicado e limitado. Variáveis de ambiente:
+
+- BCRYPT_ROUNDS: fator de custo dos novos hashes (padrão 12). Senhas com custo
+  diferente são refeitas no próximo login bem-sucedido.
+- SENHAS_WORKERS: processos do pool (padrão: metade dos núcleos, mínimo 1)
+- SENHAS_FILA_MAXIMA: operações aguardando um processo livre; acima disso a
+  requisição recebe 503 em vez de enfileirar indefinidamente (padrão 16 por worker)
+"""
+import asyncio
+import logging
+import multiprocessing
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Optional
+import bcrypt
+from fastapi import HTTPException
+
+logger = logging.getLogger(__name__)
+
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+SENHAS_WORKERS = max(1, int(os.getenv("SENHAS_WORKERS", (os.cpu_count() or 2) // 2)))
+SENHAS_FILA_MAXIMA = int(os.getenv("SENHAS_FILA_MAXIMA", SENHAS_WORKERS * 16))
+
+# Bcrypt tem limite de 72 bytes
+LIMITE_BYTES = 72
+
+_CUSTO_HASH = re.compile(r"^\$2[abxy]?\$(\d{2})\$")
+
+_executor: Optional[ProcessPoolExecutor] = None
+_em_andamento = 0
+_rejeitadas = 0
+
+def _bytes_da_senha(password: str) -> bytes:
+    password_bytes = password.encode('utf-8')
+
+    # Se exceder 72 bytes, trunca
+    if len(password_bytes) > LIMITE_BYTES:
+        password_bytes = password_bytes[:LIMITE_BYTES]
+        # Tenta decodificar, se falhar remove os últimos bytes até funcionar
+        while True:
+            try:
+                password = password_bytes.decode('utf-8')
+                password_bytes = password.encode('utf-8')
+                break
+            except UnicodeDecodeError:
+                password_bytes = password_bytes[:-1]
+                if len(password_bytes) == 0:
+                    raise ValueError("Não foi possível processar a senha")
+    return password_bytes
+
+def gerar_hash_sync(password: str, rounds: int = BCRYPT_ROUNDS) -> str:
+    """Gera hash da senha usando bcrypt (bloqueante; roda nos processos do pool)"""
+    hashed = bcrypt.hashpw(_bytes_da_senha(password), bcrypt.gensalt(rounds))
+    return hashed.decode('utf-8')
+
+def verificar_senha_sync(plain_password: str, hashed_password: str) -> bool:
+    """Verifica se a senha está correta (bloqueante; roda nos processos do pool)"""
+    try:
+        plain_bytes = plain_password.encode('utf-8')
+        # Se a senha exceder 72 bytes, trunca (mesma lógica do hash)
+        if len(plain_bytes) > LIMITE_BYTES:
+            plain_bytes = plain_bytes[:LIMITE_BYTES]
+        return bcrypt.checkpw(plain_bytes, hashed_password.encode('utf-8'))
+    except Exception as e:
+        # Hash malformado no banco: a senha não confere (sem registrar a senha)
+        logger.warning("Erro ao verificar senha: %s", e)
+        return False
+
+def custo_do_hash(hashed_password: str) -> Optional[int]:
+    """Fator de custo gravado no hash ($2b$12$... -> 12)"""
+    encontrado = _CUSTO_HASH.match(hashed_password or "")
+    return int(encontrado.group(1)) if encontrado else None
+
+def precisa_rehash(hashed_password: str) -> bool:
+    return custo_do_hash(hashed_password) != BCRYPT_ROUNDS
+
+def _aquecer() -> int:
+    return os.getpid()
+
+def _obter_executor() -> ProcessPoolExecutor:
+    global _executor
+    if _executor is None:
+        # spawn: não herda threads nem o event loop do worker do uvicorn
+        _executor = ProcessPoolExecutor(
+            max_workers=SENHAS_WORKERS,
+            mp_context=multiprocessing.get_context("spawn")
+        )
+    return _executor
+
+async def iniciar() -> None:
+    """Sobe os processos do pool antes do primeiro login"""
+    loop = asyncio.get_running_loop()
+    executor = _obter_executor()
+    await asyncio.gather(*(loop.run_in_executor(executor, _aquecer) for _ in range(SENHAS_WORKERS)))
+
+def parar() -> None:
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+
+async def _executar(funcao, *args):
+    global _em_andamento, _rejeitadas
+    # Todas as chamadas vêm do event loop do worker, então o contador não precisa de lock
+    if _em_andamento >= SENHAS_WORKERS + SENHAS_FILA_MAXIMA:
+        _rejeitadas += 1
+        raise HTTPException(
+            status_code=503,
+            detail="Servidor ocupado, tente novamente em instantes",
+            headers={"Retry-After": "1"}
+        )
+    _em_andamento += 1
+    try:
+        return await asyncio.get_running_loop().run_in_executor(_obter_executor(), funcao, *args)
+    finally:
+        _em_andamento -= 1
+
+async def gerar_hash(password: str) -> str:
+    return await _executar(gerar_hash_sync, password, BCRYPT_ROUNDS)
+
+async def verificar_senha(plain_password: str, hashed_password: str) -> bool:
+    return await _executar(verificar_senha_sync, plain_password, hashed_password)
+
+def estado() -> Dict:
+    return {
+        "workers": SENHAS_WORKERS,
+        "fila_maxima": SENHAS_FILA_MAXIMA,
+        "custo": BCRYPT_ROUNDS,
+        "em_andamento": _em_andamento,
+        "aguardando": max(0, _em_andamento - SENHAS_WORKERS),
+        "rejeitadas": _rejeitadas
+    }
@@ -0,0 +1,69 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import select, func, and_
+from datetime import date
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+def mes_referencia(dia: date) -> str:
+    """Formata a data no padrão YYYY-MM usado em mes_referencia"""
+    return f"{dia.year}-{str(dia.month).zfill(2)}"
+
+def inicio_do_mes(mes: str) -> date:
+    """Converte um mês YYYY-MM no seu primeiro dia"""
+    ano, numero = mes.split('-')
+    return date(int(ano), int(numero), 1)
+
+def adicionar_meses(dia: date, meses: int) -> date:
+    """Retorna o primeiro dia do mês deslocado em `meses` (pode ser negativo)"""
+    total = dia.year * 12 + (dia.month - 1) + meses
+    return date(total // 12, total % 12 + 1, 1)
+
+def janela_meses(meses: int, hoje: Optional[date] = None) -> List[date]:
+    """Primeiros dias dos últimos `meses` meses, do mais antigo ao atual"""
+    hoje = hoje or date.today()
+    return [adicionar_meses(hoje, -i) for i in range(meses - 1, -1, -1)]
+
+def mes_da_data(coluna):
+    """Expressão SQL que agrupa uma coluna de data pelo mês (YYYY-MM)"""
+    return func.to_char(func.date_trunc('month', coluna), 'YYYY-MM')
+
+def agregar_por_mes(
+    db: Session,
+    mes,
+    agregados: Dict[str, Any],
+    filtros: Sequence[Any],
+    agrupar_por: Sequence[Any] = (),
+    select_from=None
+) -> Dict[Any, Dict[str, Any]]:
+    """
+    Executa um único GROUP BY por mês e devolve os agregados indexados pelo mês (YYYY-MM).
+
+    `mes` é uma expressão YYYY-MM (ex.: mes_da_data(coluna) ou Honorario.mes_referencia).
+    Com `agrupar_por`, a chave passa a ser a tupla (*agrupar_por, mes).
+    """
+    colunas = [*agrupar_por, mes.label("mes")]
+    query = select(
+        *colunas,
+        *[expressao.label(nome) for nome, expressao in agregados.items()]
+    )
+    if select_from is not None:
+        query = query.select_from(select_from)
+    query = query.where(and_(*filtros)).group_by(*agrupar_por, mes)
+
+    resultado = {}
+    for row in db.execute(query):
+        valores = row._mapping
+        chave = tuple(row[:len(colunas)]) if agrupar_por else valores["mes"]
+        resultado[chave] = {nome: valores[nome] for nome in agregados}
+    return resultado
+
+def preencher_serie(
+    janela: List[date],
+    valores: Dict[str, Dict[str, Any]],
+    campos: Sequence[str]
+) -> List[Tuple[date, Dict[str, Any]]]:
+    """Alinha os valores agregados à janela, preenchendo meses vazios com zero"""
+    serie = []
+    for mes in janela:
+        encontrados = valores.get(mes_referencia(mes), {})
+        serie.append((mes, {campo: encontrados.get(campo) or 0 for campo in campos}))
+    return serie
@@ -0,0 +1,90 @@
+"""
+Situação dos honorários derivada dos pagamentos.
+
+honorarios.valor_pago guarda a soma dos pagamentos ativos, e o status é movido para
+PAGO, PARCIAL ou pendente (PENDENTE/ATRASADO conforme o vencimento) na mesma
+transação em que um pagamento é gravado. Status criados pelo usuário fora dos
+quatro padrão não são alterados, mas o valor_pago desses honorários é mantido como
+o de qualquer outro.
+"""
+from typing import Iterable, List, Optional, Tuple
+from sqlalchemy import and_, case, func, literal, or_, select, update
+from sqlalchemy.orm import Session
+from app.models.honorarios import Honorario
+from app.models.pagamentos import Pagamento
+
+PENDENTE = 1
+PAGO = 2
+ATRASADO = 3
+PARCIAL = 4
+
+# Status que contam como valor a receber
+STATUS_PENDENTES = (PENDENTE, ATRASADO, PARCIAL)
+STATUS_DERIVADOS = (PENDENTE, PAGO, ATRASADO, PARCIAL)
+
+# Diferença de centavos por arredondamento (valores são float)
+TOLERANCIA = 0.005
+
+def reconciliar_honorarios(
+    db: Session,
+    honorario_ids: Optional[Iterable[int]] = None,
+    manter_pagos_sem_pagamento: bool = False,
+    usuario_id: Optional[int] = None
+) -> List[Tuple[int, int, str]]:
+    """
+    Recalcula valor_pago e status em um único UPDATE ... FROM (dos honorários
+    informados ou de todos, opcionalmente só os de `usuario_id`). Só grava as linhas
+    que mudaram e retorna os trios (id, usuario_id, mes_referencia) delas, para o
+    resumo mensal e a versão dos dados. Só contam os pagamentos do dono do honorário.
+
+    Com `manter_pagos_sem_pagamento`, honorários marcados como PAGO manualmente e sem
+    nenhum pagamento lançado continuam PAGO (dados antigos, quitados fora do sistema).
+    """
+    db.flush()
+    totais = select(
+        Honorario.id.label("id"),
+        func.coalesce(func.sum(Pagamento.valor), 0).label("total")
+    ).select_from(Honorario).outerjoin(
+        Pagamento,
+        and_(
+            Pagamento.honorario_id == Honorario.id,
+            Pagamento.usuario_id == Honorario.usuario_id,
+            Pagamento.is_deleted == False
+        )
+    ).group_by(Honorario.id)
+    if usuario_id is not None:
+        totais = totais.where(Honorario.usuario_id == usuario_id)
+    if honorario_ids is not None:
+        ids = sorted(set(honorario_ids))
+        if not ids:
+            return []
+        totais = totais.where(Honorario.id.in_(ids))
+    totais = totais.subquery()
+
+    regras = [
+        (totais.c.total >= Honorario.valor - TOLERANCIA, PAGO),
+        (totais.c.total > 0, PARCIAL),
+    ]
+    if manter_pagos_sem_pagamento:
+        regras.insert(0, (and_(Honorario.status_id == PAGO, totais.c.total == 0), PAGO))
+    regras.append((Honorario.data_vencimento < func.current_date(), ATRASADO))
+    derivado = or_(Honorario.status_id.is_(None), Honorario.status_id.in_(STATUS_DERIVADOS))
+    novo_status = case(
+        (derivado, case(*regras, else_=literal(PENDENTE))),
+        else_=Honorario.status_id
+    )
+
+    return db.execute(
+        update(Honorario).where(
+            Honorario.id == totais.c.id,
+            or_(
+                Honorario.valor_pago != totais.c.total,
+                Honorario.status_id.is_distinct_from(novo_status)
+            )
+        ).values(
+            valor_pago=totais.c.total,
+            status_id=novo_status
+        ).returning(
+            Honorario.id, Honorario.usuario_id, Honorario.mes_referencia
+        ).execution_options(synchronize_session=False)
+    ).all()
@@ -0,0 +1,88 @@
+"""
+Tokens de acesso assinados com HMAC-SHA256.
+
+O login emite um token de acesso de vida curta e um token de refresh. Cada
+requisição só confere a assinatura e a expiração do token de acesso, sem consultar
+o banco nem rodar bcrypt. Formato: base64url(payload JSON).base64url(assinatura).
+
+- TOKEN_SECRET: chave da assinatura, a mesma em todos os workers (obrigatória).
+  Só em desenvolvimento, TOKEN_SECRET_ALEATORIO=true aceita a falta dela e gera uma
+  chave por processo: os tokens não valem em outros workers nem após um restart.
+- ACCESS_TOKEN_MINUTOS: validade do token de acesso (padrão 15)
+- REFRESH_TOKEN_DIAS: validade do token de refresh (padrão 7)
+"""
+import base64
+import hashlib
+import hmac
+import json
+import logging
+import os
+import secrets
+import time
+from fastapi import HTTPException
+
+logger = logging.getLogger(__name__)
+
+TOKEN_SECRET = os.getenv("TOKEN_SECRET")
+if not TOKEN_SECRET:
+    if os.getenv("TOKEN_SECRET_ALEATORIO", "false").lower() not in ("1", "true", "sim"):
+        raise RuntimeError(
+            "TOKEN_SECRET não definido. Defina a mesma chave em todos os workers "
+            "(ou TOKEN_SECRET_ALEATORIO=true em desenvolvimento)"
+        )
+    logger.warning("TOKEN_SECRET não definido; usando uma chave aleatória deste processo (desenvolvimento)")
+    TOKEN_SECRET = secrets.token_urlsafe(32)
+
+ACCESS_TOKEN_MINUTOS = int(os.getenv("ACCESS_TOKEN_MINUTOS", "15"))
+REFRESH_TOKEN_DIAS = int(os.getenv("REFRESH_TOKEN_DIAS", "7"))
+
+ACESSO = "access"
+REFRESH = "refresh"
+
+_VALIDADE = {
+    ACESSO: ACCESS_TOKEN_MINUTOS * 60,
+    REFRESH: REFRESH_TOKEN_DIAS * 24 * 60 * 60,
+}
+
+_CHAVE = TOKEN_SECRET.encode()
+
+def _b64(dados: bytes) -> str:
+    return base64.urlsafe_b64encode(dados).rstrip(b"=").decode()
+
+def _de_b64(texto: str) -> bytes:
+    return base64.urlsafe_b64decode(texto + "=" * (-len(texto) % 4))
+
+def _assinar(payload: str) -> str:
+    return _b64(hmac.new(_CHAVE, payload.encode(), hashlib.sha256).digest())
+
+def validade(tipo: str) -> int:
+    """Validade do token em segundos"""
+    return _VALIDADE[tipo]
+
+def emitir_token(usuario_id: int, tipo: str = ACESSO) -> str:
+    payload = _b64(json.dumps(
+        {"sub": usuario_id, "tipo": tipo, "exp": int(time.time()) + _VALIDADE[tipo]},
+        separators=(",", ":")
+    ).encode())
+    return f"{payload}.{_assinar(payload)}"
+
+def validar_token(token: str, tipo: str = ACESSO) -> int:
+    """Confere assinatura, tipo e expiração; retorna o ID do usuário"""
+    invalido = HTTPException(
+        status_code=401,
+        detail="Token inválido ou expirado",
+        headers={"WWW-Authenticate": "Bearer"}
+    )
+    try:
+        payload, assinatura = token.split(".")
+    except ValueError:
+        raise invalido
+    if not hmac.compare_digest(assinatura, _assinar(payload)):
+        raise invalido
+    try:
+        dados = json.loads(_de_b64(payload))
+    except ValueError:
+        raise invalido
+    if dados.get("tipo") != tipo or dados.get("exp", 0) < time.time():
+        raise invalido
+    return dados["sub"]
@@ -0,0 +1,39 @@
+"""
+Versão dos dados de cada usuário, para GET condicional (ETag / If-None-Match).
+
+Toda escrita dos serviços crud_* incrementa a versão do usuário na mesma transação.
+As rotas de listagem e do dashboard montam o ETag a partir dela e respondem 304 sem
+executar as consultas pesadas nem serializar nada quando o cliente já tem a versão
+atual. As que exibem nomes das tabelas de referência (status, tipos de pagamento)
+incluem também o ETag do cache dessas tabelas, que não pertencem a nenhum usuário.
+"""
+import hashlib
+from datetime import date
+from typing import Iterable, Sequence
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from app.models.versao_dados import VersaoDados
+
+def incrementar_versao(db: Session, usuario_ids: Iterable[int]) -> None:
+    """Deve ser chamado antes do commit da operação que alterou os dados"""
+    ids = sorted(set(usuario_ids))
+    if not ids:
+        return
+    stmt = insert(VersaoDados).values([{"usuario_id": usuario_id, "versao": 1} for usuario_id in ids])
+    db.execute(stmt.on_conflict_do_update(
+        index_elements=[VersaoDados.usuario_id],
+        set_={"versao": VersaoDados.versao + 1}
+    ))
+
+async def obter_versao(db: AsyncSession, usuario_id: int) -> int:
+    versao = await db.scalar(select(VersaoDados.versao).where(VersaoDados.usuario_id == usuario_id))
+    return versao or 0
+
+def etag_da_versao(usuario_id: int, versao: int, hoje: date, referencias: Sequence[str] = ()) -> str:
+    # A data entra no ETag porque as respostas dependem do dia (mês atual, vencidos)
+    etag = f"{usuario_id}-{versao}-{hoje.isoformat()}"
+    if referencias:
+        etag += "-" + hashlib.sha1("".join(referencias).encode()).hexdigest()[:12]
+    return f'W/"{etag}"'
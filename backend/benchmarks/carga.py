@@ -0,0 +1,246 @@
+"""
+Teste de carga das rotas principais com os usuários do gerador de dados sintéticos.
+
+`--concorrencia` clientes virtuais executam, durante `--duracao` segundos, uma mistura
+ponderada de operações (dashboard, listagens, login e escritas) como usuários
+{prefixo}1..{prefixo}N de benchmarks/dados_sinteticos.py, e o relatório traz a vazão
+e p50/p95/p99 por operação.
+
+Sem `--url` a aplicação roda no próprio processo (ASGI, sem rede nem uvicorn), o que
+isola o custo da API; com `--url` as requisições vão por HTTP para uma API já no ar:
+
+    python benchmarks/dados_sinteticos.py --usuarios 10 --semente 1
+    python benchmarks/carga.py --usuarios 10 --saida antes.json
+    python benchmarks/carga.py --url http://localhost:8000 --comparar antes.json
+
+`--saida` grava o resultado em JSON e `--comparar` mostra a diferença para uma
+execução anterior. Requer httpx (pip install httpx).
+"""
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import sys
+import time
+from collections import defaultdict
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+import httpx
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from latencia import percentil
+
+class Sessao:
+    """Estado de um usuário logado: token, clientes e honorários criados na carga"""
+
+    def __init__(self, email: str, dados: Dict, clientes: List[int]):
+        self.email = email
+        self.headers = {"Authorization": f"Bearer {dados['access_token']}"}
+        self.clientes = clientes
+        self.honorarios_criados: List[Tuple[int, float]] = []
+
+Operacao = Callable[[httpx.AsyncClient, Sessao, random.Random, Dict], Awaitable[Optional[httpx.Response]]]
+
+def _get(rota: str) -> Operacao:
+    async def executar(http, sessao, rnd, contexto):
+        return await http.get(rota, headers=sessao.headers)
+    return executar
+
+async def _login(http, sessao, rnd, contexto):
+    return await http.post("/auth/login", json={"email": sessao.email, "senha": contexto["senha"]})
+
+async def _criar_honorario(http, sessao, rnd, contexto):
+    if not sessao.clientes:
+        return None
+    valor = round(rnd.uniform(300, 3000), 2)
+    resposta = await http.post("/honorarios/", headers=sessao.headers, json={
+        "cliente_id": rnd.choice(sessao.clientes),
+        "valor": valor,
+        "data_vencimento": (date.today() + timedelta(days=rnd.randint(1, 30))).isoformat(),
+        "descricao": "Teste de carga",
+    })
+    if resposta.status_code == 200:
+        sessao.honorarios_criados.append((resposta.json()["id"], valor))
+    return resposta
+
+async def _registrar_pagamento(http, sessao, rnd, contexto):
+    if not sessao.honorarios_criados:
+        return None
+    honorario_id, valor = sessao.honorarios_criados.pop()
+    return await http.post("/pagamentos/", headers=sessao.headers, json={
+        "honorario_id": honorario_id,
+        "valor": round(valor * rnd.choice([0.5, 1]), 2),
+        "tipo_pagamento_id": rnd.choice(contexto["tipos"]),
+    })
+
+# (nome, peso na mistura, operação, é escrita)
+OPERACOES: List[Tuple[str, int, Operacao, bool]] = [
+    ("GET /dashboard/stats", 4, _get("/dashboard/stats"), False),
+    ("GET /dashboard/revenue", 3, _get("/dashboard/revenue?months=12"), False),
+    ("GET /dashboard/clients", 3, _get("/dashboard/clients?months=12"), False),
+    ("GET /honorarios/", 4, _get("/honorarios/?limit=50"), False),
+    ("GET /pagamentos/", 1, _get("/pagamentos/"), False),
+    ("GET /clientes/", 2, _get("/clientes/"), False),
+    ("POST /auth/login", 1, _login, False),
+    ("POST /honorarios/", 2, _criar_honorario, True),
+    ("POST /pagamentos/", 2, _registrar_pagamento, True),
+]
+
+async def _abrir_sessoes(http: httpx.AsyncClient, args) -> List[Sessao]:
+    async def abrir(numero: int) -> Sessao:
+        email = f"{args.prefixo}{numero}@example.com"
+        resposta = await http.post("/auth/login", json={"email": email, "senha": args.senha})
+        if resposta.status_code != 200:
+            sys.exit(f"Login de {email} falhou ({resposta.status_code}); gere os dados com dados_sinteticos.py")
+        sessao = Sessao(email, resposta.json(), [])
+        clientes = await http.get("/clientes/", headers=sessao.headers)
+        clientes.raise_for_status()
+        sessao.clientes = [cliente["id"] for cliente in clientes.json()]
+        return sessao
+    return await asyncio.gather(*(abrir(numero) for numero in range(1, args.usuarios + 1)))
+
+async def _cliente_virtual(
+    http: httpx.AsyncClient,
+    sessao: Sessao,
+    rnd: random.Random,
+    contexto: Dict,
+    operacoes: List[Tuple[str, int, Operacao, bool]],
+    fim: float,
+    tempos: Dict[str, List[float]],
+    erros: Dict[str, int]
+) -> None:
+    pesos = [peso for _, peso, _, _ in operacoes]
+    while time.perf_counter() < fim:
+        nome, _, operacao, _ = rnd.choices(operacoes, weights=pesos)[0]
+        inicio = time.perf_counter()
+        try:
+            resposta = await operacao(http, sessao, rnd, contexto)
+        except httpx.HTTPError:
+            erros[nome] += 1
+            continue
+        if resposta is None:
+            # Sem pré-condição (ex.: pagamento sem honorário criado); escolhe outra
+            continue
+        if resposta.status_code < 400:
+            tempos[nome].append(time.perf_counter() - inicio)
+        else:
+            erros[nome] += 1
+
+async def _executar(http: httpx.AsyncClient, args) -> Dict:
+    sessoes = await _abrir_sessoes(http, args)
+    tipos = await http.get("/tipos-pagamento/", headers=sessoes[0].headers)
+    contexto = {"senha": args.senha, "tipos": [tipo["id"] for tipo in tipos.json()]}
+    operacoes = [operacao for operacao in OPERACOES if not (args.sem_escritas and operacao[3])]
+
+    async def rodada(duracao: float) -> Tuple[Dict, Dict]:
+        tempos: Dict[str, List[float]] = defaultdict(list)
+        erros: Dict[str, int] = defaultdict(int)
+        fim = time.perf_counter() + duracao
+        await asyncio.gather(*(
+            _cliente_virtual(
+                http, sessoes[i % len(sessoes)], random.Random(f"{args.semente}-{i}"),
+                contexto, operacoes, fim, tempos, erros
+            )
+            for i in range(args.concorrencia)
+        ))
+        return tempos, erros
+
+    # Aquecimento: conexões do pool, caches e JIT do planner antes de medir
+    await rodada(args.aquecimento)
+    inicio = time.perf_counter()
+    tempos, erros = await rodada(args.duracao)
+    duracao = time.perf_counter() - inicio
+
+    rotas = {}
+    for nome, _, _, _ in operacoes:
+        amostras = tempos.get(nome, [])
+        rotas[nome] = {
+            "reqs": len(amostras),
+            "erros": erros.get(nome, 0),
+            "vazao": len(amostras) / duracao,
+            **({
+                "p50": percentil(amostras, 50) * 1000,
+                "p95": percentil(amostras, 95) * 1000,
+                "p99": percentil(amostras, 99) * 1000,
+                "media": statistics.fmean(amostras) * 1000,
+            } if amostras else {}),
+        }
+    return {
+        "alvo": args.url or "em processo",
+        "concorrencia": args.concorrencia,
+        "usuarios": args.usuarios,
+        "duracao": duracao,
+        "vazao": sum(rota["reqs"] for rota in rotas.values()) / duracao,
+        "rotas": rotas,
+    }
+
+async def medir(args) -> Dict:
+    limites = httpx.Limits(max_connections=args.concorrencia, max_keepalive_connections=args.concorrencia)
+    if args.url:
+        async with httpx.AsyncClient(base_url=args.url, limits=limites, timeout=120) as http:
+            return await _executar(http, args)
+
+    from app.main import app
+    # O ASGITransport não dispara o lifespan; os eventos de startup (pool de senhas,
+    # agendador) rodam aqui
+    await app.router.startup()
+    try:
+        transporte = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transporte, base_url="http://carga", timeout=120) as http:
+            return await _executar(http, args)
+    finally:
+        await app.router.shutdown()
+
+def _variacao(atual: float, anterior: Optional[float]) -> str:
+    if not anterior:
+        return ""
+    return f" ({(atual - anterior) / anterior * 100:+.0f}%)"
+
+def imprimir(resultado: Dict, anterior: Optional[Dict] = None) -> None:
+    rotas_anteriores = (anterior or {}).get("rotas", {})
+    print(
+        f"\n== {resultado['alvo']}: {resultado['vazao']:.1f} req/s"
+        f"{_variacao(resultado['vazao'], (anterior or {}).get('vazao'))}"
+        f" ({resultado['concorrencia']} clientes, {resultado['duracao']:.0f}s)"
+    )
+    print(f"{'operação':<26}{'reqs':>8}{'erros':>7}{'req/s':>9}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for nome, rota in resultado["rotas"].items():
+        linha = f"{nome:<26}{rota['reqs']:>8}{rota['erros']:>7}{rota['vazao']:>9.1f}"
+        if rota["reqs"]:
+            linha += f"{rota['p50']:>10.1f}{rota['p95']:>10.1f}{rota['p99']:>10.1f}"
+        print(linha)
+        if nome in rotas_anteriores and rota["reqs"] and rotas_anteriores[nome].get("reqs"):
+            antes = rotas_anteriores[nome]
+            print(
+                f"{'  vs. anterior':<50}"
+                f"{_variacao(rota['p50'], antes['p50']):>10}"
+                f"{_variacao(rota['p95'], antes['p95']):>10}"
+                f"{_variacao(rota['p99'], antes['p99']):>10}"
+            )
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--url", default=None, help="API já no ar; sem ela, roda a aplicação no processo")
+    parser.add_argument("--concorrencia", type=int, default=50, help="clientes virtuais simultâneos")
+    parser.add_argument("--duracao", type=float, default=30, help="segundos de medição")
+    parser.add_argument("--aquecimento", type=float, default=3, help="segundos de aquecimento (não medidos)")
+    parser.add_argument("--usuarios", type=int, default=10, help="usuários {prefixo}1..N usados na carga")
+    parser.add_argument("--prefixo", default="carga")
+    parser.add_argument("--senha", default="benchmark-senha")
+    parser.add_argument("--sem-escritas", action="store_true", help="só leituras e login (não altera o banco)")
+    parser.add_argument("--semente", type=int, default=0, help="semente da escolha das operações")
+    parser.add_argument("--saida", default=None, help="grava o resultado em JSON")
+    parser.add_argument("--comparar", default=None, help="JSON de uma execução anterior")
+    args = parser.parse_args()
+
+    anterior = json.loads(Path(args.comparar).read_text()) if args.comparar else None
+    resultado = asyncio.run(medir(args))
+    imprimir(resultado, anterior)
+    if args.saida:
+        Path(args.saida).write_text(json.dumps(resultado, indent=2, ensure_ascii=False))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,242 @@
+"""
+Gerador de dados sintéticos para reproduzir a escala de produção localmente.
+
+Cria `--usuarios` usuários ({prefixo}{n}@example.com, todos com a mesma senha), cada
+um com cerca de `--clientes` clientes (entre metade e uma vez e meia), um honorário
+por cliente e mês nos últimos `--meses` meses e até `--pagamentos` pagamentos por
+honorário. As distribuições imitam uma carteira real:
+
+- clientes entram ao longo da janela (a maioria já existe no início dela)
+- valores log-normais em torno de R$ 1.200, com cobranças extras ocasionais
+- cada cliente tem uma pontualidade própria: quitados, parciais e em atraso
+- pagamentos perto do vencimento, alguns parcelados
+
+valor_pago, status, flags de lembrete, resumo mensal e versão dos dados são gravados
+de forma coerente, então a API responde como em produção logo após a carga.
+
+    python benchmarks/dados_sinteticos.py --usuarios 20 --clientes 150 --meses 24
+
+Use `--semente` para gerar sempre os mesmos dados e comparar execuções.
+"""
+import argparse
+import math
+import random
+import sys
+import time
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from sqlalchemy import insert, select
+from app.database import SessionLocal, engine
+from app.models.clientes import Cliente
+from app.models.honorarios import Honorario
+from app.models.pagamentos import Pagamento
+from app.models.tipo_pagamento import TipoPagamento
+from app.models.usuario import Usuario
+from app.services.resumo_mensal import reconstruir_resumo
+from app.services.senhas import gerar_hash_sync
+from app.services.series_mensais import janela_meses, mes_referencia
+from app.services.situacao_honorarios import ATRASADO, PAGO, PARCIAL, PENDENTE, TOLERANCIA
+from app.services.versao_dados import incrementar_versao
+
+LOTE = 5000
+
+NOMES = [
+    "Ana", "Bruno", "Carla", "Daniel", "Eduarda", "Felipe", "Gabriela", "Henrique", "Isabela",
+    "João", "Larissa", "Marcos", "Natália", "Otávio", "Paula", "Rafael", "Sofia", "Thiago",
+]
+SOBRENOMES = [
+    "Almeida", "Barbosa", "Cardoso", "Costa", "Ferreira", "Gomes", "Lima", "Martins",
+    "Oliveira", "Pereira", "Ribeiro", "Rodrigues", "Santos", "Silva", "Souza",
+]
+EMPRESAS = ["Comércio", "Serviços", "Transportes", "Engenharia", "Alimentos", "Tecnologia", "Consultoria"]
+DIAS_VENCIMENTO = [5, 10, 10, 15, 20, 25, 28]
+
+def _nome_cliente(rnd: random.Random) -> str:
+    if rnd.random() < 0.4:
+        return f"{rnd.choice(SOBRENOMES)} {rnd.choice(EMPRESAS)} Ltda"
+    return f"{rnd.choice(NOMES)} {rnd.choice(SOBRENOMES)} {rnd.choice(SOBRENOMES)}"
+
+def _dividir(valor: float, partes: int) -> List[float]:
+    parcela = round(valor / partes, 2)
+    return [parcela] * (partes - 1) + [round(valor - parcela * (partes - 1), 2)]
+
+def _clientes(rnd: random.Random, usuario_id: int, quantidade: int, janela: List[date]) -> List[Dict]:
+    clientes = []
+    for _ in range(quantidade):
+        # 70% já eram clientes no início da janela; os demais entram ao longo dela
+        entrada = janela[0] if rnd.random() < 0.7 else rnd.choice(janela)
+        nome = _nome_cliente(rnd)
+        clientes.append({
+            "usuario_id": usuario_id,
+            "nome": nome,
+            "email": f"{nome.split()[0].lower()}.{rnd.randrange(10 ** 6)}@example.com" if rnd.random() < 0.85 else None,
+            "telefone": f"(11) 9{rnd.randrange(10 ** 8):08d}" if rnd.random() < 0.7 else None,
+            "data_criacao": entrada + timedelta(days=rnd.randrange(28)),
+            # Poucos clientes excluídos, para os filtros de is_deleted trabalharem
+            "is_deleted": rnd.random() < 0.02,
+        })
+    return clientes
+
+def _honorarios_e_pagamentos(
+    rnd: random.Random,
+    usuario_id: int,
+    cliente_id: int,
+    cliente: Dict,
+    janela: List[date],
+    max_pagamentos: int,
+    tipos: List[int],
+    hoje: date
+):
+    """Honorários do cliente mês a mês, com os pagamentos de cada um (sem honorario_id ainda)"""
+    base = max(100.0, round(rnd.lognormvariate(math.log(1200), 0.6), -1))
+    dia = rnd.choice(DIAS_VENCIMENTO)
+    pontualidade = rnd.betavariate(8, 2)
+    linhas = []
+    for mes in janela:
+        if mes < cliente["data_criacao"].replace(day=1):
+            continue
+        valor = base if rnd.random() > 0.1 else round(base * rnd.uniform(1.1, 1.8), 2)
+        vencimento = mes.replace(day=dia)
+
+        pagamentos = []
+        if vencimento < hoje or rnd.random() < 0.1:
+            sorte = rnd.random()
+            if sorte < pontualidade:
+                pago = valor
+            elif sorte < pontualidade + (1 - pontualidade) * 0.3:
+                pago = round(valor * rnd.uniform(0.2, 0.8), 2)
+            else:
+                pago = 0
+            if pago:
+                partes = 1 if rnd.random() < 0.7 or max_pagamentos < 2 else rnd.randint(2, max_pagamentos)
+                for indice, parcela in enumerate(_dividir(pago, partes)):
+                    data_pagamento = vencimento + timedelta(days=int(rnd.gauss(0, 5)) + indice * 15)
+                    pagamentos.append({
+                        "usuario_id": usuario_id,
+                        "valor": parcela,
+                        "tipo_pagamento_id": rnd.choice(tipos),
+                        "data_pagamento": min(data_pagamento, hoje),
+                        "observacao": f"Parcela {indice + 1}/{partes}" if partes > 1 else None,
+                        "is_deleted": False,
+                    })
+        pago = sum(pagamento["valor"] for pagamento in pagamentos)
+
+        if pago >= valor - TOLERANCIA:
+            status_id = PAGO
+        elif pago > 0:
+            status_id = PARCIAL
+        elif vencimento < hoje:
+            status_id = ATRASADO
+        else:
+            status_id = PENDENTE
+        vencido = vencimento < hoje
+        linhas.append(({
+            "usuario_id": usuario_id,
+            "cliente_id": cliente_id,
+            "valor": valor,
+            "valor_pago": pago,
+            "status_id": status_id,
+            "data_vencimento": vencimento,
+            "mes_referencia": mes_referencia(mes),
+            "descricao": "Honorários mensais" if valor == base else "Honorários mensais e serviços extras",
+            # Lembretes dos vencimentos passados já teriam sido enviados
+            "notificado": vencido,
+            "notificado1a": vencido,
+            "notificado3": vencido,
+            "is_deleted": False,
+        }, pagamentos))
+    return linhas
+
+def _inserir(db, modelo, valores: List[Dict], retornar_ids: bool = True) -> List[int]:
+    ids = []
+    for inicio in range(0, len(valores), LOTE):
+        lote = valores[inicio:inicio + LOTE]
+        if retornar_ids:
+            ids += db.scalars(insert(modelo).returning(modelo.id, sort_by_parameter_order=True), lote).all()
+        else:
+            db.execute(insert(modelo), lote)
+    return ids
+
+def gerar_usuario(db, rnd: random.Random, email: str, senha_hash: str, args, tipos: List[int], hoje: date) -> Dict[str, int]:
+    janela = janela_meses(args.meses, hoje)
+    usuario_id = db.scalar(
+        insert(Usuario).values(nome=f"Escritório {email.split('@')[0]}", email=email, senha=senha_hash).returning(Usuario.id)
+    )
+
+    quantidade = max(1, rnd.randint(round(args.clientes * 0.5), round(args.clientes * 1.5)))
+    clientes = _clientes(rnd, usuario_id, quantidade, janela)
+    cliente_ids = _inserir(db, Cliente, clientes)
+
+    honorarios, pagamentos_por_honorario = [], []
+    for cliente_id, cliente in zip(cliente_ids, clientes):
+        for honorario, pagamentos in _honorarios_e_pagamentos(
+            rnd, usuario_id, cliente_id, cliente, janela, args.pagamentos, tipos, hoje
+        ):
+            honorarios.append(honorario)
+            pagamentos_por_honorario.append(pagamentos)
+    honorario_ids = _inserir(db, Honorario, honorarios)
+
+    pagamentos = [
+        {**pagamento, "honorario_id": honorario_id}
+        for honorario_id, lista in zip(honorario_ids, pagamentos_por_honorario)
+        for pagamento in lista
+    ]
+    _inserir(db, Pagamento, pagamentos, retornar_ids=False)
+
+    reconstruir_resumo(db, usuario_id)
+    incrementar_versao(db, [usuario_id])
+    return {"clientes": len(cliente_ids), "honorarios": len(honorario_ids), "pagamentos": len(pagamentos)}
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--usuarios", type=int, default=10)
+    parser.add_argument("--clientes", type=int, default=100, help="média de clientes por usuário")
+    parser.add_argument("--meses", type=int, default=24, help="meses de honorários até o mês atual")
+    parser.add_argument("--pagamentos", type=int, default=3, help="máximo de pagamentos por honorário")
+    parser.add_argument("--prefixo", default="carga", help="e-mails {prefixo}{n}@example.com")
+    parser.add_argument("--senha", default="benchmark-senha", help="senha de todos os usuários gerados")
+    parser.add_argument("--semente", type=int, default=None, help="semente do gerador aleatório")
+    args = parser.parse_args()
+
+    rnd = random.Random(args.semente)
+    hoje = date.today()
+    emails = [f"{args.prefixo}{n}@example.com" for n in range(1, args.usuarios + 1)]
+    print(f"Banco: {engine.url.render_as_string(hide_password=True)}")
+
+    db = SessionLocal()
+    try:
+        existentes = db.scalars(select(Usuario.email).where(Usuario.email.in_(emails))).all()
+        if existentes:
+            sys.exit(f"Usuários já existem ({', '.join(sorted(existentes)[:3])}...); use outro --prefixo")
+        tipos = db.scalars(select(TipoPagamento.id)).all()
+        if not tipos:
+            sys.exit("Cadastre os tipos de pagamento antes de gerar os dados")
+
+        # Um único hash: bcrypt leva centenas de ms por senha
+        senha_hash = gerar_hash_sync(args.senha)
+        totais = {"clientes": 0, "honorarios": 0, "pagamentos": 0}
+        inicio = time.perf_counter()
+        for numero, email in enumerate(emails, start=1):
+            # Uma transação por usuário: uma carga interrompida não deixa usuário pela metade
+            gerados = gerar_usuario(db, rnd, email, senha_hash, args, tipos, hoje)
+            db.commit()
+            for chave, quantidade in gerados.items():
+                totais[chave] += quantidade
+            print(f"[{numero}/{len(emails)}] {email}: {gerados}")
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+    duracao = time.perf_counter() - inicio
+    print(
+        f"\n{len(emails)} usuários, {totais['clientes']} clientes, {totais['honorarios']} honorários e "
+        f"{totais['pagamentos']} pagamentos em {duracao:.1f}s (senha: {args.senha})"
+    )
+
+if __name__ == "__main__":
+    main()
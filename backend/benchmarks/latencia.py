@@ -0,0 +1,105 @@
+"""
+Benchmark de latência das rotas de leitura sob concorrência.
+
+Dispara `--usuarios` clientes simultâneos (padrão 200) contra uma ou mais APIs já
+no ar e reporta vazão, p50 e p99 por rota. Para comparar o caminho síncrono com o
+assíncrono, suba as duas versões em portas diferentes (por exemplo o commit anterior
+à migração para AsyncSession e o atual) e passe um `--alvo` para cada:
+
+    python benchmarks/latencia.py \\
+        --alvo sync=http://localhost:8001 --alvo async=http://localhost:8000
+
+Os tokens de acesso são emitidos localmente, então TOKEN_SECRET precisa ser o mesmo
+das APIs medidas. Requer httpx (pip install httpx).
+"""
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List
+
+import httpx
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from app.services.tokens import emitir_token
+
+ROTAS = [
+    "/dashboard/stats",
+    "/dashboard/revenue",
+    "/dashboard/clients",
+    "/honorarios/?limit=50",
+    "/pagamentos/",
+    "/clientes/",
+]
+
+def percentil(amostras: List[float], p: float) -> float:
+    ordenadas = sorted(amostras)
+    indice = min(len(ordenadas) - 1, max(0, round(p / 100 * len(ordenadas)) - 1))
+    return ordenadas[indice]
+
+async def _cliente(http: httpx.AsyncClient, usuario_id: int, fim: float, tempos: Dict[str, List[float]], erros: Dict[str, int]):
+    headers = {"Authorization": f"Bearer {emitir_token(usuario_id)}"}
+    while time.perf_counter() < fim:
+        for rota in ROTAS:
+            inicio = time.perf_counter()
+            try:
+                resposta = await http.get(rota, headers=headers)
+                ok = resposta.status_code == 200
+            except httpx.HTTPError:
+                ok = False
+            if ok:
+                tempos[rota].append(time.perf_counter() - inicio)
+            else:
+                erros[rota] += 1
+
+async def medir(url: str, usuarios: int, duracao: float, usuarios_distintos: int) -> Dict:
+    tempos: Dict[str, List[float]] = defaultdict(list)
+    erros: Dict[str, int] = defaultdict(int)
+    limites = httpx.Limits(max_connections=usuarios, max_keepalive_connections=usuarios)
+    async with httpx.AsyncClient(base_url=url, limits=limites, timeout=60) as http:
+        # Aquecimento: abre conexões e popula caches antes de medir
+        aquecimento = {"Authorization": f"Bearer {emitir_token(1)}"}
+        await asyncio.gather(*(http.get(rota, headers=aquecimento) for rota in ROTAS))
+        fim = time.perf_counter() + duracao
+        await asyncio.gather(*(
+            _cliente(http, i % usuarios_distintos + 1, fim, tempos, erros)
+            for i in range(usuarios)
+        ))
+    return {"tempos": tempos, "erros": erros, "duracao": duracao}
+
+def imprimir(nome: str, resultado: Dict) -> None:
+    total = sum(len(t) for t in resultado["tempos"].values())
+    print(f"\n== {nome}: {total / resultado['duracao']:.1f} req/s")
+    print(f"{'rota':<26}{'reqs':>8}{'erros':>7}{'p50 ms':>10}{'p99 ms':>10}{'média ms':>10}")
+    for rota in ROTAS:
+        amostras = resultado["tempos"].get(rota, [])
+        if not amostras:
+            print(f"{rota:<26}{0:>8}{resultado['erros'][rota]:>7}")
+            continue
+        print(
+            f"{rota:<26}{len(amostras):>8}{resultado['erros'][rota]:>7}"
+            f"{percentil(amostras, 50) * 1000:>10.1f}{percentil(amostras, 99) * 1000:>10.1f}"
+            f"{statistics.fmean(amostras) * 1000:>10.1f}"
+        )
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument(
+        "--alvo", action="append", default=[],
+        help="nome=url da API (pode repetir); padrão: api=http://localhost:8000"
+    )
+    parser.add_argument("--usuarios", type=int, default=200, help="clientes simultâneos")
+    parser.add_argument("--duracao", type=float, default=30, help="segundos de medição por alvo")
+    parser.add_argument("--usuarios-distintos", type=int, default=2, help="usuários (IDs 1..N) usados nas requisições")
+    args = parser.parse_args()
+
+    alvos = [alvo.split("=", 1) for alvo in args.alvo] or [["api", "http://localhost:8000"]]
+    for nome, url in alvos:
+        resultado = asyncio.run(medir(url, args.usuarios, args.duracao, args.usuarios_distintos))
+        imprimir(nome, resultado)
+
+if __name__ == "__main__":
+    main()
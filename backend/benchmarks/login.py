@@ -0,0 +1,82 @@
+"""
+Benchmark de vazão do login sob carga concorrente.
+
+Simula o pico de logins (todos abrindo o sistema no mesmo horário): `--usuarios`
+clientes fazem POST /auth/login em laço enquanto outros `--leitores` consultam
+/dashboard/stats, para mostrar se o hash de senhas ainda disputa recursos com as
+leituras. Reporta logins/s, p50/p99 do login e do dashboard e quantos logins
+receberam 503 pelo limite da fila do pool de senhas.
+
+    python benchmarks/login.py --url http://localhost:8000 --cadastrar
+
+Requer httpx (pip install httpx).
+"""
+import argparse
+import asyncio
+import time
+from typing import Dict, List
+
+import httpx
+
+from latencia import percentil
+
+async def _logar(http: httpx.AsyncClient, credenciais: Dict, fim: float, tempos: List[float], status: Dict[int, int]):
+    while time.perf_counter() < fim:
+        inicio = time.perf_counter()
+        resposta = await http.post("/auth/login", json=credenciais)
+        status[resposta.status_code] = status.get(resposta.status_code, 0) + 1
+        if resposta.status_code == 200:
+            tempos.append(time.perf_counter() - inicio)
+        elif resposta.status_code == 503:
+            await asyncio.sleep(float(resposta.headers.get("Retry-After", 1)))
+
+async def _ler(http: httpx.AsyncClient, access_token: str, fim: float, tempos: List[float]):
+    headers = {"Authorization": f"Bearer {access_token}"}
+    while time.perf_counter() < fim:
+        inicio = time.perf_counter()
+        resposta = await http.get("/dashboard/stats", headers=headers)
+        if resposta.status_code == 200:
+            tempos.append(time.perf_counter() - inicio)
+
+async def medir(args) -> None:
+    credenciais = {"email": args.email, "senha": args.senha}
+    limites = httpx.Limits(max_connections=args.usuarios + args.leitores)
+    async with httpx.AsyncClient(base_url=args.url, limits=limites, timeout=120) as http:
+        if args.cadastrar:
+            resposta = await http.post("/auth/cadastro", json={"nome": "Benchmark", **credenciais})
+            if resposta.status_code not in (201, 400):
+                resposta.raise_for_status()
+        resposta = await http.post("/auth/login", json=credenciais)
+        resposta.raise_for_status()
+        access_token = resposta.json()["access_token"]
+
+        logins: List[float] = []
+        leituras: List[float] = []
+        status: Dict[int, int] = {}
+        fim = time.perf_counter() + args.duracao
+        await asyncio.gather(
+            *(_logar(http, credenciais, fim, logins, status) for _ in range(args.usuarios)),
+            *(_ler(http, access_token, fim, leituras) for _ in range(args.leitores))
+        )
+
+    print(f"logins: {len(logins) / args.duracao:.1f}/s  respostas por status: {status}")
+    for nome, amostras in (("login", logins), ("dashboard", leituras)):
+        if amostras:
+            print(
+                f"{nome:<10} n={len(amostras):<6} p50={percentil(amostras, 50) * 1000:.1f}ms "
+                f"p99={percentil(amostras, 99) * 1000:.1f}ms"
+            )
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--email", default="benchmark@example.com")
+    parser.add_argument("--senha", default="benchmark-senha")
+    parser.add_argument("--cadastrar", action="store_true", help="cria o usuário antes de medir")
+    parser.add_argument("--usuarios", type=int, default=50, help="clientes fazendo login simultaneamente")
+    parser.add_argument("--leitores", type=int, default=10, help="clientes lendo o dashboard ao mesmo tempo")
+    parser.add_argument("--duracao", type=float, default=30, help="segundos de medição")
+    asyncio.run(medir(parser.parse_args()))
+
+if __name__ == "__main__":
+    main()
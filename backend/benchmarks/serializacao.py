@@ -0,0 +1,152 @@
+"""
+Micro-benchmark da serialização das listagens com payloads de 10k linhas.
+
+Mede, sem banco nem HTTP, as etapas que a API executa depois das consultas:
+
+- jsonable_encoder + json: caminho padrão do FastAPI para conteúdo sem response_model
+- schema + JSONResponse: validação pelo response_model e render com json (antes)
+- schema + RespostaJSON: validação pelo response_model e render com orjson (atual)
+- projeção + RespostaJSON: dicts prontos (GET /pagamentos), só o render
+
+    python benchmarks/serializacao.py --linhas 10000 --repeticoes 5
+
+Os dados são sintéticos mas têm o formato real das respostas (datas, textos,
+objetos aninhados), para acompanhar a evolução do custo ao longo do tempo.
+"""
+import argparse
+import json
+import random
+import statistics
+import sys
+import time
+from datetime import date, timedelta
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Callable, Dict, List
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from app.respostas import RespostaJSON
+from app.schemas.clientes import Cliente
+from app.schemas.honorarios import Honorario
+from app.schemas.pagamentos import Pagamento
+
+STATUS = [{"id": 1, "nome": "PENDENTE"}, {"id": 2, "nome": "PAGO"}, {"id": 3, "nome": "ATRASADO"}]
+TIPOS = [{"id": 1, "nome": "PIX"}, {"id": 2, "nome": "BOLETO"}]
+
+def _cliente(i: int) -> Dict:
+    return {
+        "id": i,
+        "nome": f"Cliente {i}",
+        "email": f"cliente{i}@exemplo.com",
+        "telefone": f"(11) 9{i:08d}"[:15],
+        "is_deleted": False,
+        "data_criacao": date(2023, 1, 1) + timedelta(days=i % 700)
+    }
+
+def gerar_payloads(linhas: int) -> Dict[str, List[Dict]]:
+    aleatorio = random.Random(42)
+    clientes = [_cliente(i) for i in range(1, max(linhas // 10, 1) + 1)]
+    honorarios = []
+    for i in range(1, linhas + 1):
+        vencimento = date(2024, 1, 10) + timedelta(days=i % 600)
+        status = aleatorio.choice(STATUS)
+        cliente = aleatorio.choice(clientes)
+        valor = round(aleatorio.uniform(100, 5000), 2)
+        honorarios.append({
+            "id": i,
+            "valor": valor,
+            "valor_pago": valor if status["id"] == 2 else 0.0,
+            "cliente_id": cliente["id"],
+            "data_vencimento": vencimento,
+            "mes_referencia": vencimento.strftime("%Y-%m"),
+            "descricao": f"Honorário {i}",
+            "status_id": status["id"],
+            "notificado": False,
+            "notificado1a": False,
+            "notificado3": False,
+            # Parte dos honorários gerada por recorrência, parte avulsa
+            "recorrencia_id": cliente["id"] if i % 3 else None,
+            "cliente": cliente,
+            "status": status
+        })
+    pagamentos = []
+    for i, honorario in enumerate(honorarios, start=1):
+        tipo = aleatorio.choice(TIPOS)
+        pagamentos.append({
+            "id": i,
+            "honorario_id": honorario["id"],
+            "valor": honorario["valor"],
+            "tipo_pagamento_id": tipo["id"],
+            "data_pagamento": honorario["data_vencimento"],
+            "observacao": None,
+            "honorario": {
+                "id": honorario["id"],
+                "cliente": honorario["cliente"],
+                "mes_referencia": honorario["mes_referencia"]
+            },
+            "tipo_pagamento": tipo
+        })
+    clientes_grandes = [_cliente(i) for i in range(1, linhas + 1)]
+    return {"honorarios": honorarios, "pagamentos": pagamentos, "clientes": clientes_grandes}
+
+def _como_objetos(valor):
+    """Converte dicts em objetos com atributos, como os do ORM lidos com from_attributes"""
+    if isinstance(valor, dict):
+        return SimpleNamespace(**{chave: _como_objetos(item) for chave, item in valor.items()})
+    if isinstance(valor, list):
+        return [_como_objetos(item) for item in valor]
+    return valor
+
+def cenarios(schema, linhas: List[Dict]) -> Dict[str, Callable[[], bytes]]:
+    adaptador = TypeAdapter(List[schema])
+    objetos = _como_objetos(linhas)
+
+    def via_schema():
+        return adaptador.dump_python(adaptador.validate_python(objetos, from_attributes=True), mode="json")
+
+    return {
+        "jsonable_encoder + json": lambda: JSONResponse(jsonable_encoder(linhas)).body,
+        "schema + JSONResponse": lambda: JSONResponse(via_schema()).body,
+        "schema + RespostaJSON": lambda: RespostaJSON(via_schema()).body,
+        "projeção + RespostaJSON": lambda: RespostaJSON(linhas).body,
+    }
+
+def medir(funcao: Callable[[], bytes], repeticoes: int) -> List[float]:
+    funcao()
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao()
+        tempos.append(time.perf_counter() - inicio)
+    return tempos
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--linhas", type=int, default=10000)
+    parser.add_argument("--repeticoes", type=int, default=5)
+    args = parser.parse_args()
+
+    payloads = gerar_payloads(args.linhas)
+    schemas = {"honorarios": Honorario, "pagamentos": Pagamento, "clientes": Cliente}
+    for nome, linhas in payloads.items():
+        print(f"\n== {nome} ({len(linhas)} linhas)")
+        referencia = None
+        for cenario, funcao in cenarios(schemas[nome], linhas).items():
+            corpo = funcao()
+            # Todos os caminhos precisam produzir o mesmo JSON
+            if referencia is None:
+                referencia = json.loads(corpo)
+            elif json.loads(corpo) != referencia:
+                print(f"  {cenario}: JSON diferente do cenário de referência")
+            tempos = medir(funcao, args.repeticoes)
+            print(
+                f"  {cenario:<26} mediana {statistics.median(tempos) * 1000:8.1f} ms"
+                f"   mínimo {min(tempos) * 1000:8.1f} ms   {len(corpo) / 1024:8.0f} KiB"
+            )
+
+if __name__ == "__main__":
+    main()
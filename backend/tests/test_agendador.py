@@ -0,0 +1,21 @@
+def test_rotina_travada_em_outro_processo_e_pulada(banco, monkeypatch):
+    from sqlalchemy import func, select
+    from app.services import agendador
+
+    executadas = []
+    monkeypatch.setattr(agendador, "TAREFAS_DIARIAS", [
+        ("primeira", lambda db: executadas.append("primeira")),
+        ("segunda", lambda db: executadas.append("segunda")),
+    ])
+
+    # Outro worker rodando a primeira rotina
+    with banco.connect() as outro_worker:
+        assert outro_worker.scalar(select(func.pg_try_advisory_lock(agendador.TRAVA_AGENDADOR, 0)))
+        agendador.executar_tarefas_diarias()
+        outro_worker.scalar(select(func.pg_advisory_unlock(agendador.TRAVA_AGENDADOR, 0)))
+        outro_worker.commit()
+    assert executadas == ["segunda"]
+
+    # Sem concorrência as duas rodam, e as travas foram liberadas
+    agendador.executar_tarefas_diarias()
+    assert executadas == ["segunda", "primeira", "segunda"]
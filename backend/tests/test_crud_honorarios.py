@@ -0,0 +1,36 @@
+from datetime import timedelta
+
+def _honorario_avisado(db, usuario_id):
+    from sqlalchemy import select
+    from app.models.honorarios import Honorario
+
+    honorario = db.scalars(
+        select(Honorario).where(Honorario.usuario_id == usuario_id, Honorario.is_deleted == False).limit(1)
+    ).one()
+    honorario.notificado = honorario.notificado1a = honorario.notificado3 = True
+    db.commit()
+    return honorario
+
+def test_novo_vencimento_libera_os_lembretes(db, usuario_id):
+    from app.schemas.honorarios import HonorarioUpdate
+    from app.services.crud_honorarios import update_honorario
+
+    honorario = _honorario_avisado(db, usuario_id)
+    novo = honorario.data_vencimento + timedelta(days=10)
+
+    atualizado = update_honorario(db, honorario.id, HonorarioUpdate(data_vencimento=novo), usuario_id)
+
+    assert atualizado.data_vencimento == novo
+    assert (atualizado.notificado, atualizado.notificado1a, atualizado.notificado3) == (False, False, False)
+
+def test_mesmo_vencimento_mantem_os_lembretes(db, usuario_id):
+    from app.schemas.honorarios import HonorarioUpdate
+    from app.services.crud_honorarios import update_honorario
+
+    honorario = _honorario_avisado(db, usuario_id)
+
+    atualizado = update_honorario(
+        db, honorario.id, HonorarioUpdate(data_vencimento=honorario.data_vencimento, descricao="x"), usuario_id
+    )
+
+    assert (atualizado.notificado, atualizado.notificado1a, atualizado.notificado3) == (True, True, True)
@@ -0,0 +1,33 @@
+from datetime import date
+
+def test_recorrencia_iniciada_no_mes_atual_gera_o_mes_atual_e_o_proximo(db, usuario_id):
+    from sqlalchemy import select
+    from app.models.clientes import Cliente
+    from app.models.honorarios import Honorario
+    from app.models.recorrencias import Recorrencia
+    from app.services.crud_recorrencias import gerar_honorarios_recorrentes
+    from app.services.series_mensais import adicionar_meses, mes_referencia
+
+    hoje = date.today()
+    atual, proximo = mes_referencia(hoje), mes_referencia(adicionar_meses(hoje, 1))
+    cliente_id = db.scalar(
+        select(Cliente.id).where(Cliente.usuario_id == usuario_id, Cliente.is_deleted == False).limit(1)
+    )
+    recorrencia = Recorrencia(
+        usuario_id=usuario_id,
+        cliente_id=cliente_id,
+        valor=500,
+        dia_vencimento=1,
+        mes_inicio=atual,
+        periodicidade_meses=1,
+        descricao="Mensalidade (teste)",
+        is_deleted=False
+    )
+    db.add(recorrencia)
+    db.commit()
+
+    gerar_honorarios_recorrentes(db)
+    gerar_honorarios_recorrentes(db)
+
+    gerados = db.scalars(select(Honorario.mes_referencia).where(Honorario.recorrencia_id == recorrencia.id)).all()
+    assert sorted(gerados) == [atual, proximo]
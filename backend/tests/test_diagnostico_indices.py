@@ -0,0 +1,43 @@
+from sqlalchemy import text
+
+# Índices simples de usuario_id do esquema inicial. Com poucos dados o planner pode
+# preferi-los aos compostos, e eles também evitam o Seq Scan; o teste os remove
+# dentro da transação (desfeita no fim) para conferir que as consultas conseguem
+# usar os índices das migrações no formato em que são montadas.
+INDICES_SIMPLES = ["ix_honorarios_usuario_id", "ix_clientes_usuario_id", "ix_pagamentos_usuario_id"]
+
+# Por consulta, os índices de que ela precisa; em cada grupo qualquer um serve
+# (o planner escolhe conforme as estatísticas)
+INDICES_ESPERADOS = {
+    "GET /dashboard/stats": [
+        {"ix_honorarios_usuario_vencimento", "ix_honorarios_usuario_mes"},
+        {"resumo_mensal_pkey"},
+    ],
+    "GET /dashboard/revenue|clients": [{"resumo_mensal_pkey"}],
+    "GET /honorarios": [{"ix_honorarios_usuario_vencimento"}],
+    "GET /pagamentos": [{"ix_pagamentos_usuario_data", "ix_pagamentos_honorario_id"}],
+    "GET /clientes": [{"ix_clientes_usuario_criacao"}],
+    "resumo: pagamentos por mês": [{"ix_pagamentos_usuario_data"}],
+    "resumo: honorários por mês": [{"ix_honorarios_usuario_mes"}],
+    "resumo: novos clientes": [{"ix_clientes_usuario_criacao"}],
+    "varredura de atrasados": [{"ix_honorarios_pendentes_vencimento"}],
+}
+
+def test_consultas_principais_usam_indices(db, usuario_id):
+    from app.services.diagnostico_indices import verificar_indices
+
+    for indice in INDICES_SIMPLES:
+        db.execute(text(f"DROP INDEX {indice}"))
+    planos = verificar_indices(db, usuario_id)
+
+    assert set(planos) == set(INDICES_ESPERADOS)
+    sequenciais = {
+        nome: [tabela for tipo, tabela, _ in leituras if tipo == "Seq Scan"]
+        for nome, leituras in planos.items()
+    }
+    assert {nome: tabelas for nome, tabelas in sequenciais.items() if tabelas} == {}
+    faltando = {
+        nome: [sorted(grupo) for grupo in grupos if not grupo & {indice for _, _, indice in planos[nome]}]
+        for nome, grupos in INDICES_ESPERADOS.items()
+    }
+    assert {nome: indices for nome, indices in faltando.items() if indices} == {}
@@ -0,0 +1,14 @@
+import pytest
+
+@pytest.mark.anyio
+async def test_pagamentos_em_projecao_iguais_ao_schema(banco, usuario_id):
+    from app.database import AsyncSessionLocal, async_engine
+    from app.services.diagnostico_projecoes import conferir_pagamentos
+
+    try:
+        async with AsyncSessionLocal() as db:
+            divergencias = await conferir_pagamentos(db, usuario_id)
+    finally:
+        # O pool assíncrono fica preso ao event loop deste teste
+        await async_engine.dispose()
+    assert divergencias == {usuario_id: []}
@@ -0,0 +1,26 @@
+import pytest
+
+@pytest.mark.parametrize("valor, esperado", [
+    ("1.234,56", "1234.56"),
+    ("1.234", "1234"),
+    ("1.234.567", "1234567"),
+    ("1234.5", "1234.5"),
+    ("12.34", "12.34"),
+    ("0,5", "0.5"),
+])
+def test_valor_no_formato_das_planilhas(banco, valor, esperado):
+    from app.services.importacao import _normalizar_csv
+
+    assert _normalizar_csv({"valor": valor}) == {"valor": esperado}
+
+def test_importa_clientes_sem_conferencia(db, usuario_id):
+    from sqlalchemy import select
+    from app.models.clientes import Cliente
+    from app.services.importacao import importar
+
+    resultado = importar(db, "clientes", [(1, {"nome": "Importado"}), (2, {"email": "sem-nome"})], usuario_id)
+
+    assert resultado["importadas"] == 1
+    assert [erro["linha"] for erro in resultado["erros"]] == [2]
+    criado = db.get(Cliente, resultado["criados"][0]["id"])
+    assert (criado.nome, criado.usuario_id) == ("Importado", usuario_id)
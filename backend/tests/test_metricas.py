@@ -0,0 +1,18 @@
+import pytest
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("token, headers, esperado", [
+    (None, {"X-Admin-Token": "segredo"}, 404),
+    ("segredo", {}, 403),
+    ("segredo", {"X-Admin-Token": "outro"}, 403),
+    ("segredo", {"X-Admin-Token": "segredo"}, 200),
+])
+async def test_metricas_exigem_token_de_admin(banco, monkeypatch, token, headers, esperado):
+    import httpx
+    from app import dependencies
+    from app.main import app
+
+    monkeypatch.setattr(dependencies, "PERFIL_ADMIN_TOKEN", token)
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://testes") as http:
+        for rota in ("/metricas/pool", "/metricas/senhas"):
+            assert (await http.get(rota, headers=headers)).status_code == esperado
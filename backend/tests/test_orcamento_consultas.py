@@ -0,0 +1,22 @@
+import pytest
+
+@pytest.mark.anyio
+async def test_rotas_dentro_do_orcamento_de_consultas(banco, usuario_id):
+    from app.database import async_engine, engine
+    from app.instrumentacao import registrar_engines
+    from app.main import app
+    from app.services.diagnostico_consultas import conferir_orcamentos, rotas_com_orcamento
+
+    assert rotas_com_orcamento(app), "nenhuma rota declara orcamento_consultas"
+    registrar_engines(engine, async_engine.sync_engine)
+    try:
+        resultado = await conferir_orcamentos(app, usuario_id)
+    finally:
+        await async_engine.dispose()
+
+    falhas = {
+        rota: f"HTTP {status}, {consultas}/{orcamento} consultas"
+        for rota, (status, consultas, orcamento) in resultado.items()
+        if status != 200 or consultas > orcamento
+    }
+    assert falhas == {}
@@ -0,0 +1,34 @@
+import pytest
+
+def test_pagamento_em_honorario_com_status_do_usuario(db, usuario_id):
+    from datetime import date
+    from sqlalchemy import select
+    from app.models.honorarios import Honorario
+    from app.models.pagamentos import Pagamento
+    from app.models.status import Status
+    from app.models.tipo_pagamento import TipoPagamento
+    from app.services.situacao_honorarios import reconciliar_honorarios
+
+    status = Status(nome="EM NEGOCIAÇÃO (teste)")
+    db.add(status)
+    db.flush()
+    honorario = db.scalars(
+        select(Honorario).where(Honorario.usuario_id == usuario_id, Honorario.is_deleted == False).limit(1)
+    ).one()
+    honorario.status_id = status.id
+    pago_antes = honorario.valor_pago
+    db.add(Pagamento(
+        usuario_id=usuario_id,
+        honorario_id=honorario.id,
+        valor=10,
+        tipo_pagamento_id=db.scalar(select(TipoPagamento.id).limit(1)),
+        data_pagamento=date.today(),
+        is_deleted=False
+    ))
+
+    alterados = reconciliar_honorarios(db, [honorario.id])
+
+    assert [id_ for id_, _, _ in alterados] == [honorario.id]
+    db.refresh(honorario)
+    assert honorario.valor_pago == pytest.approx(pago_antes + 10)
+    assert honorario.status_id == status.id
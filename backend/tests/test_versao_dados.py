@@ -0,0 +1,43 @@
+import pytest
+
+@pytest.mark.anyio
+async def test_renomear_status_invalida_o_etag_dos_honorarios(usuario_id):
+    import httpx
+    from sqlalchemy import select
+    from app.database import SessionLocal, async_engine
+    from app.main import app
+    from app.models.honorarios import Honorario
+    from app.models.status import Status
+    from app.services import crud_status
+    from app.services.tokens import emitir_token
+
+    with SessionLocal() as db:
+        status = Status(nome="EM NEGOCIAÇÃO (teste etag)")
+        db.add(status)
+        db.flush()
+        honorario = db.scalars(
+            select(Honorario).where(Honorario.usuario_id == usuario_id, Honorario.is_deleted == False).limit(1)
+        ).one()
+        status_anterior, honorario.status_id = honorario.status_id, status.id
+        db.commit()
+        status_id, honorario_id = status.id, honorario.id
+
+    headers = {"Authorization": f"Bearer {emitir_token(usuario_id)}"}
+    try:
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://testes") as http:
+            antes = await http.get("/honorarios/", headers=headers)
+            with SessionLocal() as db:
+                crud_status.update_status(db, status_id, "RENEGOCIADO (teste etag)")
+            depois = await http.get("/honorarios/", headers={**headers, "If-None-Match": antes.headers["ETag"]})
+    finally:
+        await async_engine.dispose()
+        with SessionLocal() as db:
+            db.get(Honorario, honorario_id).status_id = status_anterior
+            db.flush()
+            crud_status.delete_status(db, status_id)
+
+    assert antes.status_code == 200
+    assert depois.status_code == 200
+    assert depois.headers["ETag"] != antes.headers["ETag"]
+    nomes = {item["status"]["nome"] for item in depois.json() if item["id"] == honorario_id}
+    assert nomes == {"RENEGOCIADO (teste etag)"}
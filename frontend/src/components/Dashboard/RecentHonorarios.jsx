@@ -12,7 +12,7 @@ export default function RecentHonorarios({ honorarios }) {
 
   const filteredAndSortedHonorarios = honorarios?.filter(honorario => {
     const status = honorario.status?.nome;
-    return status === 'PENDENTE' || status === 'ATRASADO';
+    return status === 'PENDENTE' || status === 'ATRASADO' || status === 'PARCIAL';
   }).sort((a, b) => {
     const dateA = new Date(a.data_vencimento);
     const dateB = new Date(b.data_vencimento);
@@ -25,7 +25,8 @@ export default function RecentHonorarios({ honorarios }) {
     const colors = {
       PENDENTE: 'bg-yellow-100 text-yellow-800',
       PAGO: 'bg-green-100 text-green-800',
-      ATRASADO: 'bg-red-100 text-red-800'
+      ATRASADO: 'bg-red-100 text-red-800',
+      PARCIAL: 'bg-blue-100 text-blue-800'
     };
     return colors[status] || 'bg-gray-100 text-gray-800';
   };
@@ -260,7 +260,7 @@ function ListaHonorarios() {
       };
 
       if (selectedHonorario) {
-        const statusMap = { 'PENDENTE': 1, 'PAGO': 2, 'ATRASADO': 3 };
+        const statusMap = { 'PENDENTE': 1, 'PAGO': 2, 'ATRASADO': 3, 'PARCIAL': 4 };
         honorarioData.status_id = statusMap[formData.status] || 1;
       } else {
         honorarioData.status_id = 1;
@@ -382,6 +382,7 @@ function ListaHonorarios() {
       PENDENTE: 'bg-yellow-100 text-yellow-800',
       PAGO: 'bg-green-100 text-green-800',
       ATRASADO: 'bg-red-100 text-red-800',
+      PARCIAL: 'bg-blue-100 text-blue-800',
       default: 'bg-gray-100 text-gray-800'
     };
     return statusClasses[status?.nome] || statusClasses.default;
@@ -510,6 +511,7 @@ function ListaHonorarios() {
                   <option value="PENDENTE">Pendente</option>
                   <option value="PAGO">Pago</option>
                   <option value="ATRASADO">Atrasado</option>
+                  <option value="PARCIAL">Parcial</option>
                 </select>
                 <ChevronDown className="absolute right-3 top-3 text-gray-400 pointer-events-none" size={16} />
               </div>
@@ -34,8 +34,6 @@ export async function salvarPagamento(formData, selectedPagamento = null) {
       ? await apiPut(url, formData)
       : await apiPost(url, formData);
 
-    await atualizarStatusHonorario(formData.honorario_id);
-
     return result;
   } catch (error) {
     const errorMessage = error.detail || error.message || 'Erro ao salvar pagamento';
@@ -43,17 +41,6 @@ export async function salvarPagamento(formData, selectedPagamento = null) {
   }
 }
 
-export async function atualizarStatusHonorario(honorarioId) {
-  try {
-    const result = await apiPut(`/honorarios/${honorarioId}`, {
-      status_id: 2
-    });
-    return result;
-  } catch (error) {
-    throw new Error('Erro ao atualizar status do honorário');
-  }
-}
-
 export async function excluirPagamento(pagamentoId) {
   try {
     const result = await apiPatch(`/pagamentos/${pagamentoId}/soft-delete`, { 
@@ -22,7 +22,13 @@ export const AuthProvider = ({ children }) => {
         const storedUser = localStorage.getItem('user');
         if (storedUser) {
             try {
-                setUser(JSON.parse(storedUser));
+                const parsedUser = JSON.parse(storedUser);
+                // Sessões antigas, sem token, precisam fazer login de novo
+                if (parsedUser.accessToken) {
+                    setUser(parsedUser);
+                } else {
+                    localStorage.removeItem('user');
+                }
             } catch (error) {
                 console.error('Erro ao carregar usuário:', error);
                 localStorage.removeItem('user');
@@ -52,6 +58,8 @@ export const AuthProvider = ({ children }) => {
                 id: data.id,
                 nome: data.nome,
                 email: data.email,
+                accessToken: data.access_token,
+                refreshToken: data.refresh_token,
             };
 
             localStorage.setItem('user', JSON.stringify(userData));
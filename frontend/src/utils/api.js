@@ -1,17 +1,41 @@
 
 const API_URL = process.env.NEXT_PUBLIC_API_URL;
 
-export const apiFetch = async (url, options = {}) => {
+const getStoredUser = () => {
     const userStr = localStorage.getItem('user');
-    const user = userStr ? JSON.parse(userStr) : null;
+    return userStr ? JSON.parse(userStr) : null;
+};
+
+// Troca o refresh token por um novo par de tokens; retorna null se a sessão expirou
+const refreshTokens = async (user) => {
+    const response = await fetch(`${API_URL}/auth/refresh`, {
+        method: 'POST',
+        headers: { 'Content-Type': 'application/json' },
+        body: JSON.stringify({ refresh_token: user.refreshToken }),
+    });
+    if (!response.ok) {
+        return null;
+    }
+    const data = await response.json();
+    const updatedUser = {
+        ...user,
+        accessToken: data.access_token,
+        refreshToken: data.refresh_token,
+    };
+    localStorage.setItem('user', JSON.stringify(updatedUser));
+    return updatedUser;
+};
+
+export const apiFetch = async (url, options = {}, retry = true) => {
+    const user = getStoredUser();
     
     const headers = {
         'Content-Type': 'application/json',
         ...options.headers,
     };
     
-    if (user && user.id) {
-        headers['user-id'] = user.id.toString();
+    if (user && user.accessToken) {
+        headers['Authorization'] = `Bearer ${user.accessToken}`;
     }
     
     const response = await fetch(`${API_URL}${url}`, {
@@ -19,6 +43,15 @@ export const apiFetch = async (url, options = {}) => {
         headers,
     });
     
+    // Token de acesso expirado: renova uma vez e repete a requisição
+    if (response.status === 401 && retry && user && user.refreshToken) {
+        const updatedUser = await refreshTokens(user);
+        if (updatedUser) {
+            return apiFetch(url, options, false);
+        }
+        localStorage.removeItem('user');
+    }
+    
     return response;
 };
 